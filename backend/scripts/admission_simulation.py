@@ -0,0 +1,101 @@
+"""Simulate job queue latency under overload with and without admission control.
+
+Usage (from backend/):
+
+    python scripts/admission_simulation.py [--load 2.0] [--max-queue-depth 100]
+
+Jobs arrive at ``--load`` times the workers' capacity for ``--burst`` seconds.
+Without admission control every job is queued. With it, jobs are only queued
+while the queue is shorter than ``--max-queue-depth`` and rejected clients
+retry after the suggested delay. The script prints how long admitted jobs
+waited in the queue in both cases.
+"""
+
+import argparse
+import heapq
+import random
+import statistics
+
+
+def simulate(
+    workers: int,
+    service_time: float,
+    load: float,
+    burst: float,
+    max_queue_depth: float,
+    retry_after: float,
+    seed: int = 0,
+) -> dict:
+    rng = random.Random(seed)
+    rate = load * workers / service_time
+
+    # Events are (time, kind, job arrival time); kinds sort arrivals after
+    # completions happening at the same instant
+    events = []
+    clock = 0.0
+    while clock < burst:
+        clock += rng.expovariate(rate)
+        heapq.heappush(events, (clock, 1, clock))
+
+    queue, waits = [], []
+    busy = rejections = 0
+    while events:
+        now, kind, submitted = heapq.heappop(events)
+        if kind == 0:
+            busy -= 1
+        elif len(queue) >= max_queue_depth:
+            rejections += 1
+            # Back off longer the further the queue is over its limit
+            delay = retry_after * max(len(queue) / max_queue_depth, 1.0)
+            heapq.heappush(events, (now + delay, 1, submitted))
+            continue
+        else:
+            queue.append((now, submitted))
+
+        while queue and busy < workers:
+            queued_at, submitted = queue.pop(0)
+            waits.append(now - queued_at)
+            busy += 1
+            heapq.heappush(events, (now + rng.expovariate(1 / service_time), 0, 0))
+
+    waits.sort()
+    return {
+        "jobs": len(waits),
+        "rejections": rejections,
+        "p50": statistics.median(waits),
+        "p95": waits[int(len(waits) * 0.95)],
+        "max": waits[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--service-time", type=float, default=60.0)
+    parser.add_argument("--load", type=float, default=2.0)
+    parser.add_argument("--burst", type=float, default=4 * 3600)
+    parser.add_argument("--max-queue-depth", type=int, default=100)
+    parser.add_argument("--retry-after", type=float, default=30.0)
+    args = parser.parse_args()
+
+    for label, depth in (
+        ("unbounded", float("inf")),
+        (f"admission (depth {args.max_queue_depth})", args.max_queue_depth),
+    ):
+        result = simulate(
+            args.workers,
+            args.service_time,
+            args.load,
+            args.burst,
+            depth,
+            args.retry_after,
+        )
+        print(
+            f"{label:>24}: {result['jobs']} jobs, {result['rejections']} 429s,"
+            f" queue wait p50={result['p50'] / 60:.1f}m"
+            f" p95={result['p95'] / 60:.1f}m max={result['max'] / 60:.1f}m"
+        )
+
+
+if __name__ == "__main__":
+    main()
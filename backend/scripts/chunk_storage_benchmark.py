@@ -0,0 +1,137 @@
+"""Compare chunk storage size and read/write time against indented JSON.
+
+Usage (from backend/):
+
+    python scripts/chunk_storage_benchmark.py [--entries 50] [--chunks 40]
+
+Writes the same synthetic processed chunks three ways: the old layout
+(chunks inline in an indent=2 entry file), compact inline JSON and the
+columnar ChunkStore. Prints bytes on disk, write time, time to read every
+chunk back and time to read only the chunk summaries.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.chunk_store import ChunkStore  # noqa: E402
+from src.services.serialization import read_json, write_json  # noqa: E402
+
+WORDS = "contract revenue clause party schedule liability notice term payment".split()
+
+
+def sample_chunks(rng: random.Random, count: int) -> list:
+    chunks = []
+    for index in range(count):
+        content = " ".join(rng.choice(WORDS) for _ in range(3500))
+        chunks.append(
+            {
+                "content": content,
+                "start_page": index * 10 + 1,
+                "end_page": index * 10 + 10,
+                "total_pages": count * 10,
+                "summary": {
+                    "summary": " ".join(content.split()[:80]),
+                    "topics": rng.sample(WORDS, 4),
+                    "entities": [f"Party {rng.randint(1, 50)}" for _ in range(6)],
+                    "concepts": rng.sample(WORDS, 3),
+                },
+            }
+        )
+    return chunks
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+class IndentedInline:
+    label = "indent=2 inline"
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def write(self, entry_id: str, chunks: list):
+        with open(os.path.join(self.base_dir, f"{entry_id}.json"), "w") as f:
+            json.dump({"id": entry_id, "chunks": chunks}, f, indent=2)
+
+    def read(self, entry_id: str, fields: list = None) -> list:
+        with open(os.path.join(self.base_dir, f"{entry_id}.json")) as f:
+            return json.load(f)["chunks"]
+
+
+class CompactInline(IndentedInline):
+    label = "compact inline"
+
+    def write(self, entry_id: str, chunks: list):
+        path = os.path.join(self.base_dir, f"{entry_id}.json")
+        write_json(path, {"id": entry_id, "chunks": chunks})
+
+    def read(self, entry_id: str, fields: list = None) -> list:
+        return read_json(os.path.join(self.base_dir, f"{entry_id}.json"))["chunks"]
+
+
+class Columnar:
+    label = "columnar"
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self.store = ChunkStore(base_dir)
+
+    def write(self, entry_id: str, chunks: list):
+        self.store.write(entry_id, chunks)
+
+    def read(self, entry_id: str, fields: list = None) -> list:
+        return self.store.read(entry_id, fields)
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = {
+        f"entry-{i}": sample_chunks(rng, args.chunks) for i in range(args.entries)
+    }
+    print(f"Corpus: {args.entries} entries of {args.chunks} chunks")
+
+    for layout_class in (IndentedInline, CompactInline, Columnar):
+        with tempfile.TemporaryDirectory() as base_dir:
+            layout = layout_class(base_dir)
+            writes = [
+                timed(lambda: layout.write(entry_id, chunks))
+                for entry_id, chunks in corpus.items()
+            ]
+            reads = [timed(lambda: layout.read(entry_id)) for entry_id in corpus]
+            summaries = [
+                timed(lambda: layout.read(entry_id, ["summary"])) for entry_id in corpus
+            ]
+            print(
+                f"{layout.label:>16}: {directory_size(base_dir) / 1024 / 1024:.1f}MB,"
+                f" write {statistics.median(writes):.1f}ms,"
+                f" read all {statistics.median(reads):.1f}ms,"
+                f" read summaries {statistics.median(summaries):.1f}ms per entry"
+            )
+
+
+if __name__ == "__main__":
+    main()
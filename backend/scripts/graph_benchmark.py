@@ -0,0 +1,100 @@
+"""Measure knowledge graph insert and query throughput at millions of edges.
+
+Usage (from backend/):
+
+    python scripts/graph_benchmark.py [--edges 2000000] [--edges-per-document 500]
+
+Merges synthetic documents into a KnowledgeGraph in a temporary directory
+and reports insert throughput as the graph grows. At each checkpoint it
+times neighbor and shortest-path queries from a second KnowledgeGraph
+instance, the way an API process reads what workers wrote.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.graph_service import KnowledgeGraph  # noqa: E402
+
+RELATIONS = "owns supplies employs acquired sued licenses audits partners_with".split()
+
+
+def sample_document(rng: random.Random, edges: int, entities: int) -> list:
+    # A few hub entities appear in many documents, most only in a few
+    def entity():
+        if rng.random() < 0.2:
+            return f"Entity {int(rng.paretovariate(1.0)) % entities}"
+        return f"Entity {rng.randrange(entities)}"
+
+    return [
+        {
+            "summary": {
+                "graph_edges": [
+                    {"from": entity(), "type": rng.choice(RELATIONS), "to": entity()}
+                    for _ in range(edges)
+                ]
+            }
+        }
+    ]
+
+
+def timed_queries(graph: KnowledgeGraph, rng: random.Random, count: int) -> tuple:
+    labels = graph.node_labels
+    neighbors, paths = [], []
+    for _ in range(count):
+        started = time.perf_counter()
+        graph.neighbors(rng.choice(labels), limit=100)
+        neighbors.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        graph.shortest_path(rng.choice(labels), rng.choice(labels), max_depth=4)
+        paths.append((time.perf_counter() - started) * 1000)
+    return statistics.median(neighbors), statistics.median(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edges", type=int, default=2000000)
+    parser.add_argument("--edges-per-document", type=int, default=500)
+    parser.add_argument("--entities", type=int, default=500000)
+    parser.add_argument("--checkpoints", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as base_dir:
+        writer = KnowledgeGraph(base_dir)
+        reader = KnowledgeGraph(base_dir)
+        step = args.edges // args.checkpoints
+        for checkpoint in range(1, args.checkpoints + 1):
+            documents = [
+                sample_document(rng, args.edges_per_document, args.entities)
+                for _ in range(step // args.edges_per_document)
+            ]
+            started = time.perf_counter()
+            inserted = sum(writer.add_document(document) for document in documents)
+            insert_seconds = time.perf_counter() - started
+            submitted = len(documents) * args.edges_per_document
+
+            started = time.perf_counter()
+            reader.refresh()
+            reader.neighbors(reader.node_labels[0])
+            load_ms = (time.perf_counter() - started) * 1000
+            neighbors_ms, path_ms = timed_queries(reader, rng, args.queries)
+            print(
+                f"{len(reader.edges)} edges, {len(reader.node_labels)} nodes:"
+                f" insert {submitted / insert_seconds:.0f} edges/s"
+                f" ({inserted / submitted:.0%} new),"
+                f" reader catch-up {load_ms:.0f}ms,"
+                f" neighbors p50 {neighbors_ms:.2f}ms, path p50 {path_ms:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
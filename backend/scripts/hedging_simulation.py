@@ -0,0 +1,127 @@
+"""Simulate chunk call tail latency with and without hedging.
+
+Usage (from backend/):
+
+    python scripts/hedging_simulation.py [--calls 2000] [--stall-rate 0.02]
+
+Runs ``--calls`` fake LLM calls through the real HedgedCaller, at most
+``--concurrency`` at a time, as a document's chunks are. Each call sleeps
+for a log-normal latency around ``--median-ms``. A ``--stall-rate``
+fraction of calls stall for ``--stall-factor`` times longer, and a
+``--failure-rate`` fraction fail after their latency, which triggers a
+retry. The script prints p50/p95/p99 call latency and the extra attempts
+(hedges and retries) as a share of calls, without hedging and at a few
+hedge percentiles.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.gen_ai.hedging import (  # noqa: E402
+    HedgeBudget,
+    HedgedCaller,
+    LatencyTracker,
+)
+
+
+class FakeLLM:
+    def __init__(self, args, seed: int):
+        self.args = args
+        self.rng = random.Random(seed)
+        self.attempts = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.attempts += 1
+            latency = self.rng.lognormvariate(0, 0.4) * self.args.median_ms / 1000
+            if self.rng.random() < self.args.stall_rate:
+                latency *= self.args.stall_factor
+            failed = self.rng.random() < self.args.failure_rate
+        time.sleep(latency)
+        if failed:
+            raise RuntimeError("simulated provider error")
+        return latency
+
+
+async def run(args, hedge_percentile: float) -> dict:
+    # A tracker that never warms up never hedges
+    tracker = LatencyTracker(min_samples=20 if hedge_percentile else args.calls + 1)
+    budget = HedgeBudget(args.budget)
+    llm = FakeLLM(args, seed=0)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        caller = HedgedCaller(
+            tracker,
+            budget,
+            executor,
+            hedge_percentile=hedge_percentile or 100,
+            timeout=args.timeout_ms / 1000,
+            retries=2,
+            backoff=args.median_ms / 1000,
+        )
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies, failures = [], 0
+
+        async def one_call():
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await caller.call(llm)
+                except Exception:
+                    failures += 1
+                    return
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(one_call() for _ in range(args.calls)))
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "extra": (llm.attempts - args.calls) / args.calls,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--median-ms", type=float, default=20)
+    parser.add_argument("--stall-rate", type=float, default=0.02)
+    parser.add_argument("--stall-factor", type=float, default=10)
+    parser.add_argument("--failure-rate", type=float, default=0.01)
+    parser.add_argument("--timeout-ms", type=float, default=1000)
+    parser.add_argument("--budget", type=float, default=0.1)
+    parser.add_argument("--percentiles", default="95,90")
+    args = parser.parse_args()
+
+    percentiles = [None] + [float(p) for p in args.percentiles.split(",")]
+    for percentile in percentiles:
+        # Keep the caller's per-call log lines out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = asyncio.run(run(args, percentile))
+        label = f"hedge at p{percentile:g}" if percentile else "no hedging"
+        print(
+            f"{label:>14}: p50={result['p50']:.0f}ms p95={result['p95']:.0f}ms"
+            f" p99={result['p99']:.0f}ms, extra attempts {result['extra']:.1%},"
+            f" {result['failures']} failed"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure API cold-start import cost with ``python -X importtime``.
+
+Usage (from backend/):
+
+    python scripts/import_benchmark.py [--module src.api.main] [--history FILE]
+
+Prints the total import time and the slowest top-level imports. With
+``--history`` the result is appended as a JSON line, so the numbers can be
+tracked across commits.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def measure(module: str, runs: int = 3) -> dict:
+    """Best of ``runs`` cold imports, with the cumulative time per package"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        packages = {}
+        total = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            cumulative, name = int(cumulative), name.strip()
+            if name == module:
+                total = cumulative
+            # The outermost import of a package carries its whole cost
+            package = name.split(".")[0]
+            packages[package] = max(packages.get(package, 0), cumulative)
+        packages.pop(module.split(".")[0], None)
+        if best is None or total < best["total_us"]:
+            best = {"total_us": total, "packages": packages}
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.api.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--history", help="JSON lines file to append results to")
+    args = parser.parse_args()
+
+    result = measure(args.module, args.runs)
+    print(f"{args.module}: {result['total_us'] / 1000:.1f} ms")
+    slowest = sorted(result["packages"].items(), key=lambda item: -item[1])
+    for name, cumulative in slowest[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.history:
+        with open(args.history, "a") as f:
+            record = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "module": args.module,
+                "total_ms": round(result["total_us"] / 1000, 1),
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Mixed upload and status load test against a running API.
+
+Usage (from backend/, with the API running):
+
+    python scripts/load_test.py [--url http://localhost:8000] [--concurrency 50]
+
+Each client loops over one upload followed by ``--polls`` status requests
+for the uploaded entry, and the script prints latency percentiles per request
+type. Run it before and after a change to compare how well the API keeps
+serving status polls while uploads are in flight.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+
+async def _client(
+    http: httpx.AsyncClient,
+    iterations: int,
+    polls: int,
+    payload: bytes,
+    latencies: dict,
+):
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await http.post(
+            "/upload/", files={"file": ("load-test.txt", payload, "text/plain")}
+        )
+        latencies["upload"].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            latencies["errors"].append(response.status_code)
+            continue
+
+        entry_id = response.json()["entry_id"]
+        for _ in range(polls):
+            started = time.perf_counter()
+            response = await http.get(f"/processing/status/{entry_id}")
+            latencies["status"].append(time.perf_counter() - started)
+            if response.status_code != 200:
+                latencies["errors"].append(response.status_code)
+
+
+def _percentiles(values: list) -> str:
+    ordered = sorted(values)
+    quantiles = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered
+    p50, p95, p99 = (quantiles[min(p, len(quantiles)) - 1] for p in (50, 95, 99))
+    return f"p50={p50 * 1000:.0f}ms p95={p95 * 1000:.0f}ms p99={p99 * 1000:.0f}ms"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--polls", type=int, default=10)
+    parser.add_argument("--upload-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    payload = os.urandom(args.upload_kb * 512).hex().encode()
+    latencies = defaultdict(list)
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=120) as http:
+        await asyncio.gather(
+            *(
+                _client(http, args.iterations, args.polls, payload, latencies)
+                for _ in range(args.concurrency)
+            )
+        )
+    elapsed = time.perf_counter() - started
+
+    for kind in ("upload", "status"):
+        if latencies[kind]:
+            print(
+                f"{kind:>7}: n={len(latencies[kind])} {_percentiles(latencies[kind])}"
+            )
+    print(f" errors: {len(latencies['errors'])}")
+    print(f"elapsed: {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,189 @@
+"""Compare native DOCX/HTML/Markdown/text loading with converting to PDF first.
+
+Usage (from backend/):
+
+    python scripts/loader_benchmark.py [--sections 100] [--soffice]
+
+Builds the same synthetic document as plain text, Markdown, HTML and DOCX
+and times chunking it two ways: through the loader the registry picks for
+the format, and the old way of converting it to PDF upstream and chunking
+the PDF. Conversion uses pymupdf's HTML renderer by default, a lower
+bound for a real converter; with ``--soffice`` it runs LibreOffice
+headless, as the upstream conversion step did.
+"""
+
+import argparse
+import io
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from functools import partial
+from html import escape
+
+import pymupdf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.loaders.pdf_loader import (  # noqa: E402
+    PdfChunkDocumentLoader,
+    PdfDocumentLoader,
+)
+from src.services.loaders.registry import loader_registry  # noqa: E402
+
+WORDS = "contract revenue clause party schedule liability notice term payment".split()
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels"'
+    ' ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats'
+    '.org/officeDocument/2006/relationships/officeDocument"'
+    ' Target="word/document.xml"/></Relationships>'
+)
+
+
+def sample_sections(rng: random.Random, sections: int) -> list:
+    return [
+        (
+            f"Section {index + 1}",
+            [" ".join(rng.choice(WORDS) for _ in range(60)) for _ in range(8)],
+        )
+        for index in range(sections)
+    ]
+
+
+def render(sections: list) -> tuple:
+    """The same document in every natively supported format, and as HTML"""
+    text = "\f".join("\n".join([title] + paragraphs) for title, paragraphs in sections)
+    markdown = "\n\n".join(
+        f"# {title}\n\n" + "\n\n".join(paragraphs) for title, paragraphs in sections
+    )
+    html = "<html><body>{}</body></html>".format(
+        "".join(
+            f"<h1>{escape(title)}</h1>"
+            + "".join(f"<p>{escape(p)}</p>" for p in paragraphs)
+            for title, paragraphs in sections
+        )
+    )
+
+    page_break = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+    body = page_break.join(
+        "".join(
+            f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>"
+            for line in [title] + paragraphs
+        )
+        for title, paragraphs in sections
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w='
+        '"http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    docx = io.BytesIO()
+    with zipfile.ZipFile(docx, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+
+    documents = {
+        ".txt": text.encode(),
+        ".md": markdown.encode(),
+        ".html": html.encode(),
+        ".docx": docx.getvalue(),
+    }
+    return documents, html
+
+
+def html_to_pdf(html: str) -> bytes:
+    """Lay HTML out on A4 pages with pymupdf"""
+    buffer = io.BytesIO()
+    writer = pymupdf.DocumentWriter(buffer)
+    story = pymupdf.Story(html)
+    more = True
+    while more:
+        device = writer.begin_page(pymupdf.paper_rect("a4"))
+        more, _ = story.place(pymupdf.paper_rect("a4") + (50, 50, -50, -50))
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+    return buffer.getvalue()
+
+
+def soffice_to_pdf(raw: bytes, extension: str) -> bytes:
+    with tempfile.TemporaryDirectory() as work_dir:
+        source = os.path.join(work_dir, f"document{extension}")
+        with open(source, "wb") as f:
+            f.write(raw)
+        subprocess.run(
+            ["soffice", "--headless", "--convert-to", "pdf", "--outdir", work_dir]
+            + [source],
+            capture_output=True,
+            check=True,
+        )
+        with open(os.path.join(work_dir, "document.pdf"), "rb") as f:
+            return f.read()
+
+
+def chunk(raw: bytes, page_loader: type) -> list:
+    loader = PdfChunkDocumentLoader(
+        chunk_size=25000, overlap=500, page_loader=page_loader
+    )
+    return loader.extract_chunks(io_stream=io.BytesIO(raw))
+
+
+def timed(fn, repeat: int) -> tuple:
+    latencies, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.median(latencies), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--soffice", action="store_true")
+    args = parser.parse_args()
+    if args.soffice and not shutil.which("soffice"):
+        parser.error("LibreOffice (soffice) is not installed")
+
+    documents, html = render(sample_sections(random.Random(0), args.sections))
+    print(f"Document: {args.sections} sections, {len(html) // 1024}KB of HTML")
+
+    for extension, raw in documents.items():
+        page_loader = loader_registry.resolve(filename=f"document{extension}")
+        native_ms, chunks = timed(lambda: chunk(raw, page_loader), args.repeat)
+
+        if args.soffice:
+            convert = partial(soffice_to_pdf, raw, extension)
+        else:
+            convert = partial(html_to_pdf, html)
+        convert_ms, pdf = timed(convert, args.repeat)
+        pdf_ms, pdf_chunks = timed(lambda: chunk(pdf, PdfDocumentLoader), args.repeat)
+        print(
+            f"{extension:>6} ({page_loader.__name__}): native {native_ms:.1f}ms"
+            f" -> {len(chunks)} chunks | via PDF {convert_ms + pdf_ms:.1f}ms"
+            f" (convert {convert_ms:.1f}ms + chunk {pdf_ms:.1f}ms)"
+            f" -> {len(pdf_chunks)} chunks"
+        )
+
+
+if __name__ == "__main__":
+    main()
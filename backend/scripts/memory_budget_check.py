@@ -0,0 +1,95 @@
+"""Reproduce the per-job memory budget fallback with a synthetic large PDF.
+
+Usage (from backend/):
+
+    python scripts/memory_budget_check.py [--pages 2000] [--chars-per-page 3000]
+
+Builds a text PDF, then chunks it the way a job within budget does (bytes in
+memory, whole-document split) and the way a job over budget does (file on
+disk, windowed split), printing the Python heap peak and page coverage of
+each.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+import pymupdf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.loaders.pdf_loader import PdfChunkDocumentLoader  # noqa: E402
+from src.services.processing_service import SPILL_WINDOW_CHUNKS  # noqa: E402
+
+WORDS = "contract revenue clause party schedule liability notice term payment".split()
+
+
+def build_pdf(path: str, pages: int, chars_per_page: int):
+    rng = random.Random(0)
+    with pymupdf.open() as pdf_file:
+        for page_number in range(pages):
+            words, size = [], 0
+            while size < chars_per_page:
+                word = rng.choice(WORDS)
+                words.append(word)
+                size += len(word) + 1
+            text = f"Section {page_number + 1}\n" + " ".join(words)
+            page = pdf_file.new_page()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=5)
+        pdf_file.save(path)
+
+
+def measure(label: str, extract):
+    tracemalloc.start()
+    chunks = extract()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>10}: {len(chunks)} chunks, heap peak {peak / 1024 / 1024:.1f}MB")
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--chars-per-page", type=int, default=3000)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        build_pdf(path, args.pages, args.chars_per_page)
+        print(f"Synthetic PDF: {args.pages} pages, {os.path.getsize(path)} bytes")
+
+        def in_memory():
+            with open(path, "rb") as f:
+                io_stream = io.BytesIO(f.read())
+            loader = PdfChunkDocumentLoader(chunk_size=25000, overlap=500)
+            return loader.extract_chunks(io_stream=io_stream)
+
+        def spilled():
+            loader = PdfChunkDocumentLoader(
+                chunk_size=25000,
+                overlap=500,
+                window_chars=25000 * SPILL_WINDOW_CHUNKS,
+            )
+            return loader.extract_chunks(path)
+
+        full = measure("in memory", in_memory)
+        windowed = measure("spilled", spilled)
+
+        for label, chunks in (("in memory", full), ("spilled", windowed)):
+            covered = {
+                page for c in chunks for page in range(c.start_page, c.end_page + 1)
+            }
+            print(f"{label:>10}: {len(covered)}/{args.pages} pages attributed")
+        assert windowed[-1].end_page == args.pages
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure page extraction throughput on digital and mixed scanned PDFs.
+
+Usage (from backend/):
+
+    python scripts/ocr_benchmark.py [--pages 200] [--scanned 0.1]
+        [--simulated-ocr-seconds 0.5]
+
+Builds a PDF of native-text pages and a copy in which a ``--scanned``
+fraction of the pages are replaced by images of themselves, then extracts
+both with the OcrEngine enabled and prints pages/s. The mixed PDF is
+extracted twice: the second run is served from the OCR cache. It also
+checks that only the image pages reached the OCR engine, so native pages
+never pay the OCR cost.
+
+OCR needs Tesseract. Where it is not installed, ``--simulated-ocr-seconds``
+replaces the per-page OCR call with a sleep of that length, which still
+exercises the pool, the in-flight window and the cache.
+"""
+
+import argparse
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import pymupdf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.loaders import ocr  # noqa: E402
+from src.services.loaders.pdf_loader import PdfDocumentLoader  # noqa: E402
+
+WORDS = "contract revenue clause party schedule liability notice term payment".split()
+
+SIMULATED_SECONDS = 0.0
+
+
+def simulated_ocr(page_pdf: bytes, language: str, dpi: int) -> str:
+    time.sleep(SIMULATED_SECONDS)
+    return "simulated OCR text"
+
+
+def build_pdfs(rng: random.Random, pages: int, scanned: float) -> tuple:
+    digital, mixed = pymupdf.open(), pymupdf.open()
+    scanned_pages = set(rng.sample(range(pages), int(pages * scanned)))
+    for index in range(pages):
+        text = " ".join(rng.choice(WORDS) for _ in range(400))
+        page = digital.new_page()
+        page.insert_textbox(page.rect + (50, 50, -50, -50), text, fontsize=9)
+        if index in scanned_pages:
+            # An image of the page with no text layer, like a scanner produces
+            image = mixed.new_page(width=page.rect.width, height=page.rect.height)
+            image.insert_image(image.rect, pixmap=page.get_pixmap(dpi=100))
+        else:
+            mixed.insert_pdf(digital, from_page=index, to_page=index)
+    return digital.tobytes(), mixed.tobytes(), scanned_pages
+
+
+def timed_extract(pdf_bytes: bytes, engine: ocr.OcrEngine) -> float:
+    started = time.perf_counter()
+    pages = PdfDocumentLoader.extract_pages(
+        io_stream=io.BytesIO(pdf_bytes), ocr_engine=engine
+    )
+    return len(pages) / (time.perf_counter() - started)
+
+
+def main():
+    global SIMULATED_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--scanned", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--simulated-ocr-seconds", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.simulated_ocr_seconds:
+        SIMULATED_SECONDS = args.simulated_ocr_seconds
+        ocr._ocr_single_page = simulated_ocr
+        print(f"Simulating OCR at {SIMULATED_SECONDS:.2f}s per page")
+    elif not shutil.which("tesseract"):
+        parser.error("Tesseract is not installed; pass --simulated-ocr-seconds")
+
+    digital, mixed, scanned_pages = build_pdfs(
+        random.Random(0), args.pages, args.scanned
+    )
+    with tempfile.TemporaryDirectory() as cache_dir:
+        engine = ocr.OcrEngine(cache_dir, max_workers=args.workers)
+        requested = []
+        ocr_pages = engine.ocr_pages
+
+        def recording_ocr_pages(pdf_file, page_indices):
+            requested.extend(page_indices)
+            return ocr_pages(pdf_file, page_indices)
+
+        engine.ocr_pages = recording_ocr_pages
+
+        digital_rate = timed_extract(digital, engine)
+        if requested:
+            raise AssertionError(f"Digital pages sent to OCR: {requested}")
+        print(f"all digital ({args.pages} pages): {digital_rate:.0f} pages/s")
+
+        label = f"{len(scanned_pages)}/{args.pages} scanned"
+        print(f"{label}: {timed_extract(mixed, engine):.0f} pages/s")
+        if set(requested) != scanned_pages:
+            raise AssertionError(
+                f"OCR'd pages {sorted(requested)} != scanned {sorted(scanned_pages)}"
+            )
+        print(f"{label}, OCR cached: {timed_extract(mixed, engine):.0f} pages/s")
+        print(f"Only the {len(scanned_pages)} scanned pages reached the OCR engine")
+
+
+if __name__ == "__main__":
+    main()
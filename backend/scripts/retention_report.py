@@ -0,0 +1,201 @@
+"""Report space savings and rehydration latency of retention compaction.
+
+Usage (from backend/):
+
+    python scripts/retention_report.py [--entries 20] [--pages 60]
+
+Builds a sample corpus of processed entries from synthetic text PDFs in a
+temporary db directory, compacts all of them with an in-memory object store
+standing in for S3, and prints local disk usage before and after, archive
+sizes per codec, and how long reading chunks back takes: summaries come from
+the archive alone, chunk text is rebuilt from the source document.
+
+Only chunk text found verbatim in the native page text is dropped from the
+archive. The sample pages start with a repeated "Section N" header, so with
+boilerplate stripping on (``STRIP_BOILERPLATE``, the default) chunk text
+stays archived; run with ``STRIP_BOILERPLATE=false`` to see text rebuilt
+from the source.
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+import pymupdf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import RetentionSettings, settings  # noqa: E402
+from src.services import compression  # noqa: E402
+from src.services.db_service import DBService  # noqa: E402
+from src.services.loaders.ocr import get_ocr_engine  # noqa: E402
+from src.services.loaders.pdf_loader import PdfChunkDocumentLoader  # noqa: E402
+from src.services.retention_service import RetentionService  # noqa: E402
+from src.services.serialization import dumps  # noqa: E402
+
+WORDS = (
+    "contract revenue clause party schedule liability notice term payment"
+    " invoice warranty delivery breach remedy indemnity audit"
+).split()
+
+
+class MemoryObjectStore:
+    """The parts of S3Service the retention service uses, kept in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_file(self, key: str, file_content: bytes, content_type: str = None):
+        self.objects[key] = bytes(file_content)
+        return f"s3://sample/{key}"
+
+    def read_file(self, key: str) -> io.BytesIO:
+        return io.BytesIO(self.objects[key])
+
+
+def build_pdf(rng: random.Random, pages: int) -> bytes:
+    with pymupdf.open() as pdf_file:
+        for page_number in range(pages):
+            text = f"Section {page_number + 1}\n" + " ".join(
+                rng.choice(WORDS) for _ in range(rng.randint(250, 450))
+            )
+            page = pdf_file.new_page()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=7)
+        return pdf_file.tobytes()
+
+
+def sample_analysis(rng: random.Random, content: str) -> dict:
+    return {
+        "summary": " ".join(content.split()[:60]),
+        "topics": rng.sample(WORDS, 4),
+        "entities": [f"Party {rng.randint(1, 50)}" for _ in range(5)],
+        "concepts": rng.sample(WORDS, 3),
+    }
+
+
+def build_corpus(db_service: DBService, store, entries: int, pages: int) -> dict:
+    """Process synthetic documents the way an ``extract`` job would, adding
+    made-up analyses, and return each entry's chunk text"""
+    rng = random.Random(0)
+    contents = {}
+    for _ in range(entries):
+        entry_id = str(uuid.uuid4())
+        key = f"uploads/{entry_id}.pdf"
+        location = store.upload_file(key, build_pdf(rng, pages))
+        db_service.create_entry(
+            entry_id, key, f"{entry_id}.pdf", location, content_type="application/pdf"
+        )
+
+        pdf_loader = PdfChunkDocumentLoader(
+            chunk_size=25000,
+            overlap=500,
+            strip_boilerplate=settings.Processing.strip_boilerplate,
+            ocr_engine=get_ocr_engine(db_service.base_dir),
+        )
+        chunks = [
+            {**chunk.model_dump(), "summary": sample_analysis(rng, chunk.content)}
+            for chunk in pdf_loader.extract_chunks(io_stream=store.read_file(key))
+        ]
+        db_service.store_chunks(entry_id, chunks)
+        db_service.update_entry(
+            entry_id, page_fingerprints=pdf_loader.page_fingerprints
+        )
+        db_service.update_progress(entry_id, 100, "completed")
+        contents[entry_id] = [chunk["content"] for chunk in chunks]
+    return contents
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def describe(label: str, latencies: list):
+    latencies = sorted(latencies)
+    print(
+        f"{label:>22}: p50={statistics.median(latencies):.1f}ms"
+        f" p95={latencies[int(len(latencies) * 0.95)]:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        db_service = DBService(base_dir)
+        store = MemoryObjectStore()
+        contents = build_corpus(db_service, store, args.entries, args.pages)
+        source_bytes = sum(len(data) for data in store.objects.values())
+
+        retention_service = RetentionService(
+            db_service,
+            store,
+            RetentionSettings(
+                enabled=True,
+                cold_after_days=0,
+                archive_prefix="archive/chunks",
+                drop_content=True,
+                batch_size=args.entries,
+            ),
+        )
+        db_service.chunk_store.rehydrate = retention_service.rehydrate
+
+        # Archive size of the same payloads without dropping text, per codec
+        payloads = [
+            dumps(db_service.chunk_store.read_columns(entry_id, list(columns)))
+            for entry_id in contents
+            for columns in [db_service.chunk_store.get_manifest(entry_id)["columns"]]
+        ]
+
+        results = [retention_service.compact(entry_id) for entry_id in contents]
+        before = sum(result["local_bytes_before"] for result in results)
+        after = sum(result["local_bytes_after"] for result in results)
+        archived = sum(result["archive_bytes"] for result in results)
+        raw = sum(result["archive_raw_bytes"] for result in results)
+        from_source = sum(result["chunks_from_source"] for result in results)
+        chunks = sum(len(expected) for expected in contents.values())
+
+        print(f"Sample corpus: {args.entries} entries of {args.pages} pages")
+        print(f"{'source documents':>22}: {source_bytes / 1024:.0f}KB in S3")
+        print(f"{'local before':>22}: {before / 1024:.0f}KB")
+        print(f"{'local after':>22}: {after / 1024:.0f}KB")
+        for extension in (compression.ZSTD_EXTENSION, compression.LZMA_EXTENSION):
+            size = sum(len(compression.compress(p, extension)) for p in payloads)
+            print(f"{'archive with text ' + extension:>22}: {size / 1024:.0f}KB")
+        print(
+            f"{'archive with offsets':>22}: {archived / 1024:.0f}KB"
+            f" ({raw / 1024:.0f}KB before {compression.default_extension()})"
+        )
+        print(f"{'text from source':>22}: {from_source}/{chunks} chunks")
+
+        summary_latency = [
+            timed(lambda: db_service.get_chunks(entry_id, ["summary"]))
+            for entry_id in contents
+        ]
+        content_latency = []
+        for entry_id, expected in contents.items():
+            content_latency.append(
+                timed(lambda: db_service.get_chunks(entry_id, ["content"]))
+            )
+            rebuilt = [chunk["content"] for chunk in db_service.get_chunks(entry_id)]
+            assert rebuilt == expected, f"Chunk text of {entry_id} differs"
+
+        describe("rehydrate summaries", summary_latency)
+        describe("rebuild text", content_latency)
+        print(
+            f"{'hot read':>22}: {timed(lambda: db_service.get_chunks(entry_id)):.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
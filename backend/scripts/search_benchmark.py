@@ -0,0 +1,108 @@
+"""Measure /search query latency as the chunk corpus grows.
+
+Usage (from backend/):
+
+    python scripts/search_benchmark.py [--sizes 10000,100000,300000]
+
+Indexes synthetic chunk analyses into a SearchIndex in a temporary
+directory, one entry of ``--chunks-per-entry`` chunks at a time, and after
+reaching each corpus size times a fixed mix of queries (a rare entity, a
+common topic and a two-term query). For comparison it also times the scan
+over the same analyses in memory that a lookup without the index would
+need at best, before even reading the entry files.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.search_service import SearchIndex  # noqa: E402
+
+TOPICS = (
+    "revenue liability warranty indemnity termination payment delivery audit"
+    " compliance insurance confidentiality governance procurement licensing"
+).split()
+
+
+def sample_analysis(rng: random.Random) -> dict:
+    # Entities follow a long tail so some queries match very few chunks
+    entities = [f"Company{int(rng.paretovariate(1.2))}" for _ in range(5)]
+    topics = rng.sample(TOPICS, 3)
+    return {
+        "summary": f"Discusses {topics[0]} and {topics[1]} for {entities[0]}.",
+        "topics": topics,
+        "entities": entities,
+        "concepts": rng.sample(TOPICS, 2),
+        "search_queries": [f"{topics[0]} obligations of {entities[1]}"],
+    }
+
+
+def scan(analyses: list, terms: list) -> list:
+    matches = []
+    for analysis in analyses:
+        text = " ".join(
+            " ".join(value) if isinstance(value, list) else value
+            for value in analysis.values()
+        ).lower()
+        if all(term in text for term in terms):
+            matches.append(analysis)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,300000")
+    parser.add_argument("--chunks-per-entry", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    rng = random.Random(0)
+    queries = ["Company97", "warranty", "indemnity Company3"]
+    analyses = []
+    with tempfile.TemporaryDirectory() as base_dir:
+        index = SearchIndex(base_dir)
+        indexed, entry = 0, 0
+        for size in sizes:
+            started, previous = time.perf_counter(), indexed
+            while indexed < size:
+                chunks = [
+                    {
+                        "start_page": i * 10 + 1,
+                        "end_page": i * 10 + 10,
+                        "summary": sample_analysis(rng),
+                    }
+                    for i in range(args.chunks_per_entry)
+                ]
+                index.index_chunks(f"entry-{entry}", chunks)
+                analyses.extend(chunk["summary"] for chunk in chunks)
+                indexed += len(chunks)
+                entry += 1
+            rate = (indexed - previous) / (time.perf_counter() - started)
+
+            print(f"{indexed} chunks (indexing {rate:.0f} chunks/s):")
+            for query in queries:
+                latencies = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    results = index.search(query, limit=20)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                scan(analyses, query.lower().split())
+                scan_ms = (time.perf_counter() - started) * 1000
+                latencies.sort()
+                print(
+                    f"  {query!r:>22}: p50={statistics.median(latencies):.2f}ms"
+                    f" p95={latencies[int(len(latencies) * 0.95)]:.2f}ms"
+                    f" ({len(results)} results), in-memory scan {scan_ms:.0f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
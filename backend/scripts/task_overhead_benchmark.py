@@ -0,0 +1,129 @@
+"""Measure the fixed per-task cost of processing small documents in a worker.
+
+Usage (from backend/):
+
+    python scripts/task_overhead_benchmark.py [--tasks 50] [--pages 3]
+
+Runs ``process_document`` in ``extract`` mode (no LLM calls) on a small
+PDF, ``--tasks`` times in a fresh process per setup:
+
+- per task: every task builds its own DB, S3, OpenAI and processing
+  services and runs its coroutines under ``asyncio.run``, as tasks did
+  before worker resources were shared;
+- warm worker: ``init_worker_resources`` runs once, as on
+  ``worker_process_init``, and every task reuses its services and loop.
+
+S3 reads are served from memory, and the database, search index and graph
+live in a temporary directory, so the numbers are the worker's own fixed
+cost without the broker or network round trips. The first task of each
+process is reported separately from the median of the rest.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pymupdf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+# Admission control needs Redis, which the benchmark does without
+os.environ["ADMISSION_ENABLED"] = "false"
+
+
+def sample_pdf(pages: int) -> bytes:
+    with pymupdf.open() as pdf_file:
+        for index in range(pages):
+            page = pdf_file.new_page()
+            page.insert_text((72, 72), f"Page {index + 1} of a short contract. " * 3)
+        return pdf_file.tobytes()
+
+
+def run_tasks(setup: str, tasks: int, pages: int) -> list:
+    """Process ``tasks`` documents in this process, returning ms per task"""
+    from src.services import processing_service as processing_module
+    from src.services.db_service import DBService
+    from src.services.gen_ai.summary_service import SummaryService
+    from src.services.graph_service import KnowledgeGraph
+    from src.services.s3_service import S3Service
+    from src.worker import resources
+
+    class InMemoryS3Service(S3Service):
+        def read_file(self, key: str) -> io.BytesIO:
+            return io.BytesIO(document)
+
+        def get_size(self, key: str) -> int:
+            return len(document)
+
+    document = sample_pdf(pages)
+    base_dir = tempfile.mkdtemp(prefix="task-overhead-")
+    graph = KnowledgeGraph(base_dir)
+    processing_module.get_knowledge_graph = lambda: graph
+    resources.get_knowledge_graph = lambda: graph
+    resources.get_db_service = lambda: DBService(base_dir)
+
+    if setup == "warm":
+        resources.init_worker_resources()
+        resources.get_processing_service().s3_service = InMemoryS3Service()
+
+    timings = []
+    for index in range(tasks):
+        entry_id = f"entry-{index}"
+        DBService(base_dir).create_entry(
+            entry_id, f"{entry_id}.pdf", f"{entry_id}.pdf", f"s3://bucket/{entry_id}"
+        )
+        started = time.perf_counter()
+        if setup == "warm":
+            service = resources.get_processing_service()
+        else:
+            service = processing_module.PDFProcessingService(
+                DBService(base_dir), InMemoryS3Service(), SummaryService()
+            )
+            # What a task did per job before the worker kept a loop
+            asyncio.run(asyncio.sleep(0))
+        service.process_document(entry_id, f"s3://bucket/{entry_id}.pdf", "extract")
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--setup", choices=["cold", "warm"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.setup:
+        # Child process: keep the services' logging out of the JSON result
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = run_tasks(args.setup, args.tasks, args.pages)
+        print(json.dumps(timings))
+        return
+
+    for setup, label in (("cold", "per task"), ("warm", "warm worker")):
+        result = subprocess.run(
+            [sys.executable, __file__, "--setup", setup]
+            + ["--tasks", str(args.tasks), "--pages", str(args.pages)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings = json.loads(result.stdout.splitlines()[-1])
+        print(
+            f"{label:>12}: first task {timings[0]:.0f}ms,"
+            f" then p50 {statistics.median(timings[1:]):.1f}ms"
+            f" over {len(timings) - 1} tasks of {args.pages} pages"
+        )
+
+
+if __name__ == "__main__":
+    main()
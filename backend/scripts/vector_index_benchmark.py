@@ -0,0 +1,109 @@
+"""Measure VectorIndex recall and query latency at 100k+ vectors.
+
+Usage (from backend/):
+
+    python scripts/vector_index_benchmark.py [--vectors 100000] [--probes 1,4,8,16]
+
+Fills a VectorIndex in a temporary directory with clustered synthetic
+vectors (standing in for embeddings of related chunks), one entry of
+``--chunks-per-entry`` vectors at a time, then times top-10 queries at
+several ``n_probe`` settings and compares the results with an exact
+brute-force search to get recall@10.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.vector_index import VectorIndex  # noqa: E402
+
+
+def clustered_vectors(
+    rng: np.random.Generator, count: int, dimensions: int, clusters: int, noise: float
+) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    labels = rng.integers(0, clusters, count)
+    offsets = rng.standard_normal((count, dimensions)).astype(np.float32)
+    return centers[labels] + noise * offsets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--lists", type=int, default=256)
+    parser.add_argument("--probes", default="1,4,8,16")
+    parser.add_argument("--chunks-per-entry", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    # Spread of each cluster relative to the distance between clusters
+    parser.add_argument("--noise", type=float, default=1.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Queries are drawn from the same clusters as the indexed vectors
+    points = clustered_vectors(
+        rng, args.vectors + args.queries, args.dimensions, 1000, args.noise
+    )
+    vectors, queries = points[: args.vectors], points[args.vectors :]
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        index = VectorIndex(base_dir, args.dimensions, args.lists, n_probe=1)
+        started = time.perf_counter()
+        for entry, start in enumerate(range(0, len(vectors), args.chunks_per_entry)):
+            block = vectors[start : start + args.chunks_per_entry]
+            chunks = [
+                {"start_page": i + 1, "end_page": i + 1} for i in range(len(block))
+            ]
+            index.add(f"entry-{entry}", chunks, block)
+        elapsed = time.perf_counter() - started
+        print(
+            f"Inserted {args.vectors} x {args.dimensions}d vectors in {elapsed:.1f}s"
+            f" ({args.vectors / elapsed:.0f}/s, quantizer trained after"
+            f" {index.train_threshold})"
+        )
+
+        # Exact top-10 by cosine similarity over all vectors
+        normalized = VectorIndex._normalize(vectors)
+        scores = VectorIndex._normalize(queries) @ normalized.T
+        truth = [
+            {(row // args.chunks_per_entry, row % args.chunks_per_entry) for row in top}
+            for top in np.argsort(-scores, axis=1)[:, :10]
+        ]
+
+        started = time.perf_counter()
+        for query in VectorIndex._normalize(queries):
+            np.argsort(-(normalized @ query))[:10]
+        exact_ms = (time.perf_counter() - started) * 1000 / len(queries)
+        print(f"exact numpy scan: {exact_ms:.1f}ms per query")
+
+        for n_probe in [int(probe) for probe in args.probes.split(",")]:
+            index.n_probe = n_probe
+            latencies, hits = [], 0
+            for query, expected in zip(queries, truth):
+                started = time.perf_counter()
+                results = index.search(query, k=10)
+                latencies.append((time.perf_counter() - started) * 1000)
+                hits += len(
+                    expected
+                    & {
+                        (int(r["entry_id"].split("-")[1]), r["chunk_index"])
+                        for r in results
+                    }
+                )
+            latencies.sort()
+            print(
+                f"n_probe={n_probe:>3}: recall@10={hits / (10 * len(queries)):.3f}"
+                f" p50={statistics.median(latencies):.1f}ms"
+                f" p95={latencies[int(len(latencies) * 0.95)]:.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
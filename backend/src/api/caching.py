@@ -0,0 +1,53 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values that determine a response"""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or (
+        if_none_match.strip() == "*"
+    )
+
+
+def set_cache_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # Clients may keep the response but must revalidate it before reuse
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified_response(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag)
+    return response
+
+
+class LRUCache:
+    """Thread-safe least recently used cache"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
@@ -1,8 +1,13 @@
+import asyncio
+
 from botocore.exceptions import ClientError
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.routers.documents import router as documents_router
+from src.api.routers.graph import router as graph_router
 from src.api.routers.processing import router as processing_router
+from src.api.routers.search import router as search_router
 from src.api.routers.upload import router as upload_router
 from src.clients.s3_client import get_s3_client
 from src.config.settings import settings
@@ -41,12 +46,22 @@ app.add_middleware(
 
 app.include_router(upload_router)
 app.include_router(processing_router)
+app.include_router(documents_router)
+app.include_router(search_router)
+app.include_router(graph_router)
+
+
+def _report_bucket_check(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        print(f"S3 bucket check failed: {task.exception()}")
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize resources on startup"""
-    ensure_s3_bucket()
+    # Check the bucket in the background so the API can serve immediately
+    app.state.bucket_check = asyncio.create_task(asyncio.to_thread(ensure_s3_bucket))
+    app.state.bucket_check.add_done_callback(_report_bucket_check)
 
 
 @app.get("/")
@@ -0,0 +1,71 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+
+from src.api.caching import (
+    make_etag,
+    not_modified,
+    not_modified_response,
+    set_cache_headers,
+)
+from src.services.async_services import AsyncDBService, get_async_db_service
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+class DocumentListResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+def _encode_cursor(item: dict) -> str:
+    raw = json.dumps([item["created_at"], item["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, entry_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return str(created_at), str(entry_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/", response_model=DocumentListResponse)
+async def list_documents(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields"),
+    db_service: AsyncDBService = Depends(get_async_db_service),
+):
+    """List documents newest first, one page at a time"""
+    after = _decode_cursor(cursor) if cursor else None
+    projection = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    try:
+        # One extra row tells whether there is a next page
+        items = await db_service.list_entries(limit + 1, after, status, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to list documents: {str(e)}"
+        )
+
+    next_cursor = _encode_cursor(items[limit - 1]) if len(items) > limit else None
+    items = items[:limit]
+    if projection:
+        items = [{field: item[field] for field in projection} for item in items]
+
+    etag = make_etag(json.dumps(items, sort_keys=True), next_cursor)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    set_cache_headers(response, etag)
+
+    return DocumentListResponse(items=items, next_cursor=next_cursor)
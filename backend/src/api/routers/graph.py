@@ -0,0 +1,76 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from src.services.async_services import run_blocking
+
+router = APIRouter(prefix="/graph", tags=["graph"])
+
+
+def _get_knowledge_graph():
+    # numpy is only imported once the graph is first queried
+    from src.services.graph_service import get_knowledge_graph
+
+    return get_knowledge_graph()
+
+
+class GraphEdge(BaseModel):
+    source: str
+    type: str
+    target: str
+
+
+class NeighborsResponse(BaseModel):
+    node: str
+    edges: List[GraphEdge]
+
+
+class PathResponse(BaseModel):
+    source: str
+    target: str
+    path: List[GraphEdge]
+
+
+@router.get("/neighbors", response_model=NeighborsResponse)
+async def get_neighbors(
+    node: str = Query(..., min_length=1),
+    direction: str = Query("both", pattern="^(in|out|both)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    graph=Depends(_get_knowledge_graph),
+):
+    """Get the edges connected to a node of the merged knowledge graph"""
+    try:
+        edges = await run_blocking(graph.neighbors, node, direction, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get neighbors: {str(e)}"
+        )
+
+    if edges is None:
+        raise HTTPException(status_code=404, detail=f"Node {node} not found")
+
+    return NeighborsResponse(node=node, edges=[GraphEdge(**edge) for edge in edges])
+
+
+@router.get("/path", response_model=PathResponse)
+async def get_path(
+    source: str = Query(..., min_length=1),
+    target: str = Query(..., min_length=1),
+    max_depth: int = Query(6, ge=1, le=12),
+    graph=Depends(_get_knowledge_graph),
+):
+    """Find the shortest path between two nodes, ignoring edge direction"""
+    try:
+        path = await run_blocking(graph.shortest_path, source, target, max_depth)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to find path: {str(e)}")
+
+    if path is None:
+        raise HTTPException(
+            status_code=404, detail=f"No path found from {source} to {target}"
+        )
+
+    return PathResponse(
+        source=source, target=target, path=[GraphEdge(**edge) for edge in path]
+    )
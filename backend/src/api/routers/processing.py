@@ -1,10 +1,29 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from pydantic import BaseModel
 
-from src.services.db_service import DBService, get_db_service
-from src.worker.tasks import process_document_task
+from src.api.caching import (
+    LRUCache,
+    make_etag,
+    not_modified,
+    not_modified_response,
+    set_cache_headers,
+)
+from src.clients.redis_client import get_redis_client
+from src.config.settings import settings
+from src.services.admission_service import (
+    DEFAULT_TENANT,
+    AdmissionService,
+    get_admission_service,
+)
+from src.services.analysis_queue import claim_chunks, release_chunks
+from src.services.async_services import (
+    AsyncDBService,
+    get_async_db_service,
+    run_blocking,
+)
+from src.worker.celery_app import celery_app
 
 router = APIRouter(prefix="/processing", tags=["processing"])
 
@@ -12,10 +31,13 @@ router = APIRouter(prefix="/processing", tags=["processing"])
 class ProcessingRequest(BaseModel):
     entry_id: str
     s3_location: str
+    # extract: text and page map only; summary: cheap reduce; full: everything
+    mode: Literal["full", "summary", "extract"] = "full"
 
 
 class ProcessingResponse(BaseModel):
-    task_id: str
+    # None while the job waits in the admission holding queue
+    task_id: Optional[str] = None
     entry_id: str
     status: str
 
@@ -37,36 +59,83 @@ class DocumentSummaryResponse(BaseModel):
     primary_topics: List[str]
 
 
+class AnalyzeRequest(BaseModel):
+    start_page: int
+    end_page: int
+
+
+class AnalyzeResponse(BaseModel):
+    entry_id: str
+    status: str
+    task_id: Optional[str] = None
+    chunks: List[Dict[str, Any]] = []
+
+
 @router.post("/submit-job", response_model=ProcessingResponse)
-async def submit_job(request: ProcessingRequest):
-    """Start document processing by sending task to Redis queue"""
+async def submit_job(
+    request: ProcessingRequest,
+    tenant_id: str = Header(DEFAULT_TENANT, alias="X-Tenant-ID"),
+    db_service: AsyncDBService = Depends(get_async_db_service),
+    admission_service: AdmissionService = Depends(get_admission_service),
+):
+    """Start document processing by sending task to Redis queue, subject to
+    admission control"""
     try:
-        # Send task to Redis queue
-        task = process_document_task.delay(request.entry_id, request.s3_location)
+        if not settings.Admission.enabled:
+            # Send task to Redis queue by name, so the API never imports worker code
+            task = await run_blocking(
+                celery_app.send_task,
+                "process_document_task",
+                args=[request.entry_id, request.s3_location, request.mode],
+            )
+            return ProcessingResponse(
+                task_id=task.id, entry_id=request.entry_id, status="queued"
+            )
 
-        return ProcessingResponse(
-            task_id=task.id, entry_id=request.entry_id, status="queued"
+        decision = await run_blocking(
+            admission_service.submit,
+            request.entry_id,
+            request.s3_location,
+            request.mode,
+            tenant_id,
         )
+        if decision.admitted:
+            return ProcessingResponse(
+                task_id=decision.task_id, entry_id=request.entry_id, status="queued"
+            )
+
+        if settings.Admission.overflow == "defer":
+            await run_blocking(
+                admission_service.defer,
+                request.entry_id,
+                request.s3_location,
+                request.mode,
+                tenant_id,
+            )
+            await db_service.update_progress(request.entry_id, 0, "deferred")
+            return ProcessingResponse(entry_id=request.entry_id, status="deferred")
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to start processing: {str(e)}"
         )
 
+    raise HTTPException(
+        status_code=429,
+        detail=decision.reason,
+        headers={"Retry-After": str(decision.retry_after)},
+    )
+
 
 @router.get("/status/{entry_id}", response_model=JobStatus)
 async def get_job_status(
-    entry_id: str, db_service: DBService = Depends(get_db_service)
+    entry_id: str,
+    request: Request,
+    response: Response,
+    db_service: AsyncDBService = Depends(get_async_db_service),
 ):
-    """Get the status of a processing job from the database"""
+    """Get the status of a processing job from the entry index"""
     try:
-        # Get all entries and find the one with matching ID
-        entries = db_service.get_all()
-        job = next((entry for entry in entries if entry["id"] == entry_id), None)
-
-        if not job:
-            raise HTTPException(status_code=404, detail=f"Job {entry_id} not found")
-
-        return JobStatus(**job)
+        job = await db_service.get_entry_record(entry_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Job {entry_id} not found")
     except Exception as e:
@@ -74,48 +143,150 @@ async def get_job_status(
             status_code=500, detail=f"Failed to get job status: {str(e)}"
         )
 
+    # Every write to an entry bumps updated_at
+    etag = make_etag(entry_id, job["updated_at"])
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    set_cache_headers(response, etag)
+
+    return JobStatus(**job)
+
+
+# Completed summaries don't change, so repeated reads skip the entry file
+_summary_cache = LRUCache(maxsize=1024)
+
 
 @router.get("/summary/{entry_id}", response_model=DocumentSummaryResponse)
 async def get_document_summary(
-    entry_id: str, db_service: DBService = Depends(get_db_service)
+    entry_id: str,
+    request: Request,
+    response: Response,
+    db_service: AsyncDBService = Depends(get_async_db_service),
 ):
     """Get the final summary of a processed document"""
     try:
-        # Get the entry from the database
-        entry = db_service.get_entry(entry_id)
-
         # Check if the document has been processed
-        if entry.get("status") != "completed":
+        record = await db_service.get_entry_record(entry_id)
+        if record.get("status") != "completed":
             raise HTTPException(
                 status_code=400,
-                detail=f"Document {entry_id} is not yet fully processed. Current status: {entry.get('status')}",
+                detail=f"Document {entry_id} is not yet fully processed. Current status: {record.get('status')}",
             )
 
-        # Check if final_summary exists
-        final_summary = entry.get("final_summary")
-        if not final_summary:
-            raise HTTPException(
-                status_code=404, detail=f"No summary found for document {entry_id}"
-            )
+        # Keyed by updated_at so reprocessing an entry invalidates it
+        cache_key = (entry_id, record.get("updated_at"))
+        cached = _summary_cache.get(cache_key)
+        if cached is None:
+            cached = await _load_document_summary(db_service, entry_id)
+            _summary_cache.set(cache_key, cached)
 
-        # Extract document_summary and primary_topics
-        document_summary = final_summary.get("document_summary", "")
-        primary_topics = final_summary.get("primary_topics", [])
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Document {entry_id} not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get document summary: {str(e)}"
+        )
 
-        if not document_summary:
-            raise HTTPException(
-                status_code=404, detail=f"Document summary not found for {entry_id}"
-            )
+    summary, etag = cached
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    set_cache_headers(response, etag)
 
-        return DocumentSummaryResponse(
-            document_summary=document_summary, primary_topics=primary_topics
+    return summary
+
+
+async def _load_document_summary(db_service: AsyncDBService, entry_id: str):
+    """Read the final summary of an entry, returning it with its ETag"""
+    entry = await db_service.get_entry(entry_id)
+
+    # Check if final_summary exists
+    final_summary = entry.get("final_summary")
+    if not final_summary:
+        raise HTTPException(
+            status_code=404, detail=f"No summary found for document {entry_id}"
+        )
+
+    # Extract document_summary and primary_topics
+    document_summary = final_summary.get("document_summary", "")
+    primary_topics = final_summary.get("primary_topics", [])
+
+    if not document_summary:
+        raise HTTPException(
+            status_code=404, detail=f"Document summary not found for {entry_id}"
         )
 
+    summary = DocumentSummaryResponse(
+        document_summary=document_summary, primary_topics=primary_topics
+    )
+    return summary, make_etag(summary.model_dump_json())
+
+
+@router.post("/analyze/{entry_id}", response_model=AnalyzeResponse)
+async def analyze_pages(
+    entry_id: str,
+    request: AnalyzeRequest,
+    db_service: AsyncDBService = Depends(get_async_db_service),
+):
+    """Get the analysis of the chunks covering a page range, queueing analysis
+    of any chunk that has not been analyzed yet"""
+    try:
+        chunks = await db_service.get_chunks(
+            entry_id, ["start_page", "end_page", "summary"]
+        )
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Document {entry_id} not found")
-    except HTTPException:
-        raise
+
+    indices = [
+        index
+        for index, chunk in enumerate(chunks)
+        if chunk["start_page"] <= request.end_page
+        and chunk["end_page"] >= request.start_page
+    ]
+    if not indices:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No chunks cover pages {request.start_page}-{request.end_page}",
+        )
+
+    missing = [
+        index
+        for index in indices
+        if not (chunks[index].get("summary") or {}).get("summary")
+    ]
+    if not missing:
+        return AnalyzeResponse(
+            entry_id=entry_id,
+            status="completed",
+            chunks=[dict(chunks[index], chunk_index=index) for index in indices],
+        )
+
+    # Chunks already queued by an earlier request aren't queued again
+    try:
+        task_id, claimed, queued_task_id = await run_blocking(
+            claim_chunks, get_redis_client(), entry_id, missing
+        )
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Failed to get document summary: {str(e)}"
+            status_code=500, detail=f"Failed to start analysis: {str(e)}"
         )
+    if not claimed:
+        return AnalyzeResponse(
+            entry_id=entry_id, status="queued", task_id=queued_task_id
+        )
+
+    try:
+        await run_blocking(
+            celery_app.send_task,
+            "analyze_chunks_task",
+            args=[entry_id, claimed],
+            task_id=task_id,
+        )
+    except Exception as e:
+        await run_blocking(release_chunks, get_redis_client(), entry_id, claimed)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to start analysis: {str(e)}"
+        )
+
+    return AnalyzeResponse(entry_id=entry_id, status="queued", task_id=task_id)
@@ -0,0 +1,80 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from src.services.async_services import run_blocking
+from src.services.search_service import SearchIndex, get_search_index
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def _get_vector_index():
+    # numpy is only imported once semantic search is first used
+    from src.services.vector_index import get_vector_index
+
+    return get_vector_index()
+
+
+class ChunkSearchResult(BaseModel):
+    entry_id: str
+    chunk_index: int
+    start_page: int
+    end_page: int
+    summary: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[ChunkSearchResult]
+
+
+class SemanticSearchResult(BaseModel):
+    entry_id: str
+    chunk_index: int
+    start_page: int
+    end_page: int
+    score: float
+
+
+class SemanticSearchResponse(BaseModel):
+    query: str
+    results: List[SemanticSearchResult]
+
+
+@router.get("/", response_model=SearchResponse)
+async def search_chunks(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    search_index: SearchIndex = Depends(get_search_index),
+):
+    """Search processed chunks by summary, topics, entities, concepts and queries"""
+    try:
+        results = await run_blocking(search_index.search, q, limit)
+        return SearchResponse(
+            query=q, results=[ChunkSearchResult(**result) for result in results]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search: {str(e)}")
+
+
+@router.get("/semantic", response_model=SemanticSearchResponse)
+async def semantic_search(
+    q: str = Query(..., min_length=1),
+    k: int = Query(10, ge=1, le=100),
+    vector_index=Depends(_get_vector_index),
+):
+    """Top-k retrieval of chunks by embedding similarity"""
+    from src.services.gen_ai.embedding_service import get_embedding_service
+
+    try:
+        query_vectors = await run_blocking(get_embedding_service().embed, [q])
+        results = await run_blocking(vector_index.search, query_vectors[0], k)
+        return SemanticSearchResponse(
+            query=q, results=[SemanticSearchResult(**result) for result in results]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to run semantic search: {str(e)}"
+        )
@@ -1,10 +1,15 @@
 import uuid
+from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from pydantic import BaseModel
 
-from src.services.db_service import DBService, get_db_service
-from src.services.s3_service import S3Service, get_s3_service
+from src.services.async_services import (
+    AsyncDBService,
+    AsyncS3Service,
+    get_async_db_service,
+    get_async_s3_service,
+)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
@@ -18,20 +23,36 @@ class UploadResponse(BaseModel):
 @router.post("/", response_model=UploadResponse)
 async def upload_file(
     file: UploadFile = File(...),
-    db_service: DBService = Depends(get_db_service),
-    s3_service: S3Service = Depends(get_s3_service),
+    previous_entry_id: Optional[str] = Query(None),
+    db_service: AsyncDBService = Depends(get_async_db_service),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service),
 ):
     key = f"uploads/{uuid.uuid4()}/{file.filename}"
     unique_id = str(uuid.uuid4())
 
+    if previous_entry_id:
+        try:
+            await db_service.get_entry(previous_entry_id)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=404, detail=f"Entry {previous_entry_id} not found"
+            )
+
     try:
         file_content = await file.read()
 
-        s3_location = s3_service.upload_file(key, file_content, file.content_type)
+        s3_location = await s3_service.upload_file(key, file_content, file.content_type)
 
         # Create entry using DBService
         print(f"creating db entry {s3_location}")
-        db_service.create_entry(unique_id, key, file.filename, s3_location)
+        await db_service.create_entry(
+            unique_id,
+            key,
+            file.filename,
+            s3_location,
+            previous_entry_id,
+            file.content_type,
+        )
 
         return UploadResponse(location=s3_location, key=key, entry_id=unique_id)
     except Exception as e:
@@ -0,0 +1,13 @@
+import redis
+
+from src.config.settings import settings
+
+# Connection pools are thread-safe, so one client is shared per process
+_client = None
+
+
+def get_redis_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.Redis.url, decode_responses=True)
+    return _client
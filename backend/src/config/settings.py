@@ -1,4 +1,6 @@
+import json
 import os
+from typing import List
 
 from pydantic import BaseModel
 
@@ -18,9 +20,103 @@ class RedisSettings(BaseModel):
     db: int
 
 
+class StorageSettings(BaseModel):
+    # "columnar" stores chunk results in per-field files, "inline" keeps them
+    # inside the entry JSON
+    chunk_format: str
+
+
+class EmbeddingSettings(BaseModel):
+    enabled: bool
+    # "openai" or "hash" (deterministic local stub for offline use)
+    provider: str
+    model: str
+    dimensions: int
+    batch_size: int
+    n_lists: int
+    n_probe: int
+
+
+class ProcessingSettings(BaseModel):
+    strip_boilerplate: bool
+    ocr_enabled: bool
+    ocr_workers: int
+    ocr_language: str
+    ocr_dpi: int
+    summary_sample_chars: int
+    # Record RSS and tracemalloc usage per pipeline stage on each entry
+    memory_profiling: bool
+    # Jobs projected to exceed this (0 = no limit) download to disk and split
+    # pages in windows
+    memory_budget_mb: int
+
+
+class LLMSettings(BaseModel):
+    chunk_model: str
+    summary_model: str
+    routing_enabled: bool
+    # Ascending tiers of {"max_score": float, "model": str}; the model
+    # "extractive" uses the local extractive summarizer instead of an LLM
+    routing_table: List[dict]
+    # Stream chunk analyses so summaries persist early and the final reduce
+    # starts before the long-tail fields finish
+    streaming: bool
+    # Duplicate chunk calls still running past this percentile of recent latency
+    hedge_percentile: float
+    # Max hedged duplicates as a fraction of all chunk calls
+    hedge_budget: float
+    call_timeout: float
+    call_retries: int
+    # Threads for chunk LLM calls, including hedges and timed-out stragglers
+    call_workers: int
+
+
+class APISettings(BaseModel):
+    # Threads for blocking storage and S3 calls made from request handlers
+    io_workers: int
+
+
+class AdmissionSettings(BaseModel):
+    enabled: bool
+    # Jobs waiting in the Celery queue before new jobs are turned away
+    max_queue_depth: int
+    # Pages being processed across all workers
+    max_inflight_pages: int
+    # Queued or running jobs per tenant (X-Tenant-ID header)
+    tenant_max_jobs: int
+    # "reject" answers 429, "defer" parks jobs in a Redis holding list
+    overflow: str
+    retry_after: int
+    # Seconds an admitted job counts against the limits without finishing,
+    # from when it is queued and again from when it starts. Must exceed the
+    # Celery task time limit
+    job_ttl: int
+    # Seconds between `celery beat` passes over the deferred jobs
+    drain_interval: int
+
+
+class RetentionSettings(BaseModel):
+    enabled: bool
+    # Completed entries untouched for this long are compacted
+    cold_after_days: int
+    # S3 prefix for compressed chunk archives
+    archive_prefix: str
+    # Keep page offsets into the source instead of archiving chunk text
+    drop_content: bool
+    # Entries compacted per scheduled run
+    batch_size: int
+
+
 class AppSettings(BaseModel):
     S3: S3Settings
     Redis: RedisSettings
+    Storage: StorageSettings
+    Embeddings: EmbeddingSettings
+    Processing: ProcessingSettings
+    LLM: LLMSettings
+    API: APISettings
+    Admission: AdmissionSettings
+    Retention: RetentionSettings
 
 
 settings = AppSettings(
@@ -37,4 +133,65 @@ settings = AppSettings(
         port=int(os.getenv("REDIS_PORT", "6379")),
         db=int(os.getenv("REDIS_DB", "0")),
     ),
+    Storage=StorageSettings(
+        chunk_format=os.getenv("CHUNK_STORAGE_FORMAT", "columnar"),
+    ),
+    Embeddings=EmbeddingSettings(
+        enabled=os.getenv("EMBEDDINGS_ENABLED", "false").lower() == "true",
+        provider=os.getenv("EMBEDDINGS_PROVIDER", "openai"),
+        model=os.getenv("EMBEDDINGS_MODEL", "text-embedding-3-small"),
+        dimensions=int(os.getenv("EMBEDDINGS_DIMENSIONS", "256")),
+        batch_size=int(os.getenv("EMBEDDINGS_BATCH_SIZE", "64")),
+        n_lists=int(os.getenv("VECTOR_INDEX_LISTS", "256")),
+        n_probe=int(os.getenv("VECTOR_INDEX_PROBES", "8")),
+    ),
+    Processing=ProcessingSettings(
+        strip_boilerplate=os.getenv("STRIP_BOILERPLATE", "true").lower() == "true",
+        ocr_enabled=os.getenv("OCR_ENABLED", "true").lower() == "true",
+        ocr_workers=int(os.getenv("OCR_WORKERS", "2")),
+        ocr_language=os.getenv("OCR_LANGUAGE", "eng"),
+        ocr_dpi=int(os.getenv("OCR_DPI", "300")),
+        summary_sample_chars=int(os.getenv("SUMMARY_SAMPLE_CHARS", "60000")),
+        memory_profiling=os.getenv("MEMORY_PROFILING", "false").lower() == "true",
+        memory_budget_mb=int(os.getenv("JOB_MEMORY_BUDGET_MB", "1024")),
+    ),
+    LLM=LLMSettings(
+        chunk_model=os.getenv("LLM_CHUNK_MODEL", "gpt-4o-mini"),
+        summary_model=os.getenv("LLM_SUMMARY_MODEL", "gpt-4.1-mini"),
+        routing_enabled=os.getenv("LLM_ROUTING_ENABLED", "false").lower() == "true",
+        routing_table=json.loads(
+            os.getenv(
+                "LLM_ROUTING_TABLE",
+                '[{"max_score": 0.2, "model": "gpt-4.1-nano"},'
+                ' {"max_score": 0.7, "model": "gpt-4o-mini"},'
+                ' {"max_score": 1.0, "model": "gpt-4.1-mini"}]',
+            )
+        ),
+        streaming=os.getenv("LLM_STREAMING", "false").lower() == "true",
+        hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+        hedge_budget=float(os.getenv("LLM_HEDGE_BUDGET", "0.1")),
+        call_timeout=float(os.getenv("LLM_CALL_TIMEOUT", "180")),
+        call_retries=int(os.getenv("LLM_CALL_RETRIES", "2")),
+        call_workers=int(os.getenv("LLM_CALL_WORKERS", "16")),
+    ),
+    API=APISettings(
+        io_workers=int(os.getenv("API_IO_WORKERS", "16")),
+    ),
+    Admission=AdmissionSettings(
+        enabled=os.getenv("ADMISSION_ENABLED", "true").lower() == "true",
+        max_queue_depth=int(os.getenv("ADMISSION_MAX_QUEUE_DEPTH", "100")),
+        max_inflight_pages=int(os.getenv("ADMISSION_MAX_INFLIGHT_PAGES", "20000")),
+        tenant_max_jobs=int(os.getenv("ADMISSION_TENANT_MAX_JOBS", "25")),
+        overflow=os.getenv("ADMISSION_OVERFLOW", "reject"),
+        retry_after=int(os.getenv("ADMISSION_RETRY_AFTER", "30")),
+        job_ttl=int(os.getenv("ADMISSION_JOB_TTL", "3600")),
+        drain_interval=int(os.getenv("ADMISSION_DRAIN_INTERVAL", "30")),
+    ),
+    Retention=RetentionSettings(
+        enabled=os.getenv("RETENTION_ENABLED", "false").lower() == "true",
+        cold_after_days=int(os.getenv("RETENTION_COLD_AFTER_DAYS", "30")),
+        archive_prefix=os.getenv("RETENTION_ARCHIVE_PREFIX", "archive/chunks"),
+        drop_content=os.getenv("RETENTION_DROP_CONTENT", "false").lower() == "true",
+        batch_size=int(os.getenv("RETENTION_BATCH_SIZE", "100")),
+    ),
 )
@@ -0,0 +1,202 @@
+import json
+import time
+from typing import Optional
+
+import redis
+from celery import Celery
+from pydantic import BaseModel
+
+from src.clients.redis_client import get_redis_client
+from src.config.settings import AdmissionSettings, settings
+from src.worker.celery_app import celery_app
+
+# Sorted sets of per-job leases scored by expiry time, so jobs whose worker
+# was killed before releasing them stop counting once the lease runs out.
+# In-flight members are "<entry_id>:<pages>"
+INFLIGHT_PAGES_KEY = "admission:inflight_pages"
+TENANT_JOBS_KEY = "admission:tenant_jobs:{tenant_id}"
+DEFERRED_KEY = "admission:deferred"
+RELEASE_LOCK_KEY = "admission:release_lock"
+
+DEFAULT_TENANT = "default"
+
+# How many deferred jobs a release pass looks at, so one tenant over its quota
+# at the head of the list doesn't hold back everyone else
+RELEASE_SCAN = 100
+
+
+class AdmissionDecision(BaseModel):
+    admitted: bool
+    # Which limit turned the job away: "tenant", "queue" or "pages"
+    limit: Optional[str] = None
+    reason: Optional[str] = None
+    retry_after: int = 0
+    task_id: Optional[str] = None
+
+
+class AdmissionService:
+    """Admission control for processing jobs, backed by Redis.
+
+    A job is admitted while the Celery queue is shorter than
+    ``max_queue_depth``, fewer than ``max_inflight_pages`` pages are being
+    processed, and its tenant has fewer than ``tenant_max_jobs`` jobs queued or
+    running. Jobs that don't fit are either rejected or parked in a holding
+    list that is drained as admitted jobs finish and periodically by
+    ``celery beat``.
+
+    Jobs and in-flight pages are counted as leases that expire after
+    ``job_ttl`` seconds, renewed when a job starts, rather than as counters a
+    killed worker would leave incremented forever.
+    """
+
+    def __init__(
+        self, client: redis.Redis, celery_app: Celery, config: AdmissionSettings
+    ):
+        self.client = client
+        self.celery_app = celery_app
+        self.config = config
+        self.queue_name = celery_app.conf.task_default_queue or "celery"
+
+    def check(self, tenant_id: str) -> AdmissionDecision:
+        now = time.time()
+        tenant_key = TENANT_JOBS_KEY.format(tenant_id=tenant_id)
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.llen(self.queue_name)
+        # Drop expired leases before counting
+        pipeline.zremrangebyscore(INFLIGHT_PAGES_KEY, "-inf", now)
+        pipeline.zrange(INFLIGHT_PAGES_KEY, 0, -1)
+        pipeline.zremrangebyscore(tenant_key, "-inf", now)
+        pipeline.zcard(tenant_key)
+        queue_depth, _, inflight_jobs, _, tenant_jobs = pipeline.execute()
+        inflight_pages = sum(int(job.rsplit(":", 1)[1]) for job in inflight_jobs)
+
+        if tenant_jobs >= self.config.tenant_max_jobs:
+            limit = "tenant"
+            reason = f"Tenant {tenant_id} has {tenant_jobs} jobs in progress"
+        elif queue_depth >= self.config.max_queue_depth:
+            limit = "queue"
+            reason = f"Processing queue is full ({queue_depth} jobs waiting)"
+        elif inflight_pages >= self.config.max_inflight_pages:
+            limit = "pages"
+            reason = f"Workers are busy ({inflight_pages} pages in progress)"
+        else:
+            return AdmissionDecision(admitted=True)
+
+        # Back off longer the further the queue is over its limit
+        overload = max(queue_depth / max(self.config.max_queue_depth, 1), 1.0)
+        return AdmissionDecision(
+            admitted=False,
+            limit=limit,
+            reason=reason,
+            retry_after=int(self.config.retry_after * overload),
+        )
+
+    def submit(
+        self, entry_id: str, s3_location: str, mode: str, tenant_id: str
+    ) -> AdmissionDecision:
+        """Admit and queue a job, or return why it was not admitted"""
+        decision = self.check(tenant_id)
+        if decision.admitted and self.deferred_count():
+            # Don't let new jobs overtake the ones already waiting
+            decision = AdmissionDecision(
+                admitted=False,
+                limit="queue",
+                reason="Earlier jobs are waiting for capacity",
+                retry_after=self.config.retry_after,
+            )
+        if decision.admitted:
+            decision.task_id = self._send(
+                {
+                    "entry_id": entry_id,
+                    "s3_location": s3_location,
+                    "mode": mode,
+                    "tenant_id": tenant_id,
+                }
+            )
+        return decision
+
+    def _lease(self, key: str, member: str):
+        self.client.zadd(key, {member: time.time() + self.config.job_ttl})
+
+    def _send(self, job: dict) -> str:
+        tenant_key = TENANT_JOBS_KEY.format(tenant_id=job["tenant_id"])
+        self._lease(tenant_key, job["entry_id"])
+        try:
+            task = self.celery_app.send_task(
+                "process_document_task",
+                args=[job["entry_id"], job["s3_location"], job["mode"]],
+                kwargs={"tenant_id": job["tenant_id"]},
+            )
+        except Exception:
+            self.client.zrem(tenant_key, job["entry_id"])
+            raise
+        return task.id
+
+    def defer(self, entry_id: str, s3_location: str, mode: str, tenant_id: str):
+        """Park a job in the holding list until capacity frees up"""
+        job = {
+            "entry_id": entry_id,
+            "s3_location": s3_location,
+            "mode": mode,
+            "tenant_id": tenant_id,
+        }
+        self.client.rpush(DEFERRED_KEY, json.dumps(job))
+
+    def deferred_count(self) -> int:
+        return self.client.llen(DEFERRED_KEY)
+
+    def start(self, entry_id: str, tenant_id: str):
+        """Called when an admitted job starts, so time spent queued doesn't
+        run down its lease"""
+        self._lease(TENANT_JOBS_KEY.format(tenant_id=tenant_id), entry_id)
+
+    def release(self, entry_id: str, tenant_id: str):
+        """Called when an admitted job finishes"""
+        self.client.zrem(TENANT_JOBS_KEY.format(tenant_id=tenant_id), entry_id)
+        self.release_deferred()
+
+    def release_deferred(self) -> list:
+        """Queue deferred jobs, oldest first, while they are admitted"""
+        released = []
+        lock = self.client.lock(RELEASE_LOCK_KEY, timeout=30)
+        # Another process is already draining the list
+        if not lock.acquire(blocking=False):
+            return released
+
+        try:
+            for raw in self.client.lrange(DEFERRED_KEY, 0, RELEASE_SCAN - 1):
+                job = json.loads(raw)
+                decision = self.check(job["tenant_id"])
+                if not decision.admitted:
+                    # Only a tenant limit can let later jobs through
+                    if decision.limit != "tenant":
+                        break
+                    continue
+                # Remove first so a crash can't queue the same job twice
+                if self.client.lrem(DEFERRED_KEY, 1, raw):
+                    try:
+                        self._send(job)
+                    except Exception:
+                        self.client.lpush(DEFERRED_KEY, raw)
+                        raise
+                    released.append(job)
+        finally:
+            lock.release()
+
+        if released:
+            print(f"Released {len(released)} deferred jobs")
+        return released
+
+    def add_inflight_pages(self, entry_id: str, pages: int):
+        self._lease(INFLIGHT_PAGES_KEY, f"{entry_id}:{pages}")
+
+    def remove_inflight_pages(self, entry_id: str):
+        jobs = self.client.zrange(INFLIGHT_PAGES_KEY, 0, -1)
+        finished = [job for job in jobs if job.rsplit(":", 1)[0] == entry_id]
+        if finished:
+            self.client.zrem(INFLIGHT_PAGES_KEY, *finished)
+
+
+def get_admission_service() -> AdmissionService:
+    """Dependency injection for AdmissionService"""
+    return AdmissionService(get_redis_client(), celery_app, settings.Admission)
@@ -0,0 +1,39 @@
+import uuid
+from typing import List, Optional, Tuple
+
+import redis
+
+QUEUED_KEY = "analysis:queued:{entry_id}:{index}"
+# Claims expire in case a task is lost before it releases them
+QUEUED_TTL = 3600
+
+
+def claim_chunks(
+    client: redis.Redis, entry_id: str, indices: List[int]
+) -> Tuple[str, List[int], Optional[str]]:
+    """Claim chunks for a new on-demand analysis task.
+
+    Returns the new task id, the indices it claimed and the id of a task
+    already queued for one of the others (None if it claimed them all).
+    """
+    task_id = str(uuid.uuid4())
+    keys = [QUEUED_KEY.format(entry_id=entry_id, index=index) for index in indices]
+    pipeline = client.pipeline(transaction=False)
+    for key in keys:
+        pipeline.set(key, task_id, nx=True, ex=QUEUED_TTL)
+    claimed = pipeline.execute()
+
+    existing = [key for key, ok in zip(keys, claimed) if not ok]
+    return (
+        task_id,
+        [index for index, ok in zip(indices, claimed) if ok],
+        client.get(existing[0]) if existing else None,
+    )
+
+
+def release_chunks(client: redis.Redis, entry_id: str, indices: List[int]):
+    """Release the claims of a finished analysis task"""
+    if indices:
+        client.delete(
+            *(QUEUED_KEY.format(entry_id=entry_id, index=index) for index in indices)
+        )
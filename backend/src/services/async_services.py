@@ -0,0 +1,81 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Optional
+
+from src.config.settings import settings
+from src.services.db_service import DBService, get_db_service
+from src.services.s3_service import S3Service, get_s3_service
+
+# Shared by all requests, so a slow disk or S3 can only tie up this many
+# threads instead of the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.API.io_workers, thread_name_prefix="blocking-io"
+)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking call on the shared I/O pool without stalling the loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+class AsyncDBService:
+    """Awaitable wrapper around DBService for request handlers"""
+
+    def __init__(self, db_service: DBService):
+        self.db_service = db_service
+
+    async def create_entry(self, *args, **kwargs) -> str:
+        return await run_blocking(self.db_service.create_entry, *args, **kwargs)
+
+    async def update_progress(self, entry_id: str, progress: int, status: str = None):
+        return await run_blocking(
+            self.db_service.update_progress, entry_id, progress, status
+        )
+
+    async def update_entry(self, entry_id: str, **fields):
+        return await run_blocking(self.db_service.update_entry, entry_id, **fields)
+
+    async def get_all(self) -> list:
+        return await run_blocking(self.db_service.get_all)
+
+    async def get_entry(self, entry_id: str) -> dict:
+        return await run_blocking(self.db_service.get_entry, entry_id)
+
+    async def get_entry_record(self, entry_id: str) -> dict:
+        return await run_blocking(self.db_service.get_entry_record, entry_id)
+
+    async def list_entries(self, *args, **kwargs) -> list:
+        return await run_blocking(self.db_service.list_entries, *args, **kwargs)
+
+    async def get_chunks(self, entry_id: str, fields: list = None) -> list:
+        return await run_blocking(self.db_service.get_chunks, entry_id, fields)
+
+
+class AsyncS3Service:
+    """Awaitable wrapper around S3Service for request handlers"""
+
+    def __init__(self, s3_service: S3Service):
+        self.s3_service = s3_service
+
+    async def upload_file(
+        self, key: str, file_content: bytes, content_type: Optional[str] = None
+    ) -> str:
+        return await run_blocking(
+            self.s3_service.upload_file, key, file_content, content_type
+        )
+
+    async def read_file(self, key: str) -> BytesIO:
+        return await run_blocking(self.s3_service.read_file, key)
+
+
+def get_async_db_service() -> AsyncDBService:
+    """Dependency injection for AsyncDBService"""
+    return AsyncDBService(get_db_service())
+
+
+def get_async_s3_service() -> AsyncS3Service:
+    """Dependency injection for AsyncS3Service"""
+    return AsyncS3Service(get_s3_service())
@@ -0,0 +1,206 @@
+import fcntl
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from src.services.serialization import read_json, write_json
+
+MANIFEST_FILE = "manifest.json"
+
+
+class ChunkStore:
+    """Columnar storage for processed chunks.
+
+    Each entry gets its own directory with one compact JSON file per column
+    (``content``, ``start_page``, ``summary.topics``, ...), so readers only
+    decode the fields they ask for instead of the whole chunk payload.
+
+    Columns of cold entries may be archived elsewhere (listed under the
+    manifest's ``archive`` key); reading one calls ``rehydrate(entry_id,
+    columns)`` to restore it first.
+    """
+
+    def __init__(self, base_dir: str, rehydrate: Callable = None):
+        self.base_dir = os.path.join(base_dir, "chunks")
+        self.rehydrate = rehydrate
+        # Entries whose lock the current thread holds, so it can nest
+        self._held = threading.local()
+
+    def _entry_dir(self, entry_id: str) -> str:
+        return os.path.join(self.base_dir, entry_id)
+
+    def _column_path(self, entry_id: str, column: str) -> str:
+        return os.path.join(self._entry_dir(entry_id), f"{column}.json")
+
+    @contextmanager
+    def lock(self, entry_id: str):
+        """Serialize read-modify-write of an entry's chunks across threads and
+        worker processes. Re-entrant within a thread."""
+        held = self._held.__dict__.setdefault("entries", set())
+        if entry_id in held:
+            yield
+            return
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        # The lock file sits outside the entry directory, which write() replaces
+        with open(os.path.join(self.base_dir, f"{entry_id}.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            held.add(entry_id)
+            try:
+                yield
+            finally:
+                held.discard(entry_id)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _flatten(chunk: dict) -> Dict[str, object]:
+        """Flatten one level of nested dicts into dotted column names"""
+        columns = {}
+        for key, value in chunk.items():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    columns[f"{key}.{sub_key}"] = sub_value
+            else:
+                columns[key] = value
+        return columns
+
+    def write(self, entry_id: str, chunks: List[dict]):
+        """Write all chunks for an entry, replacing any previous columns"""
+        columns: Dict[str, list] = {}
+        for index, chunk in enumerate(chunks):
+            for name, value in self._flatten(chunk).items():
+                # Chunks missing a column get None so indices stay aligned
+                columns.setdefault(name, [None] * len(chunks))[index] = value
+
+        entry_dir = self._entry_dir(entry_id)
+        with self.lock(entry_id):
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir)
+            os.makedirs(entry_dir, exist_ok=True)
+            self.write_columns(entry_id, columns)
+            write_json(
+                os.path.join(entry_dir, MANIFEST_FILE),
+                {"count": len(chunks), "columns": sorted(columns)},
+            )
+
+    def update_rows(self, entry_id: str, rows: Dict[int, dict]):
+        """Merge fields into some chunks, rewriting only the columns they touch.
+        Hold ``lock(entry_id)`` around the read that decided the update."""
+        updates: Dict[str, Dict[int, object]] = {}
+        for index, fields in rows.items():
+            for name, value in self._flatten(fields).items():
+                updates.setdefault(name, {})[index] = value
+        if not updates:
+            return
+
+        with self.lock(entry_id):
+            columns = {}
+            for name, values in updates.items():
+                column = self.read_column(entry_id, name)
+                for index, value in values.items():
+                    column[index] = value
+                columns[name] = column
+            self.write_columns(entry_id, columns)
+
+            # Reading may have rehydrated archived columns into the manifest
+            manifest = self.get_manifest(entry_id)
+            added = [name for name in columns if name not in manifest["columns"]]
+            if added:
+                manifest["columns"] = sorted(manifest["columns"] + added)
+                self.write_manifest(entry_id, manifest)
+
+    def exists(self, entry_id: str) -> bool:
+        return os.path.exists(os.path.join(self._entry_dir(entry_id), MANIFEST_FILE))
+
+    def get_manifest(self, entry_id: str) -> dict:
+        manifest_path = os.path.join(self._entry_dir(entry_id), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Chunks for entry {entry_id} not found")
+        return read_json(manifest_path)
+
+    def write_manifest(self, entry_id: str, manifest: dict):
+        write_json(os.path.join(self._entry_dir(entry_id), MANIFEST_FILE), manifest)
+
+    @staticmethod
+    def archived_columns(manifest: dict) -> List[str]:
+        """Columns listed in the manifest that are not stored locally"""
+        return (manifest.get("archive") or {}).get("columns", [])
+
+    def _ensure_local(self, entry_id: str, manifest: dict, columns: List[str]):
+        archived = self.archived_columns(manifest)
+        pending = [column for column in columns if column in archived]
+        if not pending:
+            return
+        if self.rehydrate is None:
+            raise FileNotFoundError(f"Chunks for entry {entry_id} are archived")
+        self.rehydrate(entry_id, pending)
+
+    def read_column(self, entry_id: str, column: str) -> list:
+        """Read a single column, e.g. ``summary.summary``"""
+        manifest = self.get_manifest(entry_id)
+        if column not in manifest["columns"]:
+            return [None] * manifest["count"]
+        self._ensure_local(entry_id, manifest, [column])
+        return read_json(self._column_path(entry_id, column))
+
+    def read(self, entry_id: str, fields: Optional[List[str]] = None) -> List[dict]:
+        """Read chunks back as dicts, decoding only the requested columns.
+
+        ``fields`` accepts column names (``start_page``) as well as nested
+        groups (``summary`` expands to every ``summary.*`` column).
+        """
+        manifest = self.get_manifest(entry_id)
+        available = manifest["columns"]
+
+        if fields is None:
+            selected = available
+        else:
+            selected = [
+                column
+                for column in available
+                if column in fields or column.split(".", 1)[0] in fields
+            ]
+
+        self._ensure_local(entry_id, manifest, selected)
+        chunks = [{} for _ in range(manifest["count"])]
+        for column, values in self.read_columns(entry_id, selected).items():
+            if "." in column:
+                group, name = column.split(".", 1)
+                for chunk, value in zip(chunks, values):
+                    chunk.setdefault(group, {})[name] = value
+            else:
+                for chunk, value in zip(chunks, values):
+                    chunk[column] = value
+
+        return chunks
+
+    def read_columns(self, entry_id: str, columns: List[str]) -> Dict[str, list]:
+        """Read local column files as they are, without rehydrating"""
+        return {
+            column: read_json(self._column_path(entry_id, column)) for column in columns
+        }
+
+    def write_columns(self, entry_id: str, columns: Dict[str, list]):
+        for column, values in columns.items():
+            write_json(self._column_path(entry_id, column), values)
+
+    def drop_columns(self, entry_id: str, columns: List[str]):
+        for column in columns:
+            path = self._column_path(entry_id, column)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def size(self, entry_id: str) -> int:
+        """Bytes used on disk by an entry's columns and manifest"""
+        entry_dir = self._entry_dir(entry_id)
+        return sum(
+            os.path.getsize(os.path.join(entry_dir, name))
+            for name in os.listdir(entry_dir)
+        )
+
+    def delete(self, entry_id: str):
+        entry_dir = self._entry_dir(entry_id)
+        if os.path.exists(entry_dir):
+            shutil.rmtree(entry_dir)
@@ -0,0 +1,30 @@
+import lzma
+
+import zstandard
+
+# Archives are tagged with the codec's extension, so lzma archives written
+# before zstandard was a dependency can still be read
+ZSTD_EXTENSION = ".zst"
+LZMA_EXTENSION = ".xz"
+
+
+def default_extension() -> str:
+    return ZSTD_EXTENSION
+
+
+def compress(raw: bytes, extension: str = None) -> bytes:
+    """Compress with zstd unless another codec is asked for"""
+    extension = extension or default_extension()
+    if extension == ZSTD_EXTENSION:
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    if extension == LZMA_EXTENSION:
+        return lzma.compress(raw, preset=6)
+    raise ValueError(f"Unknown compression: {extension}")
+
+
+def decompress(data: bytes, extension: str) -> bytes:
+    if extension == ZSTD_EXTENSION:
+        return zstandard.ZstdDecompressor().decompress(data)
+    if extension == LZMA_EXTENSION:
+        return lzma.decompress(data)
+    raise ValueError(f"Unknown compression: {extension}")
@@ -1,7 +1,11 @@
-import json
 import os
 from datetime import datetime, timezone
 
+from src.config.settings import settings
+from src.services.chunk_store import ChunkStore
+from src.services.entry_index import INDEXED_FIELDS, EntryIndex
+from src.services.serialization import read_json, write_json
+
 
 class DBService:
     def __init__(self, base_dir: str = None):
@@ -21,8 +25,20 @@ class DBService:
         else:
             self.base_dir = base_dir
 
+        self.chunk_store = ChunkStore(self.base_dir, rehydrate=self._rehydrate_chunks)
+        self.entry_index = EntryIndex(self.base_dir)
+        if self.entry_index.created:
+            # Index entries written before the index existed
+            self.entry_index.upsert(self.get_all())
+
     def create_entry(
-        self, unique_id: str, key: str, filename: str, location: str
+        self,
+        unique_id: str,
+        key: str,
+        filename: str,
+        location: str,
+        previous_version: str = None,
+        content_type: str = None,
     ) -> str:
         """Create a new entry in the mock NoSQL database"""
         # Create upload record
@@ -34,8 +50,13 @@ class DBService:
             "status": "queued",
             "progress": 0,
             "processing_job": None,
+            "content_type": content_type,
         }
 
+        # Link re-uploads so unchanged chunks can be reused during processing
+        if previous_version:
+            upload_record["previous_version"] = previous_version
+
         # Add timestamps
         now = datetime.now(timezone.utc).isoformat()
         upload_record["created_at"] = now
@@ -46,8 +67,8 @@ class DBService:
         json_file_path = os.path.join(self.base_dir, f"{unique_id}.json")
 
         print(json_file_path)
-        with open(json_file_path, "w") as f:
-            json.dump(upload_record, f, indent=2)
+        write_json(json_file_path, upload_record)
+        self.entry_index.upsert([upload_record])
 
         return unique_id
 
@@ -59,8 +80,7 @@ class DBService:
             raise FileNotFoundError(f"Entry {entry_id} not found")
 
         # Read existing data
-        with open(json_file_path, "r") as f:
-            entry_data = json.load(f)
+        entry_data = read_json(json_file_path)
 
         # Update progress and timestamp
         entry_data["progress"] = progress
@@ -70,8 +90,37 @@ class DBService:
             entry_data["status"] = status
 
         # Write back to file
-        with open(json_file_path, "w") as f:
-            json.dump(entry_data, f, indent=2)
+        write_json(json_file_path, entry_data)
+        self.entry_index.upsert([entry_data])
+
+    def update_entry(self, entry_id: str, **fields):
+        """Merge arbitrary fields into an existing entry"""
+        json_file_path = os.path.join(self.base_dir, f"{entry_id}.json")
+
+        if not os.path.exists(json_file_path):
+            raise FileNotFoundError(f"Entry {entry_id} not found")
+
+        entry_data = read_json(json_file_path)
+        entry_data.update(fields)
+        entry_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        write_json(json_file_path, entry_data)
+        self.entry_index.upsert([entry_data])
+
+    def delete_fields(self, entry_id: str, *fields: str):
+        """Remove fields from an existing entry"""
+        json_file_path = os.path.join(self.base_dir, f"{entry_id}.json")
+
+        if not os.path.exists(json_file_path):
+            raise FileNotFoundError(f"Entry {entry_id} not found")
+
+        entry_data = read_json(json_file_path)
+        for field in fields:
+            entry_data.pop(field, None)
+        entry_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        write_json(json_file_path, entry_data)
+        self.entry_index.upsert([entry_data])
 
     def get_all(self) -> list:
         """Get all entries from the mock NoSQL database"""
@@ -80,9 +129,7 @@ class DBService:
         for filename in os.listdir(self.base_dir):
             if filename.endswith(".json"):
                 json_file_path = os.path.join(self.base_dir, filename)
-                with open(json_file_path, "r") as f:
-                    entry_data = json.load(f)
-                    entries.append(entry_data)
+                entries.append(read_json(json_file_path))
 
         return entries
 
@@ -93,10 +140,60 @@ class DBService:
         if not os.path.exists(json_file_path):
             raise FileNotFoundError(f"Entry {entry_id} not found")
 
-        with open(json_file_path, "r") as f:
-            entry_data = json.load(f)
-
-        return entry_data
+        return read_json(json_file_path)
+
+    def get_entry_record(self, entry_id: str) -> dict:
+        """Get an entry's indexed metadata (no chunks or results) by ID"""
+        record = self.entry_index.get(entry_id)
+        if record is None:
+            entry = self.get_entry(entry_id)
+            record = {field: entry.get(field) for field in INDEXED_FIELDS}
+        return record
+
+    def list_entries(
+        self,
+        limit: int = 50,
+        after: tuple = None,
+        status: str = None,
+        fields: list = None,
+    ) -> list:
+        """Page through entry metadata newest first (see EntryIndex.list)"""
+        return self.entry_index.list(limit, after, status, fields)
+
+    def store_chunks(self, entry_id: str, chunks: list):
+        """Persist processed chunks using the configured storage format"""
+        if settings.Storage.chunk_format == "inline":
+            self.chunk_store.delete(entry_id)
+            self.update_entry(entry_id, chunks=chunks)
+        else:
+            self.chunk_store.write(entry_id, chunks)
+            self.update_entry(entry_id, chunks_count=len(chunks))
+
+    def update_chunks(self, entry_id: str, rows: dict):
+        """Merge fields into the chunks at the given indices, leaving the other
+        chunks as they are on disk"""
+        with self.chunk_store.lock(entry_id):
+            if self.chunk_store.exists(entry_id):
+                self.chunk_store.update_rows(entry_id, rows)
+                return
+            chunks = self.get_entry(entry_id).get("chunks", [])
+            for index, fields in rows.items():
+                chunks[index].update(fields)
+            self.update_entry(entry_id, chunks=chunks)
+
+    def get_chunks(self, entry_id: str, fields: list = None) -> list:
+        """Get processed chunks, decoding only ``fields`` when columnar"""
+        if self.chunk_store.exists(entry_id):
+            return self.chunk_store.read(entry_id, fields)
+
+        # Fall back to entries stored with chunks inline
+        return self.get_entry(entry_id).get("chunks", [])
+
+    def _rehydrate_chunks(self, entry_id: str, columns: list):
+        """Restore archived chunk columns from S3 (see RetentionService)"""
+        from src.services.retention_service import get_retention_service
+
+        get_retention_service(self).rehydrate(entry_id, columns)
 
 
 def get_db_service() -> DBService:
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+from contextlib import closing
+from typing import List, Optional, Tuple
+
+# Small, frequently listed entry fields mirrored from the entry JSON files
+INDEXED_FIELDS = [
+    "id",
+    "key",
+    "filename",
+    "location",
+    "status",
+    "progress",
+    "processing_job",
+    "content_type",
+    "previous_version",
+    "created_at",
+    "updated_at",
+]
+
+
+class EntryIndex:
+    """SQLite index of entry metadata, sorted by ``created_at``.
+
+    The entry JSON files stay the source of truth; this index lets listings
+    and status checks page through entries without parsing every file.
+    """
+
+    # Schema checks are done once per database file and process
+    _initialized = set()
+
+    def __init__(self, base_dir: str):
+        self.db_path = os.path.join(base_dir, "entries.sqlite")
+        self.created = False
+        if self.db_path not in self._initialized:
+            os.makedirs(base_dir, exist_ok=True)
+            self.created = self._ensure_schema()
+            self._initialized.add(self.db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _ensure_schema(self) -> bool:
+        """Create the schema, returning whether the table is new"""
+        with closing(self._connect()) as connection, connection:
+            # WAL lets the API read while a worker is updating progress
+            connection.execute("PRAGMA journal_mode=WAL")
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entries'"
+            ).fetchone()
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    id TEXT PRIMARY KEY,
+                    key TEXT,
+                    filename TEXT,
+                    location TEXT,
+                    status TEXT,
+                    progress INTEGER,
+                    processing_job TEXT,
+                    content_type TEXT,
+                    previous_version TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_entries_created"
+                " ON entries(created_at, id)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_entries_status_created"
+                " ON entries(status, created_at, id)"
+            )
+        return exists is None
+
+    def upsert(self, entries: List[dict]):
+        """Insert or refresh the indexed fields of the given entries"""
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT OR REPLACE INTO entries ({', '.join(INDEXED_FIELDS)})"
+                f" VALUES ({', '.join('?' * len(INDEXED_FIELDS))})",
+                [
+                    tuple(entry.get(field) for field in INDEXED_FIELDS)
+                    for entry in entries
+                ],
+            )
+
+    def delete(self, entry_id: str):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+
+    def get(self, entry_id: str) -> Optional[dict]:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT * FROM entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[dict]:
+        """Entries newest first, continuing after the ``(created_at, id)`` key"""
+        fields = fields or INDEXED_FIELDS
+        unknown = set(fields) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        # The sort key is always selected so the caller can build a cursor
+        columns = list(dict.fromkeys([*fields, "created_at", "id"]))
+
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if after:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(columns)} FROM entries {where}"
+                " ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
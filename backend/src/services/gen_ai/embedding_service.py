@@ -0,0 +1,67 @@
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+from openai import OpenAI
+
+from src.config.settings import settings
+
+
+class EmbeddingService:
+    """Embeds texts in batches with the OpenAI embeddings API"""
+
+    def __init__(self, model: str, dimensions: int, batch_size: int):
+        self.client = OpenAI()
+        self.model = model
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start : start + self.batch_size]
+            response = self.client.embeddings.create(
+                model=self.model, input=batch, dimensions=self.dimensions
+            )
+            vectors.extend(item.embedding for item in response.data)
+
+        return np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+
+
+class HashEmbeddingService:
+    """Deterministic local embeddings from hashed unigrams and bigrams.
+
+    Not semantically strong, but needs no network access, which makes it
+    suitable for offline development and repeatable tests.
+    """
+
+    def __init__(self, dimensions: int, batch_size: int):
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        tokens = re.findall(r"\w+", text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # Low bit picks the sign so collisions tend to cancel out
+            vector[(value >> 1) % self.dimensions] += 1.0 if value & 1 else -1.0
+
+        return vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.stack([self._embed_one(text) for text in texts])
+
+
+def get_embedding_service():
+    """Return the embedding backend configured in settings"""
+    config = settings.Embeddings
+    if config.provider == "hash":
+        return HashEmbeddingService(config.dimensions, config.batch_size)
+    return EmbeddingService(config.model, config.dimensions, config.batch_size)
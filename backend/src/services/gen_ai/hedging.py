@@ -0,0 +1,149 @@
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from src.config.settings import settings
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.latencies = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self.latencies.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency at the given percentile (0-100), or None while warming up"""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(int(len(ordered) * percentile / 100), len(ordered) - 1)
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Caps extra attempts (hedged duplicates and retries) at a fraction of
+    primary calls, plus a small burst allowance, so neither can multiply the
+    load on a provider that is already slow or failing"""
+
+    def __init__(self, ratio: float, burst: int = 2):
+        self.ratio = ratio
+        self.burst = burst
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.hedges < self.calls * self.ratio + self.burst:
+                self.hedges += 1
+                return True
+            return False
+
+
+class HedgedCaller:
+    """Runs blocking LLM calls on a dedicated thread pool with per-call
+    timeouts, retries and speculative hedging.
+
+    When a call is still running after the configured percentile of recent
+    latency, a duplicate is started, and whichever finishes first wins.
+    Hedges and retries both draw on the budget. A thread cannot be
+    interrupted, so a losing or timed-out call keeps its pool thread until
+    the client's own timeout ends it. The pool's size bounds how many such
+    calls run at once, and calls that have not started yet are dropped.
+    """
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        budget: HedgeBudget,
+        executor: ThreadPoolExecutor,
+        hedge_percentile: float,
+        timeout: float,
+        retries: int,
+        backoff: float = 1.0,
+    ):
+        self.tracker = tracker
+        self.budget = budget
+        self.executor = executor
+        self.hedge_percentile = hedge_percentile
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    async def call(self, fn, *args):
+        self.budget.record_call()
+        for attempt in range(self.retries + 1):
+            try:
+                return await asyncio.wait_for(self._hedged(fn, *args), self.timeout)
+            except Exception as e:
+                if attempt == self.retries or not self.budget.try_acquire():
+                    raise
+                print(f"LLM call failed ({e!r}), retry {attempt + 1}/{self.retries}")
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+    def _submit(self, fn, *args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor, functools.partial(fn, *args))
+
+    async def _hedged(self, fn, *args):
+        started = time.perf_counter()
+        pending = {self._submit(fn, *args)}
+
+        try:
+            delay = self.tracker.percentile(self.hedge_percentile)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self.budget.try_acquire():
+                    print(f"Hedging LLM call still running after {delay:.1f}s")
+                    pending.add(self._submit(fn, *args))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.tracker.record(time.perf_counter() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+# Shared per process so latency history and the hedge budget span documents
+_latency_tracker = LatencyTracker()
+_hedge_budget = HedgeBudget(settings.LLM.hedge_budget)
+# Separate from the default executor so stuck LLM calls can't starve other
+# blocking work (and vice versa)
+_call_executor = ThreadPoolExecutor(
+    max_workers=settings.LLM.call_workers, thread_name_prefix="llm-call"
+)
+
+
+def get_hedged_caller() -> HedgedCaller:
+    return HedgedCaller(
+        _latency_tracker,
+        _hedge_budget,
+        _call_executor,
+        hedge_percentile=settings.LLM.hedge_percentile,
+        timeout=settings.LLM.call_timeout,
+        retries=settings.LLM.call_retries,
+    )
@@ -0,0 +1,117 @@
+import re
+from collections import Counter
+from typing import List
+
+from pydantic import BaseModel
+
+# Routing to this "model" skips the LLM and uses the local extractive summarizer
+EXTRACTIVE_MODEL = "extractive"
+
+STOPWORDS = set(
+    """a an and are as at be been but by for from has have in is it its of on or
+    that the this to was were will with which not no can may shall should would
+    their there these those than then they he she we you i our your his her""".split()
+)
+
+
+class RoutingTier(BaseModel):
+    max_score: float
+    model: str
+
+
+class RoutingDecision(BaseModel):
+    model: str
+    score: float
+    features: dict
+
+
+def chunk_features(content: str) -> dict:
+    """Cheap local signals of how hard a chunk is to analyze"""
+    lines = [line for line in content.splitlines() if line.strip()]
+    line_count = max(len(lines), 1)
+
+    # Table-like lines: several numeric cells or explicit column separators
+    table_lines = sum(
+        1
+        for line in lines
+        if len(re.findall(r"\d[\d,.%]*", line)) >= 3 or line.count("|") >= 2
+    )
+    non_ascii = sum(1 for char in content if ord(char) > 127)
+    duplicate_lines = line_count - len(set(lines))
+
+    return {
+        "length": len(content),
+        "table_density": table_lines / line_count,
+        "non_ascii_ratio": non_ascii / max(len(content), 1),
+        "boilerplate_ratio": duplicate_lines / line_count,
+    }
+
+
+def complexity_score(features: dict) -> float:
+    """Combine chunk features into a 0-1 complexity score.
+
+    Length only breaks ties: almost every chunk is close to the full chunk
+    size, so plain prose of any length stays in the cheapest tier and
+    tables and non-English text decide when a bigger model is needed.
+    """
+    length = min(features["length"] / 25000, 1.0)
+    tables = min(features["table_density"] * 3, 1.0)
+    # Non-English text is harder for the small models
+    language = min(features["non_ascii_ratio"] * 5, 1.0)
+    # Repetitive text carries less information
+    repetition = features["boilerplate_ratio"]
+
+    score = 0.15 * length + 0.5 * tables + 0.35 * language - 0.2 * repetition
+    return round(min(max(score, 0.0), 1.0), 3)
+
+
+class ModelRouter:
+    """Routes chunks to models through a table of ascending score thresholds"""
+
+    def __init__(self, table: List[RoutingTier]):
+        if not table:
+            raise ValueError("Routing table must have at least one tier")
+        self.table = sorted(table, key=lambda tier: tier.max_score)
+
+    def route(self, content: str) -> RoutingDecision:
+        features = chunk_features(content)
+        score = complexity_score(features)
+        tier = next(
+            (tier for tier in self.table if score <= tier.max_score), self.table[-1]
+        )
+        return RoutingDecision(model=tier.model, score=score, features=features)
+
+
+def extractive_analysis(content: str, max_sentences: int = 2, max_topics: int = 5):
+    """Frequency-based extractive summary for simple chunks.
+
+    Returns ``(summary, topics)``: the highest scoring sentences in document
+    order, and the most frequent content words title-cased.
+    """
+    text = re.sub(r"\[Page \d+\]", " ", content)
+    words = [
+        word
+        for word in re.findall(r"[a-zA-Z][a-zA-Z-]+", text.lower())
+        if word not in STOPWORDS
+    ]
+    frequencies = Counter(words)
+
+    sentences = [
+        sentence.strip()
+        for sentence in re.split(r"(?<=[.!?])\s+|\n{2,}", text)
+        if len(sentence.split()) >= 5
+    ]
+    scored = sorted(
+        range(len(sentences)),
+        key=lambda index: sum(
+            frequencies[word]
+            for word in re.findall(r"[a-zA-Z][a-zA-Z-]+", sentences[index].lower())
+        )
+        / (len(sentences[index].split()) + 1),
+        reverse=True,
+    )
+    chosen = sorted(scored[:max_sentences])
+    summary = " ".join(re.sub(r"\s+", " ", sentences[i]) for i in chosen)
+
+    topics = [word.title() for word, _ in frequencies.most_common(max_topics)]
+    return summary or text.strip()[:300], topics
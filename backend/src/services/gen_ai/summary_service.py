@@ -4,10 +4,18 @@ import instructor
 from openai import OpenAI
 from pydantic import BaseModel, Field
 
+from src.config.settings import settings
 from src.prompts.system_prompts import (
     DOCUMENT_CHUNK_SYSTEM_PROMPT,
     DOCUMENT_SUMMARY_SYSTEM_PROMPT,
 )
+from src.services.gen_ai.model_router import (
+    EXTRACTIVE_MODEL,
+    ModelRouter,
+    RoutingDecision,
+    RoutingTier,
+    extractive_analysis,
+)
 
 
 class ChunkAnalysis(BaseModel):
@@ -54,19 +62,124 @@ class DocumentSummary(BaseModel):
     )
 
 
+def _summary_complete(partial: ChunkAnalysis) -> bool:
+    """Whether a streamed partial analysis has moved past its summary.
+
+    summary is the first key, so once any later field holds a value the
+    summary string is closed. Fields not streamed yet are None or their
+    default depending on the instructor version, so neither counts.
+    """
+    for name, field in ChunkAnalysis.model_fields.items():
+        if name == "summary":
+            continue
+        value = getattr(partial, name, None)
+        if value is not None and value != field.get_default(call_default_factory=True):
+            return True
+    return False
+
+
 class SummaryService:
     def __init__(self):
-        self.client = instructor.from_openai(OpenAI())
+        openai_client = OpenAI()
+        self.client = instructor.from_openai(openai_client)
+        # Chunk calls go through the hedged caller, which retries them itself;
+        # the timeout ends calls it has given up on instead of leaving them
+        # holding a thread
+        self.chunk_client = instructor.from_openai(
+            openai_client.with_options(timeout=settings.LLM.call_timeout, max_retries=0)
+        )
+        self.model_router = None
+        if settings.LLM.routing_enabled:
+            self.model_router = ModelRouter(
+                [RoutingTier(**tier) for tier in settings.LLM.routing_table]
+            )
 
-    def get_chunk_summary(self, start_page, end_page, chunk_content):
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
+    def route_chunk(self, chunk_content) -> RoutingDecision:
+        """Pick the model for a chunk from its local complexity heuristics"""
+        if self.model_router is None:
+            return RoutingDecision(
+                model=settings.LLM.chunk_model, score=0.0, features={}
+            )
+        return self.model_router.route(chunk_content)
+
+    def get_chunk_summary(self, start_page, end_page, chunk_content, model=None):
+        model = model or self.route_chunk(chunk_content).model
+
+        if model == EXTRACTIVE_MODEL:
+            summary, topics = extractive_analysis(chunk_content)
+            return ChunkAnalysis(summary=summary, topics=topics).model_dump()
+
+        response = self.chunk_client.chat.completions.create(
+            model=model,
+            response_model=ChunkAnalysis,
+            messages=self._chunk_messages(start_page, end_page, chunk_content),
+        )
+
+        print(response)
+
+        return response.model_dump()
+
+    def stream_chunk_summary(
+        self, start_page, end_page, chunk_content, model=None, on_summary=None
+    ):
+        """Stream the chunk analysis, calling ``on_summary(summary)`` as soon as
+        the summary field is complete instead of after the whole response"""
+        model = model or self.route_chunk(chunk_content).model
+
+        if model == EXTRACTIVE_MODEL:
+            result = self.get_chunk_summary(start_page, end_page, chunk_content, model)
+            if on_summary:
+                on_summary(result["summary"])
+            return result
+
+        partial = None
+        summary_sent = False
+        for partial in self.chunk_client.chat.completions.create_partial(
+            model=model,
             response_model=ChunkAnalysis,
+            messages=self._chunk_messages(start_page, end_page, chunk_content),
+        ):
+            if not summary_sent and partial.summary and _summary_complete(partial):
+                summary_sent = True
+                if on_summary:
+                    on_summary(partial.summary)
+
+        if partial is None:
+            # The stream ended before yielding anything: ask again without it
+            print("Chunk analysis stream was empty, retrying without streaming")
+            result = self.get_chunk_summary(start_page, end_page, chunk_content, model)
+            if on_summary:
+                on_summary(result["summary"])
+            return result
+
+        fields = {k: v for k, v in partial.model_dump().items() if v is not None}
+        response = ChunkAnalysis(**fields)
+        if not summary_sent and on_summary:
+            on_summary(response.summary)
+
+        print(response)
+
+        return response.model_dump()
+
+    @staticmethod
+    def _chunk_messages(start_page, end_page, chunk_content):
+        return [
+            {"role": "system", "content": DOCUMENT_CHUNK_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": f"Document Chunk from pages {start_page} to {end_page} :{chunk_content}",
+            },
+        ]
+
+    def get_final_summary(self, chunks):
+        response = self.client.chat.completions.create(
+            model=settings.LLM.summary_model,
+            response_model=DocumentSummary,
             messages=[
-                {"role": "system", "content": DOCUMENT_CHUNK_SYSTEM_PROMPT},
+                {"role": "system", "content": DOCUMENT_SUMMARY_SYSTEM_PROMPT},
                 {
                     "role": "user",
-                    "content": f"Document Chunk from pages {start_page} to {end_page} :{chunk_content}",
+                    "content": ", ".join([str(chunk) for chunk in chunks]),
                 },
             ],
         )
@@ -75,15 +188,23 @@ class SummaryService:
 
         return response.model_dump()
 
-    def get_final_summary(self, chunks):
+    def get_compact_summary(self, excerpts):
+        """Summarize a document straight from sampled chunk text, skipping the
+        per-chunk analysis"""
+        content = "\n\n".join(
+            f"Excerpt from pages {excerpt['start_page']} to {excerpt['end_page']}:"
+            f"\n{excerpt['excerpt']}"
+            for excerpt in excerpts
+        )
         response = self.client.chat.completions.create(
-            model="gpt-4.1-mini",
+            model=settings.LLM.summary_model,
             response_model=DocumentSummary,
             messages=[
                 {"role": "system", "content": DOCUMENT_SUMMARY_SYSTEM_PROMPT},
                 {
                     "role": "user",
-                    "content": ", ".join([str(chunk) for chunk in chunks]),
+                    "content": "The input below is raw document excerpts rather "
+                    f"than chunk summaries.\n\n{content}",
                 },
             ],
         )
@@ -0,0 +1,368 @@
+import fcntl
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.services.db_service import get_db_service
+
+EDGE_DTYPE = np.dtype([("src", np.int32), ("dst", np.int32), ("type", np.int32)])
+
+# Limits of the int64 edge keys used for deduplication (see KnowledgeGraph._keys)
+MAX_NODES = 1 << 23
+MAX_TYPES = 1 << 16
+
+
+def normalize_label(label: str) -> str:
+    """Normalize an entity/relation label so variants intern to the same ID"""
+    label = re.sub(r"\s+", " ", str(label)).strip(" \t\n.,;:'\"").lower()
+    return re.sub(r"^(the|a|an) ", "", label)
+
+
+class KnowledgeGraph:
+    """Merged knowledge graph over every processed document.
+
+    Node and relation labels are interned to integer IDs (append-only
+    ``nodes.tsv`` / ``types.tsv``) and edges are appended to ``edges.bin``
+    as packed int32 triples. Readers pick up new data by reading only the
+    appended tail of each file under a shared lock and build CSR adjacency
+    arrays on demand.
+
+    One instance is shared per process, including by the API's blocking-call
+    threads, so in-memory state only changes under ``_lock``. Labels and
+    edges are append-only, so a query holding an older adjacency snapshot
+    still reads valid edges and labels.
+    """
+
+    def __init__(self, base_dir: str):
+        self.graph_dir = os.path.join(base_dir, "graph")
+        os.makedirs(self.graph_dir, exist_ok=True)
+        self.nodes_path = os.path.join(self.graph_dir, "nodes.tsv")
+        self.types_path = os.path.join(self.graph_dir, "types.tsv")
+        self.edges_path = os.path.join(self.graph_dir, "edges.bin")
+        self.lock_path = os.path.join(self.graph_dir, ".lock")
+
+        self.node_ids: Dict[str, int] = {}
+        self.node_labels: List[str] = []
+        self.type_ids: Dict[str, int] = {}
+        self.type_labels: List[str] = []
+        self.edges = np.zeros(0, dtype=EDGE_DTYPE)
+        # self.edges is a view of this buffer, grown by doubling so appends
+        # don't copy every edge
+        self._edge_buffer = self.edges
+        self._edge_keys = np.zeros(0, dtype=np.int64)
+        self._offsets = {self.nodes_path: 0, self.types_path: 0, self.edges_path: 0}
+        self._adjacency = None
+        # Guards in-memory state against other threads; the file locks only
+        # serialize processes
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _file_lock(self, operation: int):
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_lock(self):
+        """Serialize writers across worker processes"""
+        return self._file_lock(fcntl.LOCK_EX)
+
+    def _read_lock(self):
+        """Keep writers out while reading, so edges never reference labels
+        that were not read yet"""
+        return self._file_lock(fcntl.LOCK_SH)
+
+    def _read_tail(self, path: str, record_size: int = None) -> bytes:
+        """Read complete lines (or ``record_size`` records) appended since the
+        last call, leaving any partial tail for the next one"""
+        if not os.path.exists(path):
+            return b""
+        with open(path, "rb") as f:
+            f.seek(self._offsets[path])
+            data = f.read()
+        if record_size:
+            end = len(data) - len(data) % record_size
+        else:
+            end = data.rfind(b"\n") + 1
+        self._offsets[path] += end
+        return data[:end]
+
+    def refresh(self):
+        """Load anything appended to the graph files since the last refresh"""
+        with self._lock, self._read_lock():
+            self._refresh()
+
+    def _refresh(self):
+        for line in self._read_tail(self.nodes_path).decode("utf-8").splitlines():
+            key, label = line.split("\t", 1)
+            self.node_ids[key] = len(self.node_labels)
+            self.node_labels.append(label)
+
+        for line in self._read_tail(self.types_path).decode("utf-8").splitlines():
+            key, label = line.split("\t", 1)
+            self.type_ids[key] = len(self.type_labels)
+            self.type_labels.append(label)
+
+        new_edges = np.frombuffer(
+            self._read_tail(self.edges_path, EDGE_DTYPE.itemsize), dtype=EDGE_DTYPE
+        )
+        if len(new_edges):
+            self._append_edges(new_edges)
+            self._add_keys(np.sort(self._keys(new_edges)))
+            self._adjacency = None
+
+    def _append_edges(self, edges: np.ndarray):
+        count = len(self.edges)
+        if count + len(edges) > len(self._edge_buffer):
+            capacity = max(2 * len(self._edge_buffer), count + len(edges), 1024)
+            buffer = np.zeros(capacity, dtype=EDGE_DTYPE)
+            buffer[:count] = self.edges
+            self._edge_buffer = buffer
+        self._edge_buffer[count : count + len(edges)] = edges
+        self.edges = self._edge_buffer[: count + len(edges)]
+
+    def _add_keys(self, keys: np.ndarray):
+        """Merge sorted keys into the sorted key array without re-sorting it"""
+        positions = np.searchsorted(self._edge_keys, keys)
+        self._edge_keys = np.insert(self._edge_keys, positions, keys)
+
+    def _known(self, keys: np.ndarray) -> np.ndarray:
+        positions = np.searchsorted(self._edge_keys, keys)
+        found = np.zeros(len(keys), dtype=bool)
+        inside = positions < len(self._edge_keys)
+        found[inside] = self._edge_keys[positions[inside]] == keys[inside]
+        return found
+
+    @staticmethod
+    def _keys(edges: np.ndarray) -> np.ndarray:
+        """Pack (src, dst, type) into one int64 for fast dedup"""
+        if len(edges) and (
+            max(edges["src"].max(), edges["dst"].max()) >= MAX_NODES
+            or edges["type"].max() >= MAX_TYPES
+        ):
+            raise ValueError(
+                f"Edge keys support at most {MAX_NODES} nodes"
+                f" and {MAX_TYPES} relation types"
+            )
+        return (
+            (edges["src"].astype(np.int64) << 40)
+            | (edges["dst"].astype(np.int64) << 16)
+            | edges["type"].astype(np.int64)
+        )
+
+    @staticmethod
+    def _intern(label, ids: Dict[str, int], labels: List[str], pending: list):
+        key = normalize_label(label)
+        if not key:
+            return None
+        if key not in ids:
+            ids[key] = len(labels)
+            labels.append(re.sub(r"\s+", " ", str(label)).strip())
+            pending.append(f"{key}\t{labels[-1]}\n")
+        return ids[key]
+
+    @staticmethod
+    def _extract_triples(chunks: List[dict]):
+        for chunk in chunks:
+            analysis = chunk.get("summary") or {}
+            for edge in analysis.get("graph_edges") or []:
+                yield edge.get("from"), edge.get("type"), edge.get("to")
+            for relationship in analysis.get("relationships") or []:
+                yield (
+                    relationship.get("subject"),
+                    relationship.get("relation"),
+                    relationship.get("object"),
+                )
+
+    def add_document(self, chunks: List[dict]) -> int:
+        """Merge one document's graph edges and relationships into the graph.
+
+        Returns the number of edges that were not already present.
+        """
+        with self._lock, self._write_lock():
+            self._refresh()
+            # A writer killed mid-append leaves a partial record that refresh
+            # skipped; drop it so new data starts on a record boundary
+            for path, offset in self._offsets.items():
+                if os.path.exists(path) and os.path.getsize(path) > offset:
+                    os.truncate(path, offset)
+
+            node_count, type_count = len(self.node_labels), len(self.type_labels)
+            new_nodes, new_types, triples = [], [], []
+            for source, relation, target in self._extract_triples(chunks):
+                if not source or not target or not relation:
+                    continue
+                src = self._intern(source, self.node_ids, self.node_labels, new_nodes)
+                dst = self._intern(target, self.node_ids, self.node_labels, new_nodes)
+                rel = self._intern(relation, self.type_ids, self.type_labels, new_types)
+                if src is not None and dst is not None and rel is not None:
+                    triples.append((src, dst, rel))
+
+            if len(self.node_labels) > MAX_NODES or len(self.type_labels) > MAX_TYPES:
+                # Forget the labels interned above, nothing was written yet
+                for labels, ids, count in (
+                    (self.node_labels, self.node_ids, node_count),
+                    (self.type_labels, self.type_ids, type_count),
+                ):
+                    for label in labels[count:]:
+                        ids.pop(normalize_label(label), None)
+                    del labels[count:]
+                raise ValueError(
+                    f"Knowledge graph is limited to {MAX_NODES} nodes"
+                    f" and {MAX_TYPES} relation types"
+                )
+
+            edges = np.array(triples, dtype=EDGE_DTYPE)
+            keys, first = np.unique(self._keys(edges), return_index=True)
+            new = ~self._known(keys)
+            edges, keys = edges[first[new]], keys[new]
+
+            # Labels must hit disk before edges that reference them
+            with open(self.nodes_path, "a", encoding="utf-8") as f:
+                f.writelines(new_nodes)
+            with open(self.types_path, "a", encoding="utf-8") as f:
+                f.writelines(new_types)
+            with open(self.edges_path, "ab") as f:
+                edges.tofile(f)
+
+            # Our in-memory state already reflects what was just written
+            for path in self._offsets:
+                if os.path.exists(path):
+                    self._offsets[path] = os.path.getsize(path)
+            self._append_edges(edges)
+            self._add_keys(keys)
+            self._adjacency = None
+
+        return len(edges)
+
+    def _build_adjacency(self):
+        """Build CSR arrays for outgoing and incoming edges"""
+        with self._lock:
+            if self._adjacency is None:
+                node_count = len(self.node_labels)
+                adjacency = {}
+                for direction, key in (("out", "src"), ("in", "dst")):
+                    order = np.argsort(self.edges[key], kind="stable")
+                    counts = np.bincount(self.edges[key], minlength=node_count)
+                    indptr = np.concatenate([[0], np.cumsum(counts)])
+                    adjacency[direction] = (indptr, order)
+                self._adjacency = adjacency
+            return self._adjacency
+
+    def _edge_indices(self, node_id: int, direction: str) -> np.ndarray:
+        indptr, order = self._build_adjacency()[direction]
+        return order[indptr[node_id] : indptr[node_id + 1]]
+
+    def find_node(self, label: str) -> Optional[int]:
+        self.refresh()
+        return self.node_ids.get(normalize_label(label))
+
+    def neighbors(self, label: str, direction: str = "both", limit: int = 100):
+        """Return edges touching a node, as (source, type, target) labels"""
+        node_id = self.find_node(label)
+        if node_id is None:
+            return None
+
+        directions = ["out", "in"] if direction == "both" else [direction]
+        indices = np.concatenate([self._edge_indices(node_id, d) for d in directions])
+
+        return [self._edge_to_dict(self.edges[index]) for index in indices[:limit]]
+
+    def _edge_to_dict(self, edge) -> dict:
+        return {
+            "source": self.node_labels[edge["src"]],
+            "type": self.type_labels[edge["type"]],
+            "target": self.node_labels[edge["dst"]],
+        }
+
+    def shortest_path(self, source: str, target: str, max_depth: int = 6):
+        """Bidirectional breadth-first search ignoring edge direction; returns
+        the edges on the path, an empty list if source == target, or None if
+        unreachable within ``max_depth`` edges"""
+        source_id = self.find_node(source)
+        target_id = self.find_node(target)
+        if source_id is None or target_id is None:
+            return None
+        if source_id == target_id:
+            return []
+
+        # Search one adjacency snapshot even if another thread refreshes
+        adjacency = self._build_adjacency()
+        # Per side: depth of every reached node (-1 = not reached) and the
+        # edge index used to reach it
+        node_count = len(adjacency["out"][0]) - 1
+        sides = []
+        for start in (source_id, target_id):
+            depth = np.full(node_count, -1, dtype=np.int32)
+            parent = np.full(node_count, -1, dtype=np.int64)
+            depth[start] = 0
+            sides.append([np.array([start]), depth, parent])
+
+        for _ in range(max_depth):
+            # Grow the side with the smaller frontier by one level
+            side, other = sorted(sides, key=lambda s: len(s[0]))
+            frontier, depth, parent = side
+            level = depth[frontier[0]] + 1
+            reached, via = self._expand(adjacency, frontier)
+            new = depth[reached] < 0
+            reached, via = reached[new], via[new]
+            reached, first = np.unique(reached, return_index=True)
+            if not len(reached):
+                return None
+            depth[reached] = level
+            parent[reached] = via[first]
+            side[0] = reached
+
+            meets = reached[other[1][reached] >= 0]
+            if len(meets):
+                meet = int(meets[np.argmin(other[1][meets])])
+                from_source = self._unwind(sides[0][2], meet)
+                from_target = self._unwind(sides[1][2], meet)
+                return list(reversed(from_source)) + from_target
+
+        return None
+
+    def _expand(self, adjacency: dict, frontier: np.ndarray):
+        """Nodes one edge away from the frontier, with the edge indices"""
+        nodes, edges = [], []
+        for direction, other in (("out", "dst"), ("in", "src")):
+            indptr, order = adjacency[direction]
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            if not counts.sum():
+                continue
+            # Positions of every frontier node's edges in the CSR order
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            edge_indices = order[offsets + np.arange(counts.sum())]
+            nodes.append(self.edges[other][edge_indices])
+            edges.append(edge_indices)
+        if not nodes:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+        return np.concatenate(nodes), np.concatenate(edges)
+
+    def _unwind(self, parent: np.ndarray, node_id: int) -> List[dict]:
+        """Edges from ``node_id`` back to the search root"""
+        path = []
+        while parent[node_id] >= 0:
+            edge = self.edges[parent[node_id]]
+            path.append(self._edge_to_dict(edge))
+            node_id = int(edge["src"]) if edge["dst"] == node_id else int(edge["dst"])
+        return path
+
+
+_graphs: Dict[str, KnowledgeGraph] = {}
+
+
+def get_knowledge_graph() -> KnowledgeGraph:
+    """Dependency injection for KnowledgeGraph, shared per process so reads
+    only load newly appended data"""
+    base_dir = get_db_service().base_dir
+    if base_dir not in _graphs:
+        _graphs[base_dir] = KnowledgeGraph(base_dir)
+    return _graphs[base_dir]
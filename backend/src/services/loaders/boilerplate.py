@@ -0,0 +1,94 @@
+import re
+from collections import Counter
+from typing import List, Tuple
+
+from pydantic import BaseModel
+
+
+class BoilerplateStats(BaseModel):
+    repeated_lines: int = 0
+    removed_lines: int = 0
+    removed_chars: int = 0
+    # Rough estimate using ~4 characters per token
+    removed_tokens: int = 0
+
+
+def _line_keys(content: str, edge_lines: int) -> List[Tuple[str, bool]]:
+    """Normalized key for every line of a page, and whether the line sits in
+    the page's first/last ``edge_lines`` lines.
+
+    Digits are masked so running headers/footers like "Page 3 of 10" match
+    across pages. Pages of at most ``2 * edge_lines`` lines have no edge
+    window: they are too short to tell a header from their content.
+    """
+    lines = content.splitlines()
+    has_edges = len(lines) > 2 * edge_lines
+    keys = []
+    for index, line in enumerate(lines):
+        key = re.sub(r"\d+", "#", re.sub(r"\s+", " ", line).strip().lower())
+        edge = has_edges and (index < edge_lines or index >= len(lines) - edge_lines)
+        keys.append((key, edge))
+    return keys
+
+
+def strip_boilerplate(
+    pages: List[BaseModel],
+    min_page_ratio: float = 0.5,
+    min_pages: int = 3,
+    edge_lines: int = 3,
+) -> Tuple[List[BaseModel], BoilerplateStats]:
+    """Remove lines repeated across many pages (headers, footers, legal notices).
+
+    ``pages`` are page models with a ``content`` field (e.g. ``PDFPage``).
+
+    A line counts as boilerplate when its normalized form appears on at least
+    ``min_page_ratio`` of the pages (and on at least ``min_pages`` pages) and
+    most of its occurrences sit near the top or bottom of a page; it is only
+    removed where it sits there. Body lines that merely repeat (table rows, code fences) are
+    kept, and a page is never reduced to nothing. Page numbers are
+    preserved, so chunk page attribution is unchanged.
+    """
+    stats = BoilerplateStats()
+    if len(pages) < min_pages:
+        return pages, stats
+
+    page_counts, line_counts, edge_counts = Counter(), Counter(), Counter()
+    for page in pages:
+        keys = [
+            (key, edge) for key, edge in _line_keys(page.content, edge_lines) if key
+        ]
+        page_counts.update({key for key, _ in keys})
+        line_counts.update(key for key, _ in keys)
+        edge_counts.update(key for key, edge in keys if edge)
+
+    threshold = max(min_pages, min_page_ratio * len(pages))
+    repeated = {
+        line
+        for line, count in page_counts.items()
+        if count >= threshold and edge_counts[line] * 2 > line_counts[line]
+    }
+    stats.repeated_lines = len(repeated)
+    if not repeated:
+        return pages, stats
+
+    cleaned_pages = []
+    for page in pages:
+        kept_lines, removed = [], []
+        lines = page.content.splitlines()
+        for line, (key, edge) in zip(lines, _line_keys(page.content, edge_lines)):
+            if edge and key in repeated:
+                removed.append(line)
+            else:
+                kept_lines.append(line)
+
+        content = "\n".join(kept_lines).strip()
+        if removed and not content:
+            # Nothing but boilerplate is more likely a misjudged page
+            cleaned_pages.append(page)
+            continue
+        stats.removed_lines += len(removed)
+        stats.removed_chars += sum(len(line) + 1 for line in removed)
+        cleaned_pages.append(page.model_copy(update={"content": content}))
+
+    stats.removed_tokens = stats.removed_chars // 4
+    return cleaned_pages, stats
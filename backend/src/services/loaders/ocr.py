@@ -0,0 +1,162 @@
+import hashlib
+import os
+import queue
+from typing import Dict, List, Optional
+
+import pymupdf
+from billiard.pool import Pool
+
+from src.config.settings import settings
+
+# Pages with less extracted text than this are treated as text-less
+MIN_NATIVE_TEXT_CHARS = 20
+
+
+def needs_ocr(page: pymupdf.Page, text: str) -> bool:
+    """A page needs OCR when it has (almost) no native text but does have images"""
+    return len(text) < MIN_NATIVE_TEXT_CHARS and bool(page.get_images())
+
+
+def page_fingerprint(pdf_file: pymupdf.Document, page: pymupdf.Page) -> str:
+    """Hash a page's content stream and embedded images for the OCR cache"""
+    digest = hashlib.sha256(page.read_contents())
+    for image in page.get_images(full=True):
+        digest.update(pdf_file.xref_stream_raw(image[0]) or b"")
+    return digest.hexdigest()
+
+
+def _ocr_single_page(page_pdf: bytes, language: str, dpi: int) -> str:
+    """Run in a pool process: OCR the only page of a one-page PDF"""
+    with pymupdf.open(stream=page_pdf, filetype="pdf") as pdf_file:
+        page = pdf_file[0]
+        text_page = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+        return page.get_text(textpage=text_page).strip()
+
+
+class OcrEngine:
+    """Tesseract OCR (through pymupdf) for scanned pages.
+
+    Only pages flagged by ``needs_ocr`` are sent here. Each one is copied into
+    a single-page PDF and OCR'd in a process pool, with at most
+    ``max_workers * 2`` pages in flight to keep memory bounded. Results are
+    cached on disk by page fingerprint, language and resolution.
+
+    The pool is billiard's (Celery's multiprocessing fork): prefork workers
+    are daemonic, and the standard library refuses to start children from a
+    daemonic process.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_workers: int = 2,
+        language: str = "eng",
+        dpi: int = 300,
+    ):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.language = language
+        self.dpi = dpi
+
+    def _cache_path(self, fingerprint: str) -> str:
+        # The same page reads differently with another language or resolution
+        name = f"{fingerprint}-{self.language}-{self.dpi}.txt"
+        return os.path.join(self.cache_dir, name)
+
+    def _read_cache(self, fingerprint: str):
+        path = self._cache_path(fingerprint)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _write_cache(self, fingerprint: str, text: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._cache_path(fingerprint), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    @staticmethod
+    def _single_page_pdf(pdf_file: pymupdf.Document, page_index: int) -> bytes:
+        with pymupdf.open() as page_pdf:
+            page_pdf.insert_pdf(pdf_file, from_page=page_index, to_page=page_index)
+            return page_pdf.tobytes()
+
+    def ocr_pages(
+        self, pdf_file: pymupdf.Document, page_indices: List[int]
+    ) -> Dict[int, str]:
+        """OCR the given 0-based page indices, returning text per index"""
+        results = {}
+        pending = []
+        for page_index in page_indices:
+            fingerprint = page_fingerprint(pdf_file, pdf_file[page_index])
+            cached = self._read_cache(fingerprint)
+            if cached is not None:
+                results[page_index] = cached
+            else:
+                pending.append((page_index, fingerprint))
+
+        if not pending:
+            return results
+
+        print(f"Running OCR on {len(pending)} pages ({len(results)} cached)")
+        failed = []
+        done = queue.Queue()
+        pool = Pool(processes=self.max_workers, maxtasksperchild=20)
+        try:
+            in_flight = 0
+            remaining = iter(pending)
+            while True:
+                # Top up the window lazily so page bytes aren't all held at once
+                while in_flight < self.max_workers * 2:
+                    item = next(remaining, None)
+                    if item is None:
+                        break
+                    try:
+                        page_pdf = self._single_page_pdf(pdf_file, item[0])
+                    except Exception as e:
+                        done.put((item, None, e))
+                    else:
+                        pool.apply_async(
+                            _ocr_single_page,
+                            (page_pdf, self.language, self.dpi),
+                            callback=lambda text, item=item: done.put(
+                                (item, text, None)
+                            ),
+                            error_callback=lambda e, item=item: done.put(
+                                (item, None, e)
+                            ),
+                        )
+                    in_flight += 1
+
+                if not in_flight:
+                    break
+
+                (page_index, fingerprint), text, error = done.get()
+                in_flight -= 1
+                if error is not None:
+                    # Leave the page empty rather than failing the document;
+                    # failures aren't cached so a later run can retry them
+                    failed.append(page_index)
+                    print(f"OCR failed on page {page_index + 1}: {error!r}")
+                    continue
+                self._write_cache(fingerprint, text)
+                results[page_index] = text
+        finally:
+            pool.terminate()
+            pool.join()
+
+        if failed:
+            print(f"OCR failed on {len(failed)}/{len(pending)} pages")
+        return results
+
+
+def get_ocr_engine(base_dir: str) -> Optional[OcrEngine]:
+    """OCR engine for scanned pages, caching results next to the database"""
+    if not settings.Processing.ocr_enabled:
+        return None
+    return OcrEngine(
+        cache_dir=os.path.join(base_dir, "ocr_cache"),
+        max_workers=settings.Processing.ocr_workers,
+        language=settings.Processing.ocr_language,
+        dpi=settings.Processing.ocr_dpi,
+    )
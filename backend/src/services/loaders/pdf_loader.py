@@ -1,16 +1,22 @@
+import hashlib
 import io
+import re
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
 import pymupdf
 from langchain.text_splitter import CharacterTextSplitter
 from pydantic import BaseModel
 
+from src.services.loaders.boilerplate import strip_boilerplate
+from src.services.loaders.ocr import OcrEngine, needs_ocr
+
 
 class PDFPage(BaseModel):
     page_number: int
     content: str
     total_pages: int
+    ocr: bool = False
 
 
 class PDFChunk(BaseModel):
@@ -21,6 +27,9 @@ class PDFChunk(BaseModel):
 
 
 class PdfDocumentLoader:
+    # Real pages, which can carry running headers and footers
+    paginated = True
+
     def __init__(self):
         pass
 
@@ -38,9 +47,12 @@ class PdfDocumentLoader:
 
     @staticmethod
     def extract_pages(
-        pdf_path: Path | str = None, io_stream: io.BytesIO = None
+        pdf_path: Path | str = None,
+        io_stream: io.BytesIO = None,
+        ocr_engine: OcrEngine = None,
     ) -> List[PDFPage]:
-        """Extract all PDF pages' content."""
+        """Extract all PDF pages' content, OCR'ing text-less scanned pages
+        when an ``ocr_engine`` is given."""
 
         if pdf_path:
             pdf_file = pymupdf.open(pdf_path)
@@ -51,10 +63,14 @@ class PdfDocumentLoader:
             raise ValueError("Either 'pdf_path' or 'io_stream' must be provided.")
 
         pages = []
+        ocr_candidates = []
         for page_number in range(pdf_file.page_count):
             page = pdf_file[page_number]
             text = page.get_text().strip()
 
+            if ocr_engine and needs_ocr(page, text):
+                ocr_candidates.append(page_number)
+
             pages.append(
                 PDFPage(
                     page_number=page_number + 1,
@@ -63,12 +79,27 @@ class PdfDocumentLoader:
                 )
             )
 
+        # Native-text pages never reach the OCR engine
+        if ocr_candidates:
+            ocr_text = ocr_engine.ocr_pages(pdf_file, ocr_candidates)
+            for page_number, text in ocr_text.items():
+                pages[page_number].content = text
+                pages[page_number].ocr = True
+
         pdf_file.close()
         return pages
 
 
 class PdfChunkDocumentLoader:
-    def __init__(self, chunk_size: int = 0, overlap: int = 0):
+    def __init__(
+        self,
+        chunk_size: int = 0,
+        overlap: int = 0,
+        strip_boilerplate: bool = False,
+        ocr_engine: OcrEngine = None,
+        page_loader: type = None,
+        window_chars: int = 0,
+    ):
         if chunk_size <= 0:
             raise ValueError("chunk_size must be a positive integer")
         if overlap < 0:
@@ -77,7 +108,15 @@ class PdfChunkDocumentLoader:
             raise ValueError("overlap must be less than chunk_size")
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.strip_boilerplate = strip_boilerplate
+        self.ocr_engine = ocr_engine
+        # Any loader from the registry can supply pages; PDF by default
+        self.page_loader = page_loader or PdfDocumentLoader
+        # When set, pages are split a window at a time to bound memory use
+        self.window_chars = window_chars
+        self.boilerplate_stats = None
         self.pages = []
+        self.page_fingerprints = []
 
     @staticmethod
     def get_document_length(pdf_path: Path | str = None, io_stream: io.BytesIO = None):
@@ -91,20 +130,181 @@ class PdfChunkDocumentLoader:
 
         return pdf_file.page_count
 
+    def _load_pages(
+        self, pdf_path: Union[Path, str] = None, io_stream: io.BytesIO = None
+    ):
+        """Load and preprocess pages once, fingerprinting their final content"""
+        if self.pages:
+            return
+
+        # Load all pages using the page loader for this document type
+        self.pages = self.page_loader.extract_pages(
+            pdf_path, io_stream, self.ocr_engine
+        )
+
+        # Drop headers/footers repeated on every page before splitting. Other
+        # formats' sections have none, only content that happens to repeat
+        if self.strip_boilerplate and self.page_loader.paginated:
+            self.pages, self.boilerplate_stats = strip_boilerplate(self.pages)
+
+        self.page_fingerprints = [
+            hashlib.sha256(page.content.encode("utf-8")).hexdigest()
+            for page in self.pages
+        ]
+
+    def load_pages(
+        self, pdf_path: Union[Path, str] = None, io_stream: io.BytesIO = None
+    ) -> List[PDFPage]:
+        """Preprocessed pages exactly as they are chunked"""
+        self._load_pages(pdf_path, io_stream)
+        return self.pages
+
     def extract_chunks(
         self, pdf_path: Union[Path, str] = None, io_stream: io.BytesIO = None
     ) -> List[PDFChunk]:
-        # Load all pages using PdfDocumentLoader
-        if not self.pages:
-            self.pages = PdfDocumentLoader.extract_pages(pdf_path, io_stream)
+        self._load_pages(pdf_path, io_stream)
+        return self._split(self.pages)
+
+    def extract_chunks_reusing(
+        self,
+        previous_fingerprints: List[str],
+        previous_chunks: List[dict],
+        pdf_path: Union[Path, str] = None,
+        io_stream: io.BytesIO = None,
+    ) -> List[Tuple[PDFChunk, Optional[dict]]]:
+        """Chunk a new version of a document, reusing the previous version's
+        chunks wherever all of their pages are unchanged.
 
+        Returns ``(chunk, previous_analysis)`` pairs; ``previous_analysis`` is
+        None for chunks that have to be analyzed again. Changed pages are
+        re-split together with one neighbouring page on each side, standing in
+        for the overlap with the reused chunks around them.
+
+        A run of pages that occurs more than once (duplicate or blank pages)
+        goes to the occurrence nearest to where the previous chunks placed
+        the document so far, the earlier one on a tie. Each previous page
+        maps to at most one new page and the other way round, so two
+        previous chunks never land on the same position.
+        """
+        self._load_pages(pdf_path, io_stream)
         if not self.pages:
             return []
 
+        positions = {}
+        for index, fingerprint in enumerate(self.page_fingerprints):
+            positions.setdefault(fingerprint, []).append(index)
+
+        results = []
+        covered = [False] * len(self.pages)
+        # Previous page index -> new page index, and back, for reused chunks
+        new_index_of, previous_index_of = {}, {}
+        offset = 0
+        for chunk in previous_chunks:
+            first = chunk["start_page"] - 1
+            run = previous_fingerprints[first : chunk["end_page"]]
+            if not run or not (chunk.get("summary") or {}).get("summary"):
+                continue
+
+            candidates = [
+                index
+                for index in positions.get(run[0], [])
+                if self.page_fingerprints[index : index + len(run)] == run
+                and all(
+                    new_index_of.get(first + page, index + page) == index + page
+                    and previous_index_of.get(index + page, first + page)
+                    == first + page
+                    for page in range(len(run))
+                )
+            ]
+            if not candidates:
+                continue
+
+            expected = first + offset
+            start = min(candidates, key=lambda index: (abs(index - expected), index))
+            offset = start - first
+            for page in range(len(run)):
+                new_index_of[first + page] = start + page
+                previous_index_of[start + page] = first + page
+
+            covered[start : start + len(run)] = [True] * len(run)
+            shift = self.pages[start].page_number - chunk["start_page"]
+            content = re.sub(
+                r"\[Page (\d+)\]",
+                lambda match: f"[Page {int(match.group(1)) + shift}]",
+                chunk["content"],
+            )
+            results.append(
+                (
+                    PDFChunk(
+                        content=content,
+                        start_page=chunk["start_page"] + shift,
+                        end_page=chunk["end_page"] + shift,
+                        total_pages=self.pages[0].total_pages,
+                    ),
+                    chunk["summary"],
+                )
+            )
+
+        # Re-split every run of pages not covered by a reused chunk
+        index = 0
+        while index < len(self.pages):
+            if covered[index]:
+                index += 1
+                continue
+            run_end = index
+            while run_end < len(self.pages) and not covered[run_end]:
+                run_end += 1
+            run_pages = self.pages[max(index - 1, 0) : run_end + 1]
+            results.extend((chunk, None) for chunk in self._split(run_pages))
+            index = run_end
+
+        return sorted(results, key=lambda pair: (pair[0].start_page, pair[0].end_page))
+
+    def _split(self, pages: List[PDFPage]) -> List[PDFChunk]:
+        if self.window_chars:
+            return self._split_pages_windowed(pages)
+        return self._split_pages(pages)
+
+    def _split_pages_windowed(self, pages: List[PDFPage]) -> List[PDFChunk]:
+        """Split pages in windows of about ``window_chars`` characters instead
+        of building one string for the whole document.
+
+        The last chunk of each window may have been cut short by the window
+        boundary, so it is dropped and the next window starts at its first
+        page, which keeps the result close to splitting everything at once.
+        """
+        pdf_chunks = []
+        start = 0
+        while start < len(pages):
+            end, window_size = start, 0
+            while end < len(pages) and (
+                window_size < self.window_chars or end == start
+            ):
+                window_size += len(pages[end].content)
+                end += 1
+
+            window_chunks = self._split_pages(pages[start:end])
+            next_start = end
+            if end < len(pages) and len(window_chunks) > 1:
+                last = window_chunks.pop()
+                page_numbers = [page.page_number for page in pages[start:end]]
+                # Always move forward, even if that chunk began the window
+                next_start = max(start + page_numbers.index(last.start_page), start + 1)
+
+            pdf_chunks.extend(window_chunks)
+            start = next_start
+
+        return pdf_chunks
+
+    def _split_pages(self, pages: List[PDFPage]) -> List[PDFChunk]:
+        """Split consecutive pages into overlapping, page-attributed chunks"""
+        if not pages:
+            return []
+
         # Prepare combined text and track page ranges
         combined_text = ""
         page_ranges = []
-        for page in self.pages:
+        for page in pages:
             # Include page number before the content
             page_content = f"[Page {page.page_number}]\n{page.content}\n"
             start = len(combined_text)
@@ -146,7 +346,7 @@ class PdfChunkDocumentLoader:
                     content=chunk.strip(),
                     start_page=contributing_pages[0],
                     end_page=contributing_pages[-1],
-                    total_pages=self.pages[0].total_pages,
+                    total_pages=pages[0].total_pages,
                 )
             )
 
@@ -0,0 +1,100 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from src.services.loaders.pdf_loader import PdfDocumentLoader
+from src.services.loaders.text_loaders import (
+    DocxDocumentLoader,
+    HtmlDocumentLoader,
+    MarkdownDocumentLoader,
+    TextDocumentLoader,
+)
+
+
+class UnsupportedDocumentType(ValueError):
+    pass
+
+
+class LoaderRegistry:
+    """Maps documents to page loaders by magic bytes, content type or extension.
+
+    Page loaders expose ``extract_pages(path, io_stream, ocr_engine)`` and
+    return page-attributed ``PDFPage`` objects, so every format goes through
+    the same chunking pipeline. Their ``paginated`` flag tells real pages,
+    which may carry running headers and footers, from sections.
+    """
+
+    def __init__(self):
+        self._magic: List[Tuple[bytes, type]] = []
+        self._content_types: Dict[str, type] = {}
+        self._extensions: Dict[str, type] = {}
+
+    def register(
+        self,
+        loader: type,
+        content_types: List[str] = (),
+        extensions: List[str] = (),
+        magic: Optional[bytes] = None,
+    ):
+        if magic:
+            self._magic.append((magic, loader))
+        for content_type in content_types:
+            self._content_types[content_type] = loader
+        for extension in extensions:
+            self._extensions[extension.lower()] = loader
+
+    def resolve(
+        self,
+        content_type: Optional[str] = None,
+        filename: Optional[str] = None,
+        head: bytes = b"",
+    ) -> type:
+        """Pick a loader, trusting file signatures over client-provided metadata"""
+        for magic, loader in self._magic:
+            if head.startswith(magic):
+                return loader
+
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+        if media_type in self._content_types:
+            return self._content_types[media_type]
+
+        extension = os.path.splitext(filename or "")[1].lower()
+        if extension in self._extensions:
+            return self._extensions[extension]
+
+        sniff = head.lstrip().lower()
+        if sniff.startswith((b"<!doctype html", b"<html")):
+            return HtmlDocumentLoader
+
+        raise UnsupportedDocumentType(
+            f"Unsupported document type: {content_type or extension or 'unknown'}"
+        )
+
+
+loader_registry = LoaderRegistry()
+loader_registry.register(
+    PdfDocumentLoader,
+    content_types=["application/pdf"],
+    extensions=[".pdf"],
+    magic=b"%PDF-",
+)
+# DOCX files are zip archives, so they are matched by type/extension instead
+loader_registry.register(
+    DocxDocumentLoader,
+    content_types=[
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ],
+    extensions=[".docx"],
+)
+loader_registry.register(
+    HtmlDocumentLoader,
+    content_types=["text/html", "application/xhtml+xml"],
+    extensions=[".html", ".htm", ".xhtml"],
+)
+loader_registry.register(
+    MarkdownDocumentLoader,
+    content_types=["text/markdown", "text/x-markdown"],
+    extensions=[".md", ".markdown"],
+)
+loader_registry.register(
+    TextDocumentLoader, content_types=["text/plain"], extensions=[".txt", ".text"]
+)
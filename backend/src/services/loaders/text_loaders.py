@@ -0,0 +1,167 @@
+import io
+import re
+import zipfile
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List
+from xml.etree import ElementTree
+
+from src.services.loaders.pdf_loader import PDFPage
+
+# Formats without real pages are split into sections of roughly this many lines
+LINES_PER_SECTION = 50
+
+
+def _read_bytes(path: Path | str = None, io_stream: io.BytesIO = None) -> bytes:
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    if io_stream:
+        io_stream.seek(0)
+        return io_stream.read()
+    raise ValueError("Either 'path' or 'io_stream' must be provided.")
+
+
+def _decode(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def _group_lines(lines: List[str], size: int = LINES_PER_SECTION) -> List[str]:
+    return ["\n".join(lines[i : i + size]) for i in range(0, len(lines), size)]
+
+
+def _to_pages(sections: List[str]) -> List[PDFPage]:
+    sections = [section.strip() for section in sections]
+    sections = [section for section in sections if section] or [""]
+    return [
+        PDFPage(page_number=index + 1, content=section, total_pages=len(sections))
+        for index, section in enumerate(sections)
+    ]
+
+
+class TextDocumentLoader:
+    """Plain text: form feeds are page breaks, otherwise fixed-size sections"""
+
+    paginated = False
+
+    @staticmethod
+    def extract_pages(
+        path: Path | str = None, io_stream: io.BytesIO = None, ocr_engine=None
+    ) -> List[PDFPage]:
+        text = _decode(_read_bytes(path, io_stream))
+        if "\f" in text:
+            return _to_pages(text.split("\f"))
+        return _to_pages(_group_lines(text.splitlines()))
+
+
+class MarkdownDocumentLoader:
+    """Markdown: each top or second level heading starts a new section"""
+
+    paginated = False
+
+    @staticmethod
+    def extract_pages(
+        path: Path | str = None, io_stream: io.BytesIO = None, ocr_engine=None
+    ) -> List[PDFPage]:
+        text = _decode(_read_bytes(path, io_stream))
+        sections = re.split(r"(?m)^(?=#{1,2} )", text)
+
+        # Keep very long sections from turning into a single giant "page"
+        pages = []
+        for section in sections:
+            pages.extend(_group_lines(section.splitlines(), LINES_PER_SECTION * 4))
+        return _to_pages(pages)
+
+
+class _HtmlTextParser(HTMLParser):
+    SKIPPED_TAGS = {"script", "style", "noscript", "head", "template"}
+    BLOCK_TAGS = {"p", "div", "li", "tr", "br", "section", "article", "table"}
+    SECTION_TAGS = {"h1", "h2"}
+
+    def __init__(self):
+        super().__init__()
+        self.sections = [[]]
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in self.SECTION_TAGS and any(self.sections[-1]):
+            self.sections.append([])
+        elif tag in self.BLOCK_TAGS:
+            self.sections[-1].append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS or tag in self.SECTION_TAGS:
+            self.sections[-1].append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.sections[-1].append(data)
+
+
+class HtmlDocumentLoader:
+    """HTML: visible text, with each h1/h2 starting a new section"""
+
+    paginated = False
+
+    @staticmethod
+    def extract_pages(
+        path: Path | str = None, io_stream: io.BytesIO = None, ocr_engine=None
+    ) -> List[PDFPage]:
+        parser = _HtmlTextParser()
+        parser.feed(_decode(_read_bytes(path, io_stream)))
+        parser.close()
+
+        sections = []
+        for parts in parser.sections:
+            text = re.sub(r"[ \t]+", " ", "".join(parts))
+            lines = [line.strip() for line in text.splitlines() if line.strip()]
+            sections.extend(_group_lines(lines, LINES_PER_SECTION * 4))
+        return _to_pages(sections)
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class DocxDocumentLoader:
+    """DOCX: paragraphs from word/document.xml, split at explicit or last
+    rendered page breaks (fixed-size sections when the file has none)"""
+
+    paginated = False
+
+    @staticmethod
+    def extract_pages(
+        path: Path | str = None, io_stream: io.BytesIO = None, ocr_engine=None
+    ) -> List[PDFPage]:
+        with zipfile.ZipFile(io.BytesIO(_read_bytes(path, io_stream))) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+        pages = [[]]
+        found_page_break = False
+        for paragraph in root.iter(f"{WORD_NAMESPACE}p"):
+            text = []
+            for node in paragraph.iter():
+                is_page_break = (
+                    node.tag == f"{WORD_NAMESPACE}br"
+                    and node.get(f"{WORD_NAMESPACE}type") == "page"
+                ) or node.tag == f"{WORD_NAMESPACE}lastRenderedPageBreak"
+                if is_page_break:
+                    found_page_break = True
+                    pages[-1].append("".join(text))
+                    pages.append([])
+                    text = []
+                elif node.tag == f"{WORD_NAMESPACE}t":
+                    text.append(node.text or "")
+                elif node.tag == f"{WORD_NAMESPACE}tab":
+                    text.append("\t")
+            pages[-1].append("".join(text))
+
+        if not found_page_break:
+            return _to_pages(_group_lines(pages[0]))
+        return _to_pages(["\n".join(paragraphs) for paragraphs in pages])
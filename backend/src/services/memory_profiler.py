@@ -0,0 +1,104 @@
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Not Linux: fall back to the peak RSS (bytes on macOS, kilobytes
+        # elsewhere)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryBudget:
+    """Per-job memory budget, checked against the job's projected RSS growth.
+
+    Worker processes are reused across jobs and keep their libraries and
+    allocator pools, so the budget applies to growth over the RSS measured
+    when the job started rather than to the whole process.
+    """
+
+    def __init__(self, budget_mb: int):
+        self.budget = budget_mb * MB
+        self.baseline = current_rss() if self.budget else 0
+
+    def exceeded_by(self, extra_bytes: int = 0) -> bool:
+        """Whether growth so far plus ``extra_bytes`` would go over the budget"""
+        if not self.budget:
+            return False
+        return current_rss() - self.baseline + extra_bytes > self.budget
+
+
+class MemoryProfiler:
+    """Records RSS and (with tracemalloc) Python heap usage per pipeline stage.
+
+    Disabled profilers do nothing, so stages can be wrapped unconditionally.
+    """
+
+    def __init__(self, enabled: bool = False, top_allocations: int = 3):
+        self.enabled = enabled
+        self.top_allocations = top_allocations
+        self.stages = []
+        self._owns_tracing = False
+
+    def start(self):
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def stop(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        rss_before = current_rss()
+        tracemalloc.reset_peak()
+        heap_before, _ = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot() if self.top_allocations else None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            heap_after, heap_peak = tracemalloc.get_traced_memory()
+            record = {
+                "stage": name,
+                "seconds": round(time.perf_counter() - started, 3),
+                "rss_before_mb": round(rss_before / MB, 1),
+                "rss_after_mb": round(current_rss() / MB, 1),
+                "heap_delta_mb": round((heap_after - heap_before) / MB, 1),
+                "heap_peak_mb": round(heap_peak / MB, 1),
+            }
+            if snapshot is not None:
+                # Where the memory still held after this stage was allocated
+                diff = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+                record["top_allocations"] = [
+                    f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+                    f" {stat.size_diff / MB:+.1f}MB"
+                    for stat in diff[: self.top_allocations]
+                ]
+            self.stages.append(record)
+
+    def report(self) -> dict:
+        return {
+            "stages": self.stages,
+            # RSS is sampled between stages, so peaks within a stage are missed
+            "max_rss_after_stage_mb": max(
+                (stage["rss_after_mb"] for stage in self.stages), default=None
+            ),
+        }
@@ -1,55 +1,175 @@
 import asyncio
-import io
-import json
+import functools
 import os
-from datetime import datetime, timezone
+import tempfile
+import time
 
 import numpy as np
 
+from src.config.settings import settings
+from src.services.admission_service import AdmissionService
 from src.services.db_service import DBService
+from src.services.gen_ai.embedding_service import get_embedding_service
+from src.services.gen_ai.hedging import get_hedged_caller
 from src.services.gen_ai.summary_service import SummaryService
+from src.services.graph_service import get_knowledge_graph
+from src.services.loaders.ocr import get_ocr_engine
 from src.services.loaders.pdf_loader import PdfChunkDocumentLoader
-from src.services.s3_service import get_s3_service
+from src.services.loaders.registry import loader_registry
+from src.services.memory_profiler import MemoryBudget, MemoryProfiler
+from src.services.s3_service import S3Service, get_s3_service
+from src.services.search_service import SearchIndex
+from src.services.vector_index import get_vector_index
+
+PROCESSING_MODES = ("full", "summary", "extract")
+
+# In-memory processing holds the raw bytes, pymupdf's copy and the text
+IN_MEMORY_COPIES = 3
+# Chunks' worth of text split at a time when a job spills to disk
+SPILL_WINDOW_CHUNKS = 8
+# Shortest excerpt worth sampling for summary mode
+MIN_SAMPLE_EXCERPT_CHARS = 500
 
 
 class PDFProcessingService:
-    def __init__(self, db_service: DBService):
+    def __init__(
+        self,
+        db_service: DBService,
+        s3_service: S3Service = None,
+        summary_service: SummaryService = None,
+        loop: asyncio.AbstractEventLoop = None,
+        admission_service: AdmissionService = None,
+    ):
         self.db_service = db_service
-        self.s3_service = get_s3_service()
-        self.summary_service = SummaryService()
+        self.s3_service = s3_service or get_s3_service()
+        self.summary_service = summary_service or SummaryService()
+        self.search_index = SearchIndex(db_service.base_dir)
+        # A long-lived loop lets workers avoid creating one per document
+        self.loop = loop
+        # Reports in-flight pages for admission control when set
+        self.admission_service = admission_service
         self.chunk_progress = {}
 
-    def process_document(self, entry_id: str, s3_location: str):
-        """Process PDF document by extracting chunks and storing in database"""
+    def _run(self, coroutine):
+        if self.loop is not None:
+            return self.loop.run_until_complete(coroutine)
+        return asyncio.run(coroutine)
+
+    def process_document(self, entry_id: str, s3_location: str, mode: str = "full"):
+        """Process a document by extracting chunks and storing in database.
+
+        ``mode`` is one of ``full`` (LLM analysis of every chunk plus final
+        summary), ``summary`` (one cheap reduce over sampled chunk text) or
+        ``extract`` (text and page map only, no LLM calls).
+        """
+        if mode not in PROCESSING_MODES:
+            raise ValueError(f"Unknown processing mode: {mode}")
+
         # Update status to processing
         self.db_service.update_progress(entry_id, 0, "processing")
+        self.db_service.update_entry(entry_id, processing_mode=mode)
 
+        profiler = MemoryProfiler(settings.Processing.memory_profiling)
+        profiler.start()
+        budget = MemoryBudget(settings.Processing.memory_budget_mb)
+        inflight_pages = 0
+        file_path = None
         try:
             # Extract S3 key from s3_location (format: s3://bucket/key)
             s3_key = s3_location.replace("s3://", "").split("/", 1)[1]
 
-            # Read file bytes from S3
-            file_bytes = self.s3_service.read_file(s3_key)
+            with profiler.stage("download"):
+                # Spill to disk when holding the document would exceed the budget
+                spill = self._should_spill(s3_key, budget)
+                if spill:
+                    file_path, file_bytes = self._download_to_temp(s3_key), None
+                    with open(file_path, "rb") as f:
+                        head = f.read(8)
+                    self.db_service.update_entry(entry_id, memory_mode="spill")
+                else:
+                    # Read file bytes from S3
+                    file_bytes = self.s3_service.read_file(s3_key)
+                    head = file_bytes.read(8)
 
-            # Initialize PDF chunk loader
-            pdf_loader = PdfChunkDocumentLoader(chunk_size=25000, overlap=500)
+            # Pick the page loader by file signature, content type or extension
+            entry = self.db_service.get_entry(entry_id)
+            page_loader = loader_registry.resolve(
+                entry.get("content_type"), entry.get("filename"), head
+            )
 
-            # Extract chunks from PDF
-            chunks = pdf_loader.extract_chunks(io_stream=file_bytes)
+            # Initialize chunk loader
+            pdf_loader = PdfChunkDocumentLoader(
+                chunk_size=25000,
+                overlap=500,
+                strip_boilerplate=settings.Processing.strip_boilerplate,
+                ocr_engine=self._get_ocr_engine(),
+                page_loader=page_loader,
+                window_chars=25000 * SPILL_WINDOW_CHUNKS if spill else 0,
+            )
 
-            # Initialize progress tracking
-            self.chunk_progress = {i: 0 for i in range(len(chunks))}
+            # Extract chunks from PDF, reusing analyses from the previous version
+            with profiler.stage("extract"):
+                chunks, reused_analyses = self._extract_chunks(
+                    entry_id, pdf_loader, file_bytes, file_path
+                )
+            # The raw document isn't needed past this point
+            file_bytes = None
+            self.db_service.update_entry(
+                entry_id, page_fingerprints=pdf_loader.page_fingerprints
+            )
+            if self.admission_service:
+                inflight_pages = len(pdf_loader.pages)
+                self.admission_service.add_inflight_pages(entry_id, inflight_pages)
 
-            # ---- Run chunk processing asynchronously ----
-            processed_chunks = asyncio.run(self._process_all_chunks(entry_id, chunks))
+            # Record how much repeated boilerplate was kept away from the LLM
+            if pdf_loader.boilerplate_stats:
+                self.db_service.update_entry(
+                    entry_id, boilerplate=pdf_loader.boilerplate_stats.model_dump()
+                )
+                print(f"Removed boilerplate: {pdf_loader.boilerplate_stats}")
+
+            ocr_pages = [page.page_number for page in pdf_loader.pages if page.ocr]
+            if ocr_pages:
+                self.db_service.update_entry(entry_id, ocr_pages=ocr_pages)
+
+            with profiler.stage("analyze"):
+                if mode == "full":
+                    # Initialize progress tracking
+                    self.chunk_progress = {i: 0 for i in range(len(chunks))}
 
-            # Get final document summary from all processed chunks
-            final_summary = self.summary_service.get_final_summary(processed_chunks)
+                    # ---- Run chunk processing asynchronously ----
+                    processed_chunks, final_summary = self._run(
+                        self._process_all_chunks(entry_id, chunks, reused_analyses)
+                    )
+
+                    # Optionally embed chunk summaries for semantic retrieval
+                    if settings.Embeddings.enabled:
+                        self._embed_chunks(entry_id, processed_chunks)
+
+                    # Get final summary unless it was reduced while streaming
+                    if final_summary is None:
+                        final_summary = self.summary_service.get_final_summary(
+                            processed_chunks
+                        )
+                else:
+                    # Keep chunk text (and reused analyses) for on-demand analysis
+                    processed_chunks = []
+                    for chunk, analysis in zip(chunks, reused_analyses):
+                        chunk_dict = chunk.model_dump()
+                        if analysis:
+                            chunk_dict["summary"] = analysis
+                        processed_chunks.append(chunk_dict)
+                    final_summary = None
+                    if mode == "summary":
+                        final_summary = self.summary_service.get_compact_summary(
+                            self._sample_chunks(chunks)
+                        )
             print(f"Generated final summary: {final_summary}")
 
             # Store processed chunks in the database
-            self._store_chunks(entry_id, processed_chunks, final_summary)
-            print(f"Extracted and processed {len(chunks)} chunks from PDF")
+            with profiler.stage("store"):
+                self._store_chunks(entry_id, processed_chunks, final_summary)
+            print(f"Extracted and processed {len(chunks)} chunks from document")
 
             # Update final status
             self.db_service.update_progress(entry_id, 100, "completed")
@@ -70,20 +190,135 @@ class PDFProcessingService:
                 "status": "failed",
                 "error": str(e),
             }
+        finally:
+            if file_path:
+                os.remove(file_path)
+            if inflight_pages:
+                self.admission_service.remove_inflight_pages(entry_id)
+            if profiler.enabled:
+                self._record_memory_profile(entry_id, profiler)
+            profiler.stop()
+
+    def _should_spill(self, s3_key: str, budget: MemoryBudget) -> bool:
+        """Whether processing the document in memory would exceed the job's
+        memory budget"""
+        if not budget.budget:
+            return False
+        size = self.s3_service.get_size(s3_key)
+        return budget.exceeded_by(size * IN_MEMORY_COPIES)
 
-    async def _process_all_chunks(self, entry_id: str, chunks: list):
-        """Process all PDF chunks concurrently (max 5 at a time)."""
+    def _download_to_temp(self, s3_key: str) -> str:
+        suffix = os.path.splitext(s3_key)[1]
+        fd, file_path = tempfile.mkstemp(prefix="document-", suffix=suffix)
+        os.close(fd)
+        print(f"Downloading {s3_key} to {file_path} to stay within memory budget")
+        self.s3_service.download_to_file(s3_key, file_path)
+        return file_path
+
+    def _record_memory_profile(self, entry_id: str, profiler: MemoryProfiler):
+        try:
+            self.db_service.update_entry(entry_id, memory_profile=profiler.report())
+        except Exception as e:
+            print(f"Failed to record memory profile: {e}")
+
+    def _extract_chunks(
+        self, entry_id: str, pdf_loader, file_bytes=None, file_path: str = None
+    ):
+        """Extract chunks and, for a new version of an entry, the previous
+        analysis of every chunk whose pages did not change"""
+        previous_id = self.db_service.get_entry(entry_id).get("previous_version")
+        previous = self.db_service.get_entry(previous_id) if previous_id else {}
+
+        fingerprints = previous.get("page_fingerprints")
+        if previous.get("status") != "completed" or not fingerprints:
+            chunks = pdf_loader.extract_chunks(file_path, file_bytes)
+            return chunks, [None] * len(chunks)
+
+        previous_chunks = self.db_service.get_chunks(
+            previous_id, ["content", "start_page", "end_page", "summary"]
+        )
+        pairs = pdf_loader.extract_chunks_reusing(
+            fingerprints, previous_chunks, file_path, file_bytes
+        )
+        reused_count = sum(1 for _, analysis in pairs if analysis)
+        print(f"Reusing {reused_count}/{len(pairs)} chunks from {previous_id}")
+        self.db_service.update_entry(entry_id, reused_chunks=reused_count)
+
+        return [chunk for chunk, _ in pairs], [analysis for _, analysis in pairs]
+
+    def _get_ocr_engine(self):
+        return get_ocr_engine(self.db_service.base_dir)
+
+    async def _process_all_chunks(
+        self, entry_id: str, chunks: list, reused_analyses: list = None
+    ):
+        """Process all PDF chunks concurrently (max 10 at a time), skipping the
+        LLM call for chunks with a reused analysis.
+
+        Returns ``(processed_chunks, final_summary)``. With streaming enabled,
+        each chunk's summary is persisted as soon as it arrives and the final
+        reduce starts once every summary is in, while the remaining fields are
+        still streaming; otherwise ``final_summary`` is None.
+        """
         semaphore = asyncio.Semaphore(10)
+        reused_analyses = reused_analyses or [None] * len(chunks)
+        routing = []
+        hedged_caller = get_hedged_caller()
+
+        loop = asyncio.get_running_loop()
+        streaming = settings.LLM.streaming
+        summary_ready = [loop.create_future() for _ in chunks]
+        early_summaries = {}
+
+        def resolve_summary(index, summary):
+            if summary_ready[index].done():
+                return
+            summary_ready[index].set_result(summary)
+            if streaming:
+                # Readable before the chunks are stored; dropped once they are
+                early_summaries[str(index)] = summary
+                self.db_service.update_entry(entry_id, chunk_summaries=early_summaries)
+
+        def publish_summary(index, summary):
+            # Called from the summary thread
+            loop.call_soon_threadsafe(resolve_summary, index, summary)
 
         async def process_with_progress_update(chunk, index):
             async with semaphore:
-                # Run the blocking summary call in a thread
-                summary_result = await asyncio.to_thread(
-                    self.summary_service.get_chunk_summary,
-                    chunk.start_page,
-                    chunk.end_page,
-                    chunk.content,
-                )
+                summary_result = reused_analyses[index]
+                if summary_result is None:
+                    # Route simple chunks to cheaper models
+                    decision = self.summary_service.route_chunk(chunk.content)
+                    # Other chunks append to routing while this one awaits
+                    record = {
+                        "chunk": index,
+                        "model": decision.model,
+                        "score": decision.score,
+                    }
+                    routing.append(record)
+
+                    # Run the blocking summary call in a thread, hedging slow calls
+                    started = time.perf_counter()
+                    if streaming:
+                        summary_result = await hedged_caller.call(
+                            self.summary_service.stream_chunk_summary,
+                            chunk.start_page,
+                            chunk.end_page,
+                            chunk.content,
+                            decision.model,
+                            functools.partial(publish_summary, index),
+                        )
+                    else:
+                        summary_result = await hedged_caller.call(
+                            self.summary_service.get_chunk_summary,
+                            chunk.start_page,
+                            chunk.end_page,
+                            chunk.content,
+                            decision.model,
+                        )
+                    record["latency"] = round(time.perf_counter() - started, 3)
+
+                resolve_summary(index, summary_result["summary"])
 
                 # Add summary to chunk
                 chunk_dict = chunk.model_dump()
@@ -102,12 +337,131 @@ class PDFProcessingService:
                 print(f"Completed chunk {index}, progress: {overall_progress}%")
                 return chunk_dict
 
+        async def reduce_early():
+            summaries = await asyncio.gather(*summary_ready)
+            print(f"All {len(summaries)} chunk summaries ready, starting reduce")
+            return await asyncio.to_thread(
+                self.summary_service.get_final_summary,
+                [
+                    {
+                        "start_page": chunk.start_page,
+                        "end_page": chunk.end_page,
+                        "summary": summary,
+                    }
+                    for chunk, summary in zip(chunks, summaries)
+                ],
+            )
+
         # Launch tasks for all chunks
         tasks = [
             asyncio.create_task(process_with_progress_update(chunk, i))
             for i, chunk in enumerate(chunks)
         ]
-        return await asyncio.gather(*tasks)
+        reducer = asyncio.create_task(reduce_early()) if streaming else None
+
+        try:
+            processed_chunks = await asyncio.gather(*tasks)
+        except Exception:
+            if reducer:
+                reducer.cancel()
+            raise
+        final_summary = await reducer if reducer else None
+
+        self._record_routing(entry_id, routing)
+        return processed_chunks, final_summary
+
+    def _record_routing(self, entry_id: str, routing: list):
+        """Store per-model routing counts and latencies on the entry"""
+        models = {}
+        for decision in routing:
+            stats = models.setdefault(
+                decision["model"], {"chunks": 0, "total_latency": 0.0}
+            )
+            stats["chunks"] += 1
+            stats["total_latency"] += decision.get("latency", 0.0)
+
+        for model, stats in models.items():
+            stats["mean_latency"] = round(
+                stats.pop("total_latency") / stats["chunks"], 3
+            )
+            print(f"Routing metrics for {entry_id}: {model} {stats}")
+
+        self.db_service.update_entry(
+            entry_id, routing={"models": models, "decisions": routing}
+        )
+
+    @staticmethod
+    def _sample_chunks(chunks: list) -> list:
+        """Spread a fixed character budget evenly over the chunks, taking the
+        opening text of each, for a compact summary-only reduce. When the
+        budget can't give every chunk a useful excerpt, evenly spaced chunks
+        are sampled instead so the total stays within the budget."""
+        if not chunks:
+            return []
+        budget = settings.Processing.summary_sample_chars
+        count = min(len(chunks), max(budget // MIN_SAMPLE_EXCERPT_CHARS, 1))
+        chunks = [chunks[index * len(chunks) // count] for index in range(count)]
+        per_chunk = budget // count
+        return [
+            {
+                "start_page": chunk.start_page,
+                "end_page": chunk.end_page,
+                "excerpt": chunk.content[:per_chunk],
+            }
+            for chunk in chunks
+        ]
+
+    def analyze_chunks(self, entry_id: str, chunk_indices: list) -> list:
+        """Analyze specific chunks on demand and cache the results in place"""
+        chunks = self.db_service.get_chunks(entry_id)
+        missing = [
+            index
+            for index in chunk_indices
+            if not (chunks[index].get("summary") or {}).get("summary")
+        ]
+        # LLM calls run outside the lock so other writers aren't held up
+        analyses = {
+            index: self.summary_service.get_chunk_summary(
+                chunks[index]["start_page"],
+                chunks[index]["end_page"],
+                chunks[index]["content"],
+            )
+            for index in missing
+        }
+
+        if analyses:
+            chunk_store = self.db_service.chunk_store
+            with chunk_store.lock(entry_id):
+                # Another task may have analyzed some of these chunks meanwhile
+                current = self.db_service.get_chunks(
+                    entry_id, ["start_page", "end_page", "summary"]
+                )
+                updates = {
+                    index: {"summary": analysis}
+                    for index, analysis in analyses.items()
+                    if not (current[index].get("summary") or {}).get("summary")
+                }
+                self.db_service.update_chunks(entry_id, updates)
+                for index, fields in updates.items():
+                    current[index].update(fields)
+                self.search_index.index_chunks(entry_id, current)
+
+            get_knowledge_graph().add_document([current[i] for i in updates])
+            for index in chunk_indices:
+                chunks[index]["summary"] = current[index].get("summary")
+            print(f"Analyzed {len(updates)} chunks on demand for entry {entry_id}")
+
+        return [chunks[index] for index in chunk_indices]
+
+    def _embed_chunks(self, entry_id: str, processed_chunks: list):
+        """Embed chunk summaries in batches and add them to the vector index"""
+        texts = [
+            chunk["summary"]["summary"] + "\n" + ", ".join(chunk["summary"]["topics"])
+            for chunk in processed_chunks
+        ]
+        vectors = get_embedding_service().embed(texts)
+        get_vector_index().add(entry_id, processed_chunks, vectors)
+        print(f"Embedded {len(texts)} chunks for entry {entry_id}")
 
     def get_chunk_progress(self) -> float:
         """Get the mean progress of all chunks using numpy"""
@@ -119,24 +473,18 @@ class PDFProcessingService:
         self, entry_id: str, chunks_json: list, final_summary: dict = None
     ):
         """Store PDF chunks and final summary in the database by updating the entry"""
-        json_file_path = os.path.join(self.db_service.base_dir, f"{entry_id}.json")
+        # Chunks go to the chunk store so summary reads don't decode them
+        self.db_service.store_chunks(entry_id, chunks_json)
+        if settings.LLM.streaming:
+            # The stored chunks now hold every summary streamed early
+            self.db_service.delete_fields(entry_id, "chunk_summaries")
+        self.search_index.index_chunks(entry_id, chunks_json)
+        new_edges = get_knowledge_graph().add_document(chunks_json)
+        print(f"Added {new_edges} new knowledge graph edges")
 
-        if not os.path.exists(json_file_path):
-            raise FileNotFoundError(f"Entry {entry_id} not found")
-
-        # Read existing entry
-        with open(json_file_path, "r") as f:
-            entry_data = json.load(f)
-
-        # Add chunks, final summary & update timestamp
-        entry_data["chunks"] = chunks_json
         if final_summary:
-            entry_data["final_summary"] = final_summary
+            fields = {"final_summary": final_summary}
             # Extract and store primary topics as key terms for easier access
             if "primary_topics" in final_summary:
-                entry_data["key_terms"] = final_summary["primary_topics"]
-        entry_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-
-        # Write back to file
-        with open(json_file_path, "w") as f:
-            json.dump(entry_data, f, indent=2)
+                fields["key_terms"] = final_summary["primary_topics"]
+            self.db_service.update_entry(entry_id, **fields)
@@ -0,0 +1,330 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from src.config.settings import RetentionSettings, settings
+from src.services.compression import compress, decompress, default_extension
+from src.services.db_service import DBService, get_db_service
+from src.services.s3_service import S3Service, get_s3_service
+from src.services.serialization import dumps, loads
+
+# Chunk columns kept on local disk for cold entries: small and enough to map
+# chunks to pages without touching S3
+HOT_COLUMNS = ["start_page", "end_page", "total_pages"]
+
+
+def _page_window(pages: list, start_page: int, end_page: int) -> str:
+    """The text a chunk was split from, as built by the chunk loader"""
+    return "".join(
+        f"[Page {page.page_number}]\n{page.content}\n"
+        for page in pages
+        if start_page <= page.page_number <= end_page
+    )
+
+
+class RetentionService:
+    """Tiered storage for processed chunks.
+
+    Completed entries that have not been updated for ``cold_after_days`` are
+    compacted: every chunk column except ``HOT_COLUMNS`` is written to one
+    compressed object under ``archive_prefix`` in S3 and removed from the
+    local ``db`` directory. With ``drop_content`` the chunk text is not
+    archived at all where it can be found verbatim in the native text of the
+    source document's pages; only its offset into the chunk's pages is kept.
+    Text that went through OCR or boilerplate stripping can't be rebuilt
+    that way and stays in the archive. Reading an archived column through
+    the ChunkStore rehydrates it transparently.
+
+    Compaction and rehydration hold the ChunkStore's entry lock, so neither
+    loses columns written concurrently by processing or analysis tasks.
+    """
+
+    def __init__(
+        self, db_service: DBService, s3_service: S3Service, config: RetentionSettings
+    ):
+        self.db_service = db_service
+        self.s3_service = s3_service
+        self.config = config
+        self.chunk_store = db_service.chunk_store
+
+    def find_cold_entries(self, limit: int = None) -> List[str]:
+        """Completed entries not updated since the cutoff with chunk columns
+        still stored locally"""
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            days=self.config.cold_after_days
+        )
+        limit = limit or self.config.batch_size
+        cold, after = [], None
+        while len(cold) < limit:
+            page = self.db_service.list_entries(
+                limit=200, after=after, status="completed"
+            )
+            if not page:
+                break
+            after = (page[-1]["created_at"], page[-1]["id"])
+            for record in page:
+                updated_at = datetime.fromisoformat(record["updated_at"])
+                if updated_at < cutoff and self._local_columns(record["id"]):
+                    cold.append(record["id"])
+        return cold[:limit]
+
+    def _local_columns(self, entry_id: str) -> List[str]:
+        if not self.chunk_store.exists(entry_id):
+            # Chunks stored inline are migrated when the entry is compacted
+            return (
+                ["chunks"] if self.db_service.get_entry(entry_id).get("chunks") else []
+            )
+        manifest = self.chunk_store.get_manifest(entry_id)
+        archived = self.chunk_store.archived_columns(manifest)
+        return [
+            column
+            for column in manifest["columns"]
+            if column not in HOT_COLUMNS and column not in archived
+        ]
+
+    def _local_size(self, entry_id: str) -> int:
+        size = os.path.getsize(
+            os.path.join(self.db_service.base_dir, f"{entry_id}.json")
+        )
+        if self.chunk_store.exists(entry_id):
+            size += self.chunk_store.size(entry_id)
+        return size
+
+    def compact(self, entry_id: str) -> Optional[dict]:
+        """Move an entry's cold chunk columns to S3, returning the bytes saved
+        locally and the archive size"""
+        with self.chunk_store.lock(entry_id):
+            return self._compact(entry_id)
+
+    def _compact(self, entry_id: str) -> Optional[dict]:
+        local_bytes = self._local_size(entry_id)
+        entry = self.db_service.get_entry(entry_id)
+        if not self.chunk_store.exists(entry_id):
+            if not entry.get("chunks"):
+                return None
+            # Move inline chunks into the columnar store first
+            self.chunk_store.write(entry_id, entry["chunks"])
+            self.db_service.delete_fields(entry_id, "chunks")
+            self.db_service.update_entry(entry_id, chunks_count=len(entry["chunks"]))
+
+        columns = self._local_columns(entry_id)
+        if not columns:
+            return None
+        manifest = self.chunk_store.get_manifest(entry_id)
+        # Columns still archived from an earlier compaction go into the new one
+        payload = self._fetch_archive(manifest) if manifest.get("archive") else None
+        payload = payload or {"count": manifest["count"], "columns": {}}
+        payload["columns"].update(self.chunk_store.read_columns(entry_id, columns))
+
+        if self.config.drop_content and payload.get("content_offsets") is None:
+            self._replace_content(entry, payload)
+        offsets = payload.get("content_offsets") or []
+
+        raw = dumps(payload)
+        extension = default_extension()
+        data = compress(raw, extension)
+        key = f"{self.config.archive_prefix}/{entry_id}.json{extension}"
+        self.s3_service.upload_file(key, data)
+
+        # Only drop local columns once the archive is safely in S3
+        manifest["archive"] = {
+            "key": key,
+            "codec": extension,
+            "bytes": len(data),
+            "raw_bytes": len(raw),
+            "columns": sorted(payload["columns"]),
+            "content_from_source": payload.get("content_offsets") is not None,
+        }
+        self.chunk_store.write_manifest(entry_id, manifest)
+        self.chunk_store.drop_columns(entry_id, columns)
+
+        return {
+            "entry_id": entry_id,
+            "local_bytes_before": local_bytes,
+            "local_bytes_after": self._local_size(entry_id),
+            "archive_bytes": len(data),
+            "archive_raw_bytes": len(raw),
+            "chunks_from_source": sum(1 for offset in offsets if offset is not None),
+        }
+
+    def _replace_content(self, entry: dict, payload: dict):
+        """Swap chunk text for offsets into the native source pages wherever
+        the text can be found there verbatim"""
+        contents = payload["columns"].get("content")
+        if not contents:
+            return
+        pdf_loader = self._load_source(entry)
+
+        starts = self.chunk_store.read_column(entry["id"], "start_page")
+        ends = self.chunk_store.read_column(entry["id"], "end_page")
+        ocr_pages = set(entry.get("ocr_pages") or [])
+        offsets = []
+        for index, content in enumerate(contents):
+            # OCR text isn't in the native text, and rebuilding it would mean
+            # running OCR again
+            if not content or ocr_pages.intersection(
+                range(starts[index], ends[index] + 1)
+            ):
+                offsets.append(None)
+                continue
+            window = _page_window(pdf_loader.pages, starts[index], ends[index])
+            offset = window.find(content)
+            if offset < 0:
+                offsets.append(None)
+                continue
+            offsets.append([offset, len(content)])
+            # Text that can be rebuilt from the source isn't archived
+            contents[index] = None
+
+        dropped = sum(1 for offset in offsets if offset is not None)
+        print(f"Dropped text of {dropped}/{len(contents)} chunks of {entry['id']}")
+        payload["content_offsets"] = offsets
+        if dropped:
+            payload["source_fingerprints"] = pdf_loader.page_fingerprints
+
+    def _load_source(self, entry: dict, preprocess: bool = False):
+        """Load the native page text of the entry's source document from S3.
+
+        With ``preprocess`` pages go through boilerplate stripping and OCR as
+        processing did, which archives written before native offsets were
+        recorded need.
+        """
+        # Imported here so API processes reading cold chunks only load the
+        # document loaders when text has to be rebuilt
+        from src.services.loaders.ocr import get_ocr_engine
+        from src.services.loaders.pdf_loader import PdfChunkDocumentLoader
+        from src.services.loaders.registry import loader_registry
+
+        file_bytes = self.s3_service.read_file(entry["key"])
+        page_loader = loader_registry.resolve(
+            entry.get("content_type"), entry.get("filename"), file_bytes.read(8)
+        )
+        file_bytes.seek(0)
+        pdf_loader = PdfChunkDocumentLoader(
+            chunk_size=25000,
+            overlap=500,
+            strip_boilerplate=preprocess and settings.Processing.strip_boilerplate,
+            ocr_engine=get_ocr_engine(self.db_service.base_dir) if preprocess else None,
+            page_loader=page_loader,
+        )
+        pdf_loader.load_pages(io_stream=file_bytes)
+        return pdf_loader
+
+    def _fetch_archive(self, manifest: dict) -> dict:
+        archive = manifest["archive"]
+        data = self.s3_service.read_file(archive["key"]).read()
+        return loads(decompress(data, archive["codec"]))
+
+    def compact_cold_entries(self, limit: int = None) -> dict:
+        """Compact a batch of cold entries"""
+        compacted, saved, archived = 0, 0, 0
+        for entry_id in self.find_cold_entries(limit):
+            try:
+                result = self.compact(entry_id)
+            except Exception as e:
+                print(f"Failed to compact entry {entry_id}: {e}")
+                continue
+            if result:
+                compacted += 1
+                saved += result["local_bytes_before"] - result["local_bytes_after"]
+                archived += result["archive_bytes"]
+
+        print(
+            f"Compacted {compacted} entries: {saved} bytes freed locally,"
+            f" {archived} bytes archived"
+        )
+        return {
+            "compacted": compacted,
+            "bytes_freed": saved,
+            "bytes_archived": archived,
+        }
+
+    def rehydrate(self, entry_id: str, columns: List[str]):
+        """Restore archived columns of an entry to local disk.
+
+        Everything in the archive except rebuilt-from-source text is restored
+        at once, since it came in the same download; chunk text is only
+        rebuilt from the source document when ``content`` is requested.
+        """
+        with self.chunk_store.lock(entry_id):
+            self._rehydrate(entry_id, columns)
+
+    def _rehydrate(self, entry_id: str, columns: List[str]):
+        started = time.perf_counter()
+        manifest = self.chunk_store.get_manifest(entry_id)
+        archive = manifest.get("archive")
+        if not archive:
+            return
+        payload = self._fetch_archive(manifest)
+
+        # Columns restored earlier may have been updated locally since
+        restore = {
+            column: values
+            for column, values in payload["columns"].items()
+            if column in archive["columns"]
+        }
+        offsets = payload.get("content_offsets")
+        if offsets is not None and "content" in restore:
+            if "content" in columns:
+                restore["content"] = self._rebuild_content(
+                    entry_id,
+                    restore["content"],
+                    offsets,
+                    payload.get("source_fingerprints"),
+                )
+            else:
+                restore.pop("content")
+
+        self.chunk_store.write_columns(entry_id, restore)
+        remaining = [column for column in archive["columns"] if column not in restore]
+        if remaining:
+            archive["columns"] = remaining
+        else:
+            manifest.pop("archive")
+        self.chunk_store.write_manifest(entry_id, manifest)
+
+        # Touching the entry keeps it hot until the next cutoff
+        self.db_service.update_entry(
+            entry_id, rehydrated_at=datetime.now(timezone.utc).isoformat()
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Rehydrated {sorted(restore)} for entry {entry_id} in {elapsed:.0f}ms")
+
+    def _rebuild_content(
+        self,
+        entry_id: str,
+        contents: list,
+        offsets: list,
+        fingerprints: Optional[List[str]],
+    ) -> list:
+        if all(offset is None for offset in offsets):
+            return contents
+        entry = self.db_service.get_entry(entry_id)
+        # Archives without their own fingerprints hold offsets into pages
+        # preprocessed as processing did
+        pdf_loader = self._load_source(entry, preprocess=fingerprints is None)
+        if pdf_loader.page_fingerprints != (
+            fingerprints or entry.get("page_fingerprints")
+        ):
+            raise RuntimeError(
+                f"Cannot rebuild chunk text of entry {entry_id}:"
+                " source pages changed since compaction"
+            )
+        pages = pdf_loader.pages
+
+        starts = self.chunk_store.read_column(entry_id, "start_page")
+        ends = self.chunk_store.read_column(entry_id, "end_page")
+        rebuilt = list(contents)
+        for index, offset in enumerate(offsets):
+            if offset is not None:
+                window = _page_window(pages, starts[index], ends[index])
+                rebuilt[index] = window[offset[0] : offset[0] + offset[1]]
+        return rebuilt
+
+
+def get_retention_service(db_service: DBService = None) -> RetentionService:
+    """Dependency injection for RetentionService"""
+    return RetentionService(
+        db_service or get_db_service(), get_s3_service(), settings.Retention
+    )
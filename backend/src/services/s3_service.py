@@ -24,6 +24,14 @@ class S3Service:
         response = self.s3_client.get_object(Bucket=settings.S3.bucket_name, Key=key)
         return BytesIO(response["Body"].read())
 
+    def get_size(self, key: str) -> int:
+        response = self.s3_client.head_object(Bucket=settings.S3.bucket_name, Key=key)
+        return response["ContentLength"]
+
+    def download_to_file(self, key: str, path: str):
+        """Stream an object to disk without holding it in memory"""
+        self.s3_client.download_file(settings.S3.bucket_name, key, path)
+
 
 def get_s3_service() -> S3Service:
     return S3Service()
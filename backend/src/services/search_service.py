@@ -0,0 +1,124 @@
+import os
+import re
+import sqlite3
+from contextlib import closing
+from typing import List
+
+from src.services.db_service import get_db_service
+
+INDEXED_FIELDS = ["summary", "topics", "entities", "concepts", "search_queries"]
+
+
+class SearchIndex:
+    """Incremental full-text index over chunk semantic metadata (SQLite FTS5)"""
+
+    def __init__(self, base_dir: str):
+        os.makedirs(base_dir, exist_ok=True)
+        self.db_path = os.path.join(base_dir, "search.sqlite")
+        self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _ensure_schema(self):
+        with closing(self._connect()) as connection, connection:
+            # WAL lets the API read while a worker is indexing
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY,
+                    entry_id TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    start_page INTEGER,
+                    end_page INTEGER
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_entry ON chunks(entry_id)"
+            )
+            connection.execute(
+                f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                    {", ".join(INDEXED_FIELDS)},
+                    tokenize='porter unicode61'
+                )
+                """
+            )
+
+    @staticmethod
+    def _field_text(value) -> str:
+        if isinstance(value, list):
+            return "\n".join(str(item) for item in value)
+        return value or ""
+
+    def index_chunks(self, entry_id: str, chunks: List[dict]):
+        """Replace the indexed chunks of an entry with the given processed chunks"""
+        with closing(self._connect()) as connection, connection:
+            self._delete(connection, entry_id)
+
+            for index, chunk in enumerate(chunks):
+                analysis = chunk.get("summary") or {}
+                cursor = connection.execute(
+                    "INSERT INTO chunks (entry_id, chunk_index, start_page, end_page)"
+                    " VALUES (?, ?, ?, ?)",
+                    (entry_id, index, chunk.get("start_page"), chunk.get("end_page")),
+                )
+                connection.execute(
+                    f"INSERT INTO chunks_fts (rowid, {', '.join(INDEXED_FIELDS)})"
+                    f" VALUES (?{', ?' * len(INDEXED_FIELDS)})",
+                    (
+                        cursor.lastrowid,
+                        *(self._field_text(analysis.get(f)) for f in INDEXED_FIELDS),
+                    ),
+                )
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, entry_id: str):
+        connection.execute(
+            "DELETE FROM chunks_fts WHERE rowid IN"
+            " (SELECT id FROM chunks WHERE entry_id = ?)",
+            (entry_id,),
+        )
+        connection.execute("DELETE FROM chunks WHERE entry_id = ?", (entry_id,))
+
+    def delete_entry(self, entry_id: str):
+        with closing(self._connect()) as connection, connection:
+            self._delete(connection, entry_id)
+
+    @staticmethod
+    def _to_match_query(query: str) -> str:
+        """Turn free text into an FTS5 query that ANDs every quoted term"""
+        terms = re.findall(r"\w+", query)
+        return " ".join(f'"{term}"' for term in terms)
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Return the best matching chunks ordered by BM25 relevance"""
+        match_query = self._to_match_query(query)
+        if not match_query:
+            return []
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                """
+                SELECT chunks.entry_id, chunks.chunk_index, chunks.start_page,
+                       chunks.end_page, chunks_fts.summary,
+                       -bm25(chunks_fts) AS score
+                FROM chunks_fts
+                JOIN chunks ON chunks.id = chunks_fts.rowid
+                WHERE chunks_fts MATCH ?
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                (match_query, limit),
+            ).fetchall()
+
+        return [dict(row) for row in rows]
+
+
+def get_search_index() -> SearchIndex:
+    """Dependency injection for SearchIndex"""
+    return SearchIndex(get_db_service().base_dir)
@@ -0,0 +1,30 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    """Serialize data to compact JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: bytes):
+    """Deserialize JSON bytes produced by dumps (or legacy indented JSON)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json(path: str):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path: str, data):
+    with open(path, "wb") as f:
+        f.write(dumps(data))
@@ -0,0 +1,386 @@
+import fcntl
+import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Dict, List
+
+import numpy as np
+
+from src.config.settings import settings
+from src.services.db_service import get_db_service
+
+
+class VectorIndex:
+    """Memory-mapped IVF index for chunk embeddings.
+
+    Vectors are L2-normalized and appended to a raw float32 file that is
+    memory-mapped for queries, so the index never has to fit in RAM. Row
+    metadata and inverted-list assignments live in SQLite; queries use an
+    in-memory copy of the inverted lists as one contiguous id array per
+    index version, reloaded only after a writer changed the index. Until
+    enough vectors exist to train the coarse quantizer, queries fall back
+    to an exact scan. The quantizer is retrained whenever the corpus grows
+    ``retrain_growth`` times past the size it was trained on, and deleted
+    rows are compacted away once they outnumber live ones.
+    """
+
+    def __init__(self, base_dir: str, dimensions: int, n_lists: int, n_probe: int):
+        self.index_dir = os.path.join(base_dir, "vectors")
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.vectors_path = os.path.join(self.index_dir, "vectors.f32")
+        self.centroids_path = os.path.join(self.index_dir, "centroids.npy")
+        self.db_path = os.path.join(self.index_dir, "vectors.sqlite")
+        self.lock_path = os.path.join(self.index_dir, ".lock")
+        self.dimensions = dimensions
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        # Train the quantizer once there are enough points per list
+        self.train_threshold = n_lists * 40
+        # Retrain once the live rows grow this many times past the last training
+        self.retrain_growth = 4
+        # (version, centroids, list-sorted live ids, per-list offsets)
+        self._lists = None
+        self._lock = threading.Lock()
+        self._ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _ensure_schema(self):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vectors (
+                    id INTEGER PRIMARY KEY,
+                    entry_id TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    start_page INTEGER,
+                    end_page INTEGER,
+                    list_id INTEGER,
+                    deleted INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vectors_entry ON vectors(entry_id)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vectors_list"
+                " ON vectors(list_id, deleted)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta"
+                " (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    @contextmanager
+    def _file_lock(self, operation: int):
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_lock(self):
+        """Serialize writers across worker processes"""
+        return self._file_lock(fcntl.LOCK_EX)
+
+    def _read_lock(self):
+        """Keep writers out while querying, so row ids, inverted lists and
+        the vectors file stay consistent (compaction renumbers rows)"""
+        return self._file_lock(fcntl.LOCK_SH)
+
+    @staticmethod
+    def _get_meta(connection: sqlite3.Connection, key: str, default: int = 0):
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return default if row is None else row[0]
+
+    @staticmethod
+    def _set_meta(connection: sqlite3.Connection, key: str, value: int):
+        connection.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    @staticmethod
+    def _bump_version(connection: sqlite3.Connection):
+        """Tell readers in every process to reload their inverted lists"""
+        connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', 1)"
+            " ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+
+    def _row_count(self) -> int:
+        if not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dimensions)
+
+    def _load_vectors(self) -> np.ndarray:
+        count = self._row_count()
+        if count == 0:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(count, self.dimensions),
+        )
+
+    def _load_centroids(self):
+        if not os.path.exists(self.centroids_path):
+            return None
+        return np.load(self.centroids_path)
+
+    @staticmethod
+    def _live_ids(connection: sqlite3.Connection) -> np.ndarray:
+        rows = connection.execute(
+            "SELECT id FROM vectors WHERE deleted = 0 ORDER BY id"
+        )
+        return np.fromiter((row[0] for row in rows), dtype=np.int64)
+
+    def _inverted_lists(self, connection: sqlite3.Connection):
+        """Return the in-memory inverted lists, reloading them from SQLite
+        only when the index changed since they were loaded"""
+        version = self._get_meta(connection, "version")
+        with self._lock:
+            if self._lists is None or self._lists[0] != version:
+                rows = connection.execute(
+                    "SELECT id, COALESCE(list_id, 0) FROM vectors"
+                    " WHERE deleted = 0 ORDER BY list_id, id"
+                ).fetchall()
+                table = np.array(rows, dtype=np.int64).reshape(-1, 2)
+                counts = np.bincount(table[:, 1], minlength=self.n_lists)
+                offsets = np.concatenate(([0], np.cumsum(counts)))
+                self._lists = (
+                    version,
+                    self._load_centroids(),
+                    np.ascontiguousarray(table[:, 0]),
+                    offsets,
+                )
+            return self._lists
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add(self, entry_id: str, chunks: List[dict], vectors: np.ndarray):
+        """Append one vector per chunk, replacing earlier vectors of the entry"""
+        vectors = self._normalize(vectors)
+
+        with self._write_lock(), closing(self._connect()) as connection:
+            self._mark_deleted(connection, entry_id)
+
+            start_row = self._row_count()
+            with open(self.vectors_path, "ab") as f:
+                vectors.tofile(f)
+
+            centroids = self._load_centroids()
+            list_ids = (
+                np.argmax(vectors @ centroids.T, axis=1)
+                if centroids is not None
+                else [None] * len(vectors)
+            )
+
+            rows = [
+                (
+                    start_row + index,
+                    entry_id,
+                    index,
+                    chunk.get("start_page"),
+                    chunk.get("end_page"),
+                    None if list_id is None else int(list_id),
+                )
+                for index, (chunk, list_id) in enumerate(zip(chunks, list_ids))
+            ]
+            with connection:
+                connection.executemany(
+                    "INSERT INTO vectors"
+                    " (id, entry_id, chunk_index, start_page, end_page, list_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                live_rows = self._row_counts(connection)[0] + len(rows)
+                self._set_meta(connection, "live_rows", live_rows)
+                self._bump_version(connection)
+
+            if centroids is None:
+                if live_rows >= self.train_threshold:
+                    self._train(connection)
+            else:
+                # Older indexes did not record it; they trained at the threshold
+                trained_rows = self._get_meta(
+                    connection, "trained_rows", self.train_threshold
+                )
+                if live_rows >= trained_rows * self.retrain_growth:
+                    self._train(connection)
+
+    def _train(self, connection: sqlite3.Connection):
+        """Fit the coarse quantizer with spherical k-means on the live rows
+        and (re)assign them all"""
+        vectors = self._load_vectors()
+        live_ids = self._live_ids(connection)
+        live_ids = live_ids[live_ids < len(vectors)]
+        rng = np.random.default_rng(0)
+        sample_size = min(len(live_ids), self.n_lists * 256)
+        sample = np.asarray(
+            vectors[np.sort(rng.choice(live_ids, sample_size, replace=False))]
+        )
+
+        centroids = sample[rng.choice(len(sample), self.n_lists, replace=False)]
+        for _ in range(10):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for list_id in range(self.n_lists):
+                members = sample[assignments == list_id]
+                if len(members):
+                    centroids[list_id] = members.sum(axis=0)
+            centroids = self._normalize(centroids)
+
+        # Assign every live vector in blocks to keep memory bounded
+        updates = []
+        for start in range(0, len(live_ids), 65536):
+            block_ids = live_ids[start : start + 65536]
+            block = np.asarray(vectors[block_ids])
+            for row_id, list_id in zip(
+                block_ids, np.argmax(block @ centroids.T, axis=1)
+            ):
+                updates.append((int(list_id), int(row_id)))
+
+        with connection:
+            connection.executemany(
+                "UPDATE vectors SET list_id = ? WHERE id = ?", updates
+            )
+            self._set_meta(connection, "trained_rows", len(live_ids))
+            self._bump_version(connection)
+            np.save(self.centroids_path, centroids)
+
+    def _row_counts(self, connection: sqlite3.Connection):
+        """Live and deleted row counts, kept in ``meta`` so writers never
+        scan the table for them"""
+        live_rows = self._get_meta(connection, "live_rows", None)
+        deleted_rows = self._get_meta(connection, "deleted_rows", None)
+        if live_rows is None or deleted_rows is None:
+            # Indexes written before the counts were kept
+            live_rows, deleted_rows = connection.execute(
+                "SELECT COUNT(*) - COALESCE(SUM(deleted), 0),"
+                " COALESCE(SUM(deleted), 0) FROM vectors"
+            ).fetchone()
+        return live_rows, deleted_rows
+
+    def _mark_deleted(self, connection: sqlite3.Connection, entry_id: str):
+        """Mark the entry's rows deleted, compacting once deleted rows
+        outnumber live ones. Callers hold the write lock."""
+        with connection:
+            live_rows, deleted_rows = self._row_counts(connection)
+            marked = connection.execute(
+                "UPDATE vectors SET deleted = 1 WHERE entry_id = ? AND deleted = 0",
+                (entry_id,),
+            ).rowcount
+            live_rows, deleted_rows = live_rows - marked, deleted_rows + marked
+            self._set_meta(connection, "live_rows", live_rows)
+            self._set_meta(connection, "deleted_rows", deleted_rows)
+            self._bump_version(connection)
+        if deleted_rows > live_rows:
+            self._compact(connection)
+
+    def _compact(self, connection: sqlite3.Connection):
+        """Rewrite the vectors file without deleted rows and renumber the
+        remaining rows to match. Callers hold the write lock."""
+        vectors = self._load_vectors()
+        live_ids = self._live_ids(connection)
+        live_ids = live_ids[live_ids < len(vectors)]
+
+        compacted_path = self.vectors_path + ".compact"
+        with open(compacted_path, "wb") as f:
+            for start in range(0, len(live_ids), 65536):
+                np.asarray(vectors[live_ids[start : start + 65536]]).tofile(f)
+
+        with connection:
+            connection.execute("DELETE FROM vectors WHERE deleted = 1")
+            self._set_meta(connection, "deleted_rows", 0)
+            # Ids only ever shrink and are renumbered in ascending order, so
+            # a new id is never still held by a row that was not moved yet
+            connection.executemany(
+                "UPDATE vectors SET id = ? WHERE id = ?",
+                (
+                    (new_id, int(old_id))
+                    for new_id, old_id in enumerate(live_ids)
+                    if new_id != old_id
+                ),
+            )
+            self._bump_version(connection)
+            os.replace(compacted_path, self.vectors_path)
+
+    def delete_entry(self, entry_id: str):
+        with self._write_lock(), closing(self._connect()) as connection:
+            self._mark_deleted(connection, entry_id)
+
+    def search(self, query_vector: np.ndarray, k: int = 10) -> List[dict]:
+        """Return the top-k chunks by cosine similarity"""
+        query = self._normalize(np.asarray(query_vector).reshape(1, -1))[0]
+
+        with self._read_lock(), closing(self._connect()) as connection:
+            vectors = self._load_vectors()
+            if len(vectors) == 0:
+                return []
+
+            _, centroids, list_ids, offsets = self._inverted_lists(connection)
+            if centroids is None:
+                candidate_ids = list_ids
+            else:
+                probe = np.argsort(centroids @ query)[::-1][: self.n_probe]
+                candidate_ids = np.concatenate(
+                    [
+                        list_ids[offsets[list_id] : offsets[list_id + 1]]
+                        for list_id in probe
+                    ]
+                )
+
+            # Sorted ids read the memory-mapped file front to back
+            candidate_ids = np.sort(candidate_ids[candidate_ids < len(vectors)])
+            if len(candidate_ids) == 0:
+                return []
+
+            scores = vectors[candidate_ids] @ query
+            top = np.argsort(scores)[::-1][:k]
+            top_ids = [int(candidate_ids[position]) for position in top]
+
+            rows = connection.execute(
+                "SELECT id, entry_id, chunk_index, start_page, end_page"
+                f" FROM vectors WHERE id IN ({', '.join('?' * len(top_ids))})",
+                top_ids,
+            ).fetchall()
+
+        rows_by_id = {row[0]: row for row in rows}
+        return [
+            {
+                "entry_id": rows_by_id[row_id][1],
+                "chunk_index": rows_by_id[row_id][2],
+                "start_page": rows_by_id[row_id][3],
+                "end_page": rows_by_id[row_id][4],
+                "score": float(scores[position]),
+            }
+            for row_id, position in zip(top_ids, top)
+        ]
+
+
+_indexes: Dict[str, VectorIndex] = {}
+
+
+def get_vector_index() -> VectorIndex:
+    """Dependency injection for VectorIndex, shared per process so queries
+    reuse the loaded inverted lists"""
+    config = settings.Embeddings
+    base_dir = get_db_service().base_dir
+    if base_dir not in _indexes:
+        _indexes[base_dir] = VectorIndex(
+            base_dir, config.dimensions, config.n_lists, config.n_probe
+        )
+    return _indexes[base_dir]
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 
 from src.config.settings import settings
 
@@ -15,8 +16,38 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    # Nothing reads task return values back, so don't keep them in Redis
+    task_ignore_result=True,
     result_expires=3600,
     task_track_started=True,
     task_time_limit=30 * 60,
     task_soft_time_limit=25 * 60,
+    # Documents take minutes each, so don't reserve tasks another worker could
+    # start, and only ack once done so a crashed worker's job is redelivered.
+    # A task whose pool process is killed (e.g. a document that runs it out of
+    # memory) is failed rather than requeued, or it would kill every worker
+    # it is redelivered to
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    # Recycle processes periodically to cap memory growth from large documents
+    worker_max_tasks_per_child=100,
 )
+
+# Run by `celery beat`
+beat_schedule = {}
+if settings.Retention.enabled:
+    # Compact entries that went cold overnight
+    beat_schedule["compact-cold-entries"] = {
+        "task": "compact_cold_entries_task",
+        "schedule": crontab(hour=3, minute=0),
+    }
+if settings.Admission.enabled and settings.Admission.overflow == "defer":
+    # Finishing jobs drain deferred jobs, but skip it while another process
+    # holds the drain lock, and expired leases free capacity without any job
+    # finishing. Passes still waiting once the next one is due are dropped
+    beat_schedule["release-deferred-jobs"] = {
+        "task": "release_deferred_jobs_task",
+        "schedule": settings.Admission.drain_interval,
+        "options": {"expires": settings.Admission.drain_interval},
+    }
+celery_app.conf.beat_schedule = beat_schedule
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+from billiard.exceptions import WorkerLostError
+from celery.signals import task_failure, worker_process_init, worker_process_shutdown
+
+from src.config.settings import settings
+from src.services.admission_service import get_admission_service
+from src.services.db_service import get_db_service
+from src.services.graph_service import get_knowledge_graph
+from src.services.processing_service import PDFProcessingService
+
+# Each pool thread gets its own service and event loop: a loop can only run
+# in one thread at a time. Prefork and solo pools run tasks in one thread
+# per process, so they get exactly one.
+_local = threading.local()
+_loops = []
+_loops_lock = threading.Lock()
+
+
+def _warm_up():
+    """Exercise lazily initialized library code so the first task doesn't pay
+    for it"""
+    import pymupdf
+    from langchain.text_splitter import CharacterTextSplitter
+
+    with pymupdf.open() as pdf_file:
+        pdf_file.new_page().get_text()
+    CharacterTextSplitter(chunk_size=10, chunk_overlap=0).split_text("warm up")
+    get_knowledge_graph().refresh()
+
+
+def _create_processing_service() -> PDFProcessingService:
+    """Create long-lived clients and an event loop for the current thread"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    with _loops_lock:
+        _loops.append(loop)
+    # S3 (boto3) and OpenAI clients are created once and shared by every task
+    # the thread runs
+    admission_service = None
+    if settings.Admission.enabled:
+        admission_service = get_admission_service()
+    return PDFProcessingService(
+        get_db_service(), loop=loop, admission_service=admission_service
+    )
+
+
+@worker_process_init.connect
+def init_worker_resources(**kwargs):
+    """Create the worker process's resources before its first task"""
+    _local.processing_service = _create_processing_service()
+    _warm_up()
+    print("Worker resources initialized")
+
+
+@worker_process_shutdown.connect
+def close_worker_resources(**kwargs):
+    with _loops_lock:
+        for loop in _loops:
+            loop.close()
+        _loops.clear()
+
+
+@task_failure.connect
+def fail_lost_documents(sender=None, exception=None, args=None, kwargs=None, **extra):
+    """Mark documents failed and free their admission slot when their pool
+    process died mid-task. Runs in the parent worker process, since the
+    task's own error handling died with the child."""
+    if sender is None or sender.name != "process_document_task" or not args:
+        return
+    if not isinstance(exception, WorkerLostError):
+        return
+    entry_id = args[0]
+    print(f"Worker lost while processing entry {entry_id}: {exception}")
+    get_db_service().update_progress(entry_id, 0, "failed")
+
+    tenant_id = (kwargs or {}).get("tenant_id")
+    if tenant_id is not None:
+        # Otherwise the job's leases would count until they expire
+        admission_service = get_admission_service()
+        admission_service.remove_inflight_pages(entry_id)
+        admission_service.release(entry_id, tenant_id)
+
+
+def get_processing_service() -> PDFProcessingService:
+    """The current thread's processing service. Pools that don't fire
+    worker_process_init (solo, threads) initialize it on a thread's first
+    task, so a threads pool keeps one service and event loop per thread."""
+    if getattr(_local, "processing_service", None) is None:
+        init_worker_resources()
+    return _local.processing_service
@@ -2,10 +2,13 @@ import time
 
 from celery import Task
 
-from src.services.db_service import get_db_service
-from src.services.processing_service import PDFProcessingService
+from src.clients.redis_client import get_redis_client
+from src.services.admission_service import get_admission_service
+from src.services.analysis_queue import release_chunks
+from src.services.retention_service import get_retention_service
 
 from .celery_app import celery_app
+from .resources import get_processing_service
 
 
 class CallbackTask(Task):
@@ -37,9 +40,48 @@ class CallbackTask(Task):
 
 
 @celery_app.task(name="process_document_task")
-def process_document_task(entry_id: str, s3_location: str):
+def process_document_task(
+    entry_id: str, s3_location: str, mode: str = "full", tenant_id: str = None
+):
     """Celery task that processes a document using the PDFProcessingService"""
-    db_service = get_db_service()
-    processing_service = PDFProcessingService(db_service)
+    processing_service = get_processing_service()
+    if tenant_id is not None:
+        try:
+            get_admission_service().start(entry_id, tenant_id)
+        except Exception as e:
+            print(f"Failed to renew admission slot: {e}")
 
-    return processing_service.process_document(entry_id, s3_location)
+    try:
+        return processing_service.process_document(entry_id, s3_location, mode)
+    finally:
+        # Jobs admitted through admission control free their slot when done
+        if tenant_id is not None:
+            try:
+                get_admission_service().release(entry_id, tenant_id)
+            except Exception as e:
+                print(f"Failed to release admission slot: {e}")
+
+
+@celery_app.task(name="analyze_chunks_task")
+def analyze_chunks_task(entry_id: str, chunk_indices: list):
+    """Celery task that analyzes specific chunks of an entry on demand"""
+    processing_service = get_processing_service()
+
+    try:
+        processing_service.analyze_chunks(entry_id, chunk_indices)
+    finally:
+        # Let the endpoint queue these chunks again if analysis failed
+        release_chunks(get_redis_client(), entry_id, chunk_indices)
+    return {"entry_id": entry_id, "chunk_indices": chunk_indices}
+
+
+@celery_app.task(name="release_deferred_jobs_task")
+def release_deferred_jobs_task():
+    """Celery task that queues deferred jobs that fit now"""
+    return len(get_admission_service().release_deferred())
+
+
+@celery_app.task(name="compact_cold_entries_task")
+def compact_cold_entries_task(limit: int = None):
+    """Celery task that moves cold entries' chunks to compressed S3 archives"""
+    return get_retention_service().compact_cold_entries(limit)
@@ -0,0 +1,83 @@
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from src.config.settings import AdmissionSettings
+from src.services.admission_service import AdmissionService
+
+
+class StubCelery:
+    conf = SimpleNamespace(task_default_queue="celery")
+
+    def __init__(self):
+        self.sent = []
+        self.ids = itertools.count()
+
+    def send_task(self, name, args, kwargs):
+        self.sent.append(args[0])
+        return SimpleNamespace(id=f"task-{next(self.ids)}")
+
+
+@pytest.fixture
+def admission():
+    config = AdmissionSettings(
+        enabled=True,
+        max_queue_depth=100,
+        max_inflight_pages=100,
+        tenant_max_jobs=2,
+        overflow="defer",
+        retry_after=30,
+        job_ttl=60,
+        drain_interval=30,
+    )
+    return AdmissionService(
+        fakeredis.FakeRedis(decode_responses=True), StubCelery(), config
+    )
+
+
+def expire_leases(admission: AdmissionService, monkeypatch):
+    later = time.time() + admission.config.job_ttl + 1
+    monkeypatch.setattr(time, "time", lambda: later)
+
+
+def test_jobs_of_a_killed_worker_stop_counting_once_their_lease_expires(
+    admission, monkeypatch
+):
+    for entry_id in ("a", "b"):
+        assert admission.submit(entry_id, "s3://a", "full", "acme").admitted
+    # Neither job releases its slot, as when their worker is killed
+    assert admission.check("acme").limit == "tenant"
+
+    expire_leases(admission, monkeypatch)
+
+    assert admission.check("acme").admitted
+
+
+def test_inflight_pages_of_a_killed_worker_expire(admission, monkeypatch):
+    admission.add_inflight_pages("a", 80)
+    admission.add_inflight_pages("b", 30)
+    assert admission.check("acme").limit == "pages"
+
+    admission.remove_inflight_pages("b")
+    assert admission.check("acme").admitted
+
+    admission.add_inflight_pages("c", 30)
+    expire_leases(admission, monkeypatch)
+    assert admission.check("acme").admitted
+
+
+def test_release_drains_deferred_jobs(admission):
+    for entry_id in ("a", "b"):
+        admission.submit(entry_id, "s3://a", "full", "acme")
+    admission.defer("c", "s3://a", "full", "acme")
+    # Redis locks run Lua scripts, which fakeredis can't without lupa
+    admission.client.lock = lambda name, timeout: threading.Lock()
+
+    admission.release("a", "acme")
+
+    assert admission.celery_app.sent == ["a", "b", "c"]
+    assert admission.deferred_count() == 0
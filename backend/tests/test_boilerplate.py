@@ -0,0 +1,74 @@
+from src.services.loaders.boilerplate import strip_boilerplate
+from src.services.loaders.pdf_loader import PDFPage
+
+
+def pages(contents: list) -> list:
+    return [
+        PDFPage(page_number=index + 1, content=content, total_pages=len(contents))
+        for index, content in enumerate(contents)
+    ]
+
+
+def body(page: int, lines: int = 10) -> list:
+    return [
+        f"Clause {page}.{line} sets out the supplier's duties." for line in range(lines)
+    ]
+
+
+def test_running_headers_and_footers_are_removed():
+    contents = [
+        "\n".join(["ACME Corp - Confidential"] + body(page) + [f"Page {page + 1} of 5"])
+        for page in range(5)
+    ]
+
+    cleaned, stats = strip_boilerplate(pages(contents))
+
+    assert [page.content for page in cleaned] == [
+        "\n".join(body(page)) for page in range(5)
+    ]
+    assert stats.repeated_lines == 2
+    assert stats.removed_lines == 10
+
+
+def test_short_pages_keep_their_content():
+    # Slide-like pages: every line is near an edge, and lines repeat with
+    # only their numbers changed
+    contents = [
+        f"Quarter {page + 1} results\nRevenue grew {page + 3}%\n```\nrun()\n```"
+        for page in range(6)
+    ]
+
+    cleaned, stats = strip_boilerplate(pages(contents))
+
+    assert [page.content for page in cleaned] == contents
+    assert stats.removed_lines == 0
+
+
+def test_body_rows_and_code_fences_differing_only_by_digits_are_kept():
+    products = ["apples", "pears", "plums", "figs"]
+    contents = [
+        "\n".join(
+            ["ACME Corp - Confidential", f"Prices for {product}", "Valid this week"]
+            + [f"| Grade {row} | {row * (page + 2)} EUR |" for row in range(8)]
+            + ["```", f"order({product!r})", "```"]
+            + [f"Ask about {product} in bulk", "Thank you", f"Page {page + 1}"]
+        )
+        for page, product in enumerate(products)
+    ]
+
+    cleaned, stats = strip_boilerplate(pages(contents))
+
+    for page, content in zip(cleaned, contents):
+        lines = content.splitlines()
+        assert page.content.splitlines() == [lines[1]] + lines[3:-3] + [lines[-3]]
+    # Header, "Valid this week", "Thank you" and the page number
+    assert stats.repeated_lines == 4
+
+
+def test_pages_are_never_emptied():
+    contents = ["ACME Corp\n\n\n\n\n\nPage 1"] * 4
+
+    cleaned, stats = strip_boilerplate(pages(contents))
+
+    assert [page.content for page in cleaned] == contents
+    assert stats.removed_lines == 0
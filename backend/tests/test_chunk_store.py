@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services.chunk_store import ChunkStore
+
+
+def sample_chunks(count: int) -> list:
+    return [
+        {"content": f"text {index}", "start_page": index + 1, "end_page": index + 1}
+        for index in range(count)
+    ]
+
+
+def test_update_rows_rewrites_only_touched_columns(tmp_path):
+    store = ChunkStore(str(tmp_path))
+    store.write("entry", sample_chunks(3))
+    content_path = store._column_path("entry", "content")
+    content_mtime = os.stat(content_path).st_mtime_ns
+
+    store.update_rows("entry", {1: {"summary": {"summary": "One", "topics": ["a"]}}})
+
+    chunks = store.read("entry")
+    assert chunks[1]["summary"] == {"summary": "One", "topics": ["a"]}
+    assert chunks[0]["summary"] == {"summary": None, "topics": None}
+    assert [chunk["content"] for chunk in chunks] == ["text 0", "text 1", "text 2"]
+    assert os.stat(content_path).st_mtime_ns == content_mtime
+
+
+def test_concurrent_row_updates_are_all_kept(tmp_path):
+    store = ChunkStore(str(tmp_path))
+    store.write("entry", sample_chunks(20))
+
+    def analyze(index):
+        # Each writer uses its own store, as separate worker processes would
+        ChunkStore(str(tmp_path)).update_rows(
+            "entry", {index: {"summary": {"summary": f"chunk {index}"}}}
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(analyze, range(20)))
+
+    summaries = store.read_column("entry", "summary.summary")
+    assert summaries == [f"chunk {index}" for index in range(20)]
+
+
+def test_lock_is_reentrant_within_a_thread(tmp_path):
+    store = ChunkStore(str(tmp_path))
+    store.write("entry", sample_chunks(2))
+
+    with store.lock("entry"):
+        with store.lock("entry"):
+            store.update_rows("entry", {0: {"summary": {"summary": "nested"}}})
+
+    assert store.read_column("entry", "summary.summary") == ["nested", None]
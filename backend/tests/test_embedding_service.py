@@ -0,0 +1,140 @@
+import os
+from contextlib import closing
+
+import numpy as np
+
+from src.services.gen_ai.embedding_service import HashEmbeddingService
+from src.services.vector_index import VectorIndex
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_hash_embeddings_are_deterministic():
+    texts = ["Payment terms of the supply contract", "Liability cap"]
+    first = HashEmbeddingService(dimensions=64, batch_size=8).embed(texts)
+    second = HashEmbeddingService(dimensions=64, batch_size=8).embed(texts)
+
+    assert first.shape == (2, 64)
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first, second)
+
+
+def test_hash_embeddings_of_no_texts():
+    vectors = HashEmbeddingService(dimensions=32, batch_size=8).embed([])
+
+    assert vectors.shape == (0, 32)
+
+
+def test_hash_embeddings_rank_shared_words_higher():
+    embedder = HashEmbeddingService(dimensions=256, batch_size=8)
+    query, related, unrelated = embedder.embed(
+        [
+            "termination notice period",
+            "the termination notice period is ninety days",
+            "quarterly revenue grew in the european market",
+        ]
+    )
+
+    assert cosine(query, related) > cosine(query, unrelated)
+
+
+def test_vector_index_top_k_with_hash_embeddings(tmp_path):
+    embedder = HashEmbeddingService(dimensions=128, batch_size=8)
+    summaries = [
+        "warranty claims for defective goods",
+        "termination notice and renewal terms",
+        "payment schedule and late fees",
+    ]
+    chunks = [
+        {"start_page": index + 1, "end_page": index + 1}
+        for index in range(len(summaries))
+    ]
+    index = VectorIndex(str(tmp_path), dimensions=128, n_lists=4, n_probe=2)
+    index.add("entry-1", chunks, embedder.embed(summaries))
+
+    results = index.search(embedder.embed(["late payment fees"])[0], k=2)
+
+    assert [result["chunk_index"] for result in results][0] == 2
+    assert results[0]["start_page"] == 3
+    assert len(results) == 2
+
+
+def clustered(rng: np.random.Generator, count: int, dimensions: int = 16):
+    centers = rng.standard_normal((8, dimensions)).astype(np.float32)
+    return centers[rng.integers(0, 8, count)] + 0.1 * rng.standard_normal(
+        (count, dimensions)
+    ).astype(np.float32)
+
+
+def add_entries(index: VectorIndex, vectors: np.ndarray, per_entry: int, first=0):
+    for number, start in enumerate(range(0, len(vectors), per_entry)):
+        block = vectors[start : start + per_entry]
+        chunks = [{"start_page": i + 1, "end_page": i + 1} for i in range(len(block))]
+        index.add(f"entry-{first + number}", chunks, block)
+
+
+def test_vector_index_queries_see_deletes_and_replacements(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = clustered(rng, 4)
+    index = VectorIndex(str(tmp_path), dimensions=16, n_lists=2, n_probe=2)
+    add_entries(index, vectors[:2], per_entry=2, first=1)
+    add_entries(index, vectors[2:], per_entry=2, first=2)
+
+    assert index.search(vectors[0], k=1)[0]["entry_id"] == "entry-1"
+
+    index.delete_entry("entry-1")
+    assert {r["entry_id"] for r in index.search(vectors[0], k=4)} == {"entry-2"}
+
+    # Re-adding replaces the entry's earlier vectors
+    add_entries(index, vectors[:1], per_entry=1, first=2)
+    results = index.search(vectors[0], k=4)
+    assert [(r["entry_id"], r["chunk_index"]) for r in results] == [("entry-2", 0)]
+    assert results[0]["score"] > 0.99
+
+
+def test_vector_index_retrains_as_the_corpus_grows(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = clustered(rng, 400)
+    index = VectorIndex(str(tmp_path), dimensions=16, n_lists=2, n_probe=1)
+    add_entries(index, vectors[: index.train_threshold], per_entry=20)
+
+    with closing(index._connect()) as connection:
+        assert index._get_meta(connection, "trained_rows") == 80
+        trained_version = index._inverted_lists(connection)[0]
+
+    add_entries(index, vectors[80:320], per_entry=20, first=4)
+
+    with closing(index._connect()) as connection:
+        assert index._get_meta(connection, "trained_rows") == 320
+        version, centroids, list_ids, offsets = index._inverted_lists(connection)
+    assert version > trained_version
+    assert centroids is not None and offsets[-1] == len(list_ids) == 320
+    # Every vector finds itself through the lists it was assigned to
+    for row in (0, 150, 319):
+        result = index.search(vectors[row], k=1)[0]
+        assert (result["entry_id"], result["chunk_index"]) == (
+            f"entry-{row // 20}",
+            row % 20,
+        )
+
+
+def test_vector_index_compacts_deleted_rows(tmp_path):
+    rng = np.random.default_rng(2)
+    vectors = clustered(rng, 30)
+    index = VectorIndex(str(tmp_path), dimensions=16, n_lists=2, n_probe=2)
+    add_entries(index, vectors, per_entry=10)
+    size = os.path.getsize(index.vectors_path)
+
+    index.delete_entry("entry-0")
+    # One deleted row in three is kept until deletes outnumber live rows
+    assert os.path.getsize(index.vectors_path) == size
+    index.delete_entry("entry-1")
+
+    assert os.path.getsize(index.vectors_path) == size // 3
+    with closing(index._connect()) as connection:
+        ids = [row[0] for row in connection.execute("SELECT id FROM vectors")]
+    assert sorted(ids) == list(range(10))
+    result = index.search(vectors[25], k=1)[0]
+    assert (result["entry_id"], result["chunk_index"]) == ("entry-2", 5)
@@ -0,0 +1,110 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routers import documents
+from src.services.async_services import AsyncDBService, get_async_db_service
+from src.services.db_service import DBService
+from src.services.entry_index import EntryIndex
+
+
+def indexed_entry(entry_id: str, created_at: str, status: str = "completed") -> dict:
+    return {
+        "id": entry_id,
+        "filename": f"{entry_id}.pdf",
+        "status": status,
+        "created_at": created_at,
+    }
+
+
+def test_list_pages_newest_first_after_the_cursor(tmp_path):
+    index = EntryIndex(str(tmp_path))
+    index.upsert(
+        [
+            indexed_entry("a", "2024-01-01T00:00:00"),
+            indexed_entry("b", "2024-01-02T00:00:00"),
+            # Same timestamp: the id breaks the tie
+            indexed_entry("c", "2024-01-02T00:00:00"),
+            indexed_entry("d", "2024-01-03T00:00:00", status="failed"),
+        ]
+    )
+
+    pages, after = [], None
+    while True:
+        page = index.list(2, after, fields=["id"])
+        if not page:
+            break
+        pages.append([item["id"] for item in page])
+        after = (page[-1]["created_at"], page[-1]["id"])
+
+    assert pages == [["d", "c"], ["b", "a"]]
+    assert [item["id"] for item in index.list(10, status="completed")] == [
+        "c",
+        "b",
+        "a",
+    ]
+    with pytest.raises(ValueError):
+        index.list(10, fields=["summary"])
+
+
+@pytest.fixture
+def client(tmp_path):
+    db_service = DBService(str(tmp_path))
+    for number in range(5):
+        db_service.create_entry(
+            f"entry-{number}", f"uploads/{number}.pdf", f"{number}.pdf", "s3://b/k"
+        )
+    app = FastAPI()
+    app.include_router(documents.router)
+    app.dependency_overrides[get_async_db_service] = lambda: AsyncDBService(db_service)
+    with TestClient(app) as test_client:
+        test_client.db_service = db_service
+        yield test_client
+
+
+def test_documents_are_paged_with_cursors(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "fields": "id"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/documents/", params=params).json()
+        seen.append([item["id"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page) for page in seen] == [2, 2, 1]
+    assert sorted(sum(seen, [])) == [f"entry-{number}" for number in range(5)]
+    assert (
+        client.get("/documents/", params={"cursor": "not-a-cursor"}).status_code == 400
+    )
+
+
+def test_unchanged_listings_revalidate_with_304(client):
+    first = client.get("/documents/", params={"limit": 2})
+    etag = first.headers["ETag"]
+
+    again = client.get(
+        "/documents/", params={"limit": 2}, headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+    # Another page is a different response
+    other_page = client.get(
+        "/documents/",
+        params={"limit": 2, "cursor": first.json()["next_cursor"]},
+        headers={"If-None-Match": etag},
+    )
+    assert other_page.status_code == 200
+
+    newest = first.json()["items"][0]["id"]
+    client.db_service.update_progress(newest, 50, "processing")
+    changed = client.get(
+        "/documents/", params={"limit": 2}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["items"][0]["status"] == "processing"
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from src.services import graph_service
+from src.services.graph_service import KnowledgeGraph
+
+
+class SlowReader:
+    """A graph file whose reads stall, widening the window between reading a
+    tail and recording its offset"""
+
+    def __init__(self, file):
+        self.file = file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.file.close()
+
+    def seek(self, offset):
+        self.file.seek(offset)
+
+    def read(self):
+        time.sleep(0.002)
+        return self.file.read()
+
+
+def slow_open(path, mode="r"):
+    return SlowReader(open(path, mode)) if mode == "rb" else open(path, mode)
+
+
+def document(index: int) -> list:
+    edges = [
+        {"from": f"party {index}", "type": "signs", "to": f"contract {index}"},
+        {"from": f"contract {index}", "type": "references", "to": "master agreement"},
+    ]
+    return [{"summary": {"graph_edges": edges}}]
+
+
+def test_shared_graph_refreshes_safely_from_threads(tmp_path, monkeypatch):
+    writer = KnowledgeGraph(str(tmp_path))
+    shared = KnowledgeGraph(str(tmp_path))
+    for index in range(50):
+        writer.add_document(document(index))
+    monkeypatch.setattr(graph_service, "open", slow_open, raising=False)
+
+    threads = [threading.Thread(target=shared.refresh) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every label and edge was loaded exactly once
+    assert shared.node_labels == writer.node_labels
+    assert len(shared.edges) == len(writer.edges) == 100
+    assert len(shared.neighbors("master agreement", "in")) == 50
@@ -0,0 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.services.gen_ai.hedging import HedgeBudget, HedgedCaller, LatencyTracker
+
+
+class FlakyCall:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = 0
+
+    def __call__(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise RuntimeError("provider error")
+        return "ok"
+
+
+def caller(budget: HedgeBudget, executor: ThreadPoolExecutor) -> HedgedCaller:
+    return HedgedCaller(
+        LatencyTracker(),
+        budget,
+        executor,
+        hedge_percentile=95,
+        timeout=5,
+        retries=2,
+        backoff=0,
+    )
+
+
+def test_retries_draw_on_the_hedge_budget():
+    budget = HedgeBudget(ratio=0.0, burst=1)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert asyncio.run(caller(budget, executor).call(FlakyCall(1))) == "ok"
+
+        # The burst allowance is spent, so the next failure is not retried
+        flaky = FlakyCall(1)
+        with pytest.raises(RuntimeError):
+            asyncio.run(caller(budget, executor).call(flaky))
+
+    assert flaky.attempts == 1
+    assert (budget.calls, budget.hedges) == (2, 1)
+
+
+def test_retries_do_not_count_as_primary_calls():
+    budget = HedgeBudget(ratio=1.0, burst=0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        hedged = caller(budget, executor)
+        asyncio.run(hedged.call(FlakyCall(0)))
+        asyncio.run(hedged.call(FlakyCall(2)))
+
+    assert (budget.calls, budget.hedges) == (2, 2)
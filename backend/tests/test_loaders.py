@@ -0,0 +1,226 @@
+import io
+import zipfile
+
+import pymupdf
+import pytest
+
+from src.services.loaders.pdf_loader import (
+    PdfChunkDocumentLoader,
+    PdfDocumentLoader,
+    PDFPage,
+)
+from src.services.loaders.registry import UnsupportedDocumentType, loader_registry
+from src.services.loaders.text_loaders import (
+    DocxDocumentLoader,
+    HtmlDocumentLoader,
+    MarkdownDocumentLoader,
+    TextDocumentLoader,
+)
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def sample_pdf() -> bytes:
+    with pymupdf.open() as pdf_file:
+        pdf_file.new_page().insert_text((72, 72), "Hello")
+        return pdf_file.tobytes()
+
+
+def sample_docx(paragraphs: list) -> bytes:
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(
+        '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+        if paragraph is None
+        else f"<w:p><w:r><w:t>{paragraph}</w:t></w:r></w:p>"
+        for paragraph in paragraphs
+    )
+    document = f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def test_file_signature_wins_over_metadata():
+    loader = loader_registry.resolve("text/plain", "notes.txt", sample_pdf()[:8])
+
+    assert loader is PdfDocumentLoader
+
+
+@pytest.mark.parametrize(
+    "content_type, expected",
+    [
+        ("application/pdf", PdfDocumentLoader),
+        (DOCX_TYPE, DocxDocumentLoader),
+        ("text/html; charset=utf-8", HtmlDocumentLoader),
+        ("text/markdown", MarkdownDocumentLoader),
+        ("text/plain", TextDocumentLoader),
+    ],
+)
+def test_resolves_by_content_type(content_type, expected):
+    assert loader_registry.resolve(content_type, "upload.bin") is expected
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("Report.PDF", PdfDocumentLoader),
+        ("report.docx", DocxDocumentLoader),
+        ("page.htm", HtmlDocumentLoader),
+        ("README.md", MarkdownDocumentLoader),
+        ("notes.txt", TextDocumentLoader),
+    ],
+)
+def test_resolves_by_extension(filename, expected):
+    assert loader_registry.resolve("application/octet-stream", filename) is expected
+
+
+def test_sniffs_html_and_rejects_unknown_types():
+    assert loader_registry.resolve(head=b"  <!DOCTYPE html>") is HtmlDocumentLoader
+    with pytest.raises(UnsupportedDocumentType):
+        loader_registry.resolve("image/png", "scan.png", b"\x89PNG")
+
+
+def test_markdown_splits_at_top_and_second_level_headings():
+    text = "Intro\n# One\nFirst\n## Two\nSecond\n### Not a section\nMore"
+
+    pages = MarkdownDocumentLoader.extract_pages(io_stream=io.BytesIO(text.encode()))
+
+    assert [page.content for page in pages] == [
+        "Intro",
+        "# One\nFirst",
+        "## Two\nSecond\n### Not a section\nMore",
+    ]
+    assert [page.total_pages for page in pages] == [3, 3, 3]
+
+
+def test_text_splits_at_form_feeds():
+    pages = TextDocumentLoader.extract_pages(io_stream=io.BytesIO(b"one\n\ftwo\f\f"))
+
+    assert [(page.page_number, page.content) for page in pages] == [
+        (1, "one"),
+        (2, "two"),
+    ]
+
+
+def test_html_keeps_visible_text_and_splits_at_headings():
+    html = (
+        b"<html><head><title>T</title><style>p {}</style></head><body>"
+        b"<h1>One</h1><p>First</p><script>skip()</script><h2>Two</h2><p>Second</p>"
+    )
+
+    pages = HtmlDocumentLoader.extract_pages(io_stream=io.BytesIO(html))
+
+    assert [page.content for page in pages] == ["One\nFirst", "Two\nSecond"]
+
+
+def test_docx_splits_at_page_breaks():
+    data = sample_docx(["First page", None, "Second page"])
+
+    pages = DocxDocumentLoader.extract_pages(io_stream=io.BytesIO(data))
+
+    assert [page.content for page in pages] == ["First page", "Second page"]
+
+
+def test_sections_are_not_stripped_as_boilerplate():
+    text = "\n".join(
+        f"# Section\n\nStep {index} of the setup.\n\n```\nmake\n```"
+        for index in range(6)
+    )
+    loader = PdfChunkDocumentLoader(
+        chunk_size=1000,
+        overlap=0,
+        strip_boilerplate=True,
+        page_loader=MarkdownDocumentLoader,
+    )
+
+    pages = loader.load_pages(io_stream=io.BytesIO(text.encode()))
+
+    assert loader.boilerplate_stats is None
+    assert all("make" in page.content for page in pages)
+
+
+def pages_loader(contents: list):
+    """Page loader returning ``contents`` as pages, blank ones included"""
+
+    class StaticPageLoader:
+        paginated = True
+
+        @staticmethod
+        def extract_pages(path=None, io_stream=None, ocr_engine=None):
+            return [
+                PDFPage(
+                    page_number=index + 1, content=content, total_pages=len(contents)
+                )
+                for index, content in enumerate(contents)
+            ]
+
+    return PdfChunkDocumentLoader(
+        chunk_size=1000, overlap=0, page_loader=StaticPageLoader
+    )
+
+
+def reuse(previous: list, current: list):
+    """Chunk ``current`` reusing one analyzed chunk per page of ``previous``"""
+    previous_loader = pages_loader(previous)
+    previous_pages = previous_loader.load_pages()
+    previous_chunks = [
+        {
+            "content": f"[Page {page.page_number}]\n{page.content}",
+            "start_page": page.page_number,
+            "end_page": page.page_number,
+            "summary": {"summary": f"previous page {page.page_number}"},
+        }
+        for page in previous_pages
+    ]
+    pairs = pages_loader(current).extract_chunks_reusing(
+        previous_loader.page_fingerprints, previous_chunks
+    )
+    reused = {
+        chunk.start_page: (analysis["summary"], chunk.content)
+        for chunk, analysis in pairs
+        if analysis
+    }
+    fresh = [
+        (chunk.start_page, chunk.end_page) for chunk, analysis in pairs if not analysis
+    ]
+    return reused, fresh
+
+
+def test_reuse_resplits_a_changed_page():
+    reused, fresh = reuse(["alpha", "beta", "gamma"], ["alpha", "BETA", "gamma"])
+
+    assert sorted(reused) == [1, 3]
+    assert fresh == [(1, 3)]
+
+
+def test_reuse_shifts_chunks_after_an_inserted_page():
+    reused, fresh = reuse(["alpha", "beta", "gamma"], ["alpha", "new", "beta", "gamma"])
+
+    assert reused == {
+        1: ("previous page 1", "[Page 1]\nalpha"),
+        3: ("previous page 2", "[Page 3]\nbeta"),
+        4: ("previous page 3", "[Page 4]\ngamma"),
+    }
+    assert fresh == [(1, 3)]
+
+
+def test_reuse_keeps_duplicate_and_blank_pages_in_place():
+    document = ["alpha", "", "terms", "", "terms", "omega"]
+
+    reused, fresh = reuse(document, document)
+
+    assert {page: summary for page, (summary, _) in reused.items()} == {
+        page: f"previous page {page}" for page in range(1, 7)
+    }
+    assert fresh == []
+
+
+def test_reuse_maps_duplicate_pages_once():
+    # The second "terms" page has no previous page left to come from
+    reused, fresh = reuse(
+        ["alpha", "terms", "omega"], ["alpha", "terms", "terms", "omega"]
+    )
+
+    assert sorted(reused) == [1, 2, 4]
+    assert fresh == [(2, 4)]
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from src.services import memory_profiler
+from src.services.memory_profiler import MB, MemoryBudget, MemoryProfiler
+
+
+def test_budget_applies_to_growth_over_the_job_baseline(monkeypatch):
+    rss = SimpleNamespace(bytes=900 * MB)
+    monkeypatch.setattr(memory_profiler, "current_rss", lambda: rss.bytes)
+
+    # The worker already uses more than the budget before the job starts
+    budget = MemoryBudget(512)
+    assert not budget.exceeded_by(400 * MB)
+
+    rss.bytes += 200 * MB
+    assert budget.exceeded_by(400 * MB)
+
+
+def test_disabled_budget_is_never_exceeded():
+    assert not MemoryBudget(0).exceeded_by(10**12)
+
+
+def test_rss_fallback_units(monkeypatch):
+    def no_proc(*args, **kwargs):
+        raise OSError("no /proc")
+
+    monkeypatch.setattr(memory_profiler, "open", no_proc, raising=False)
+    usage = SimpleNamespace(ru_maxrss=300 * 1024)
+    monkeypatch.setattr(memory_profiler.resource, "getrusage", lambda who: usage)
+
+    monkeypatch.setattr(memory_profiler.sys, "platform", "linux")
+    assert memory_profiler.current_rss() == 300 * MB
+    # macOS reports bytes
+    monkeypatch.setattr(memory_profiler.sys, "platform", "darwin")
+    assert memory_profiler.current_rss() == 300 * 1024
+
+
+def test_report_names_the_rss_sampled_after_stages():
+    profiler = MemoryProfiler(enabled=True, top_allocations=0)
+    profiler.start()
+    try:
+        with profiler.stage("extract"):
+            pass
+    finally:
+        profiler.stop()
+
+    report = profiler.report()
+    assert report["max_rss_after_stage_mb"] == report["stages"][0]["rss_after_mb"]
+    assert "peak_rss_mb" not in report
@@ -0,0 +1,43 @@
+import random
+
+from src.services.gen_ai.model_router import ModelRouter, RoutingTier
+
+WORDS = "the supplier shall deliver goods under this agreement within days".split()
+
+ROUTER = ModelRouter(
+    [
+        RoutingTier(max_score=0.2, model="small"),
+        RoutingTier(max_score=0.7, model="medium"),
+        RoutingTier(max_score=1.0, model="large"),
+    ]
+)
+
+
+def prose(chars: int) -> str:
+    rng = random.Random(0)
+    lines = []
+    while sum(len(line) + 1 for line in lines) < chars:
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(14)) + ".")
+    return "\n".join(lines)[:chars]
+
+
+def table(rows: int) -> str:
+    return "\n".join(
+        f"| Item {row} | {row * 3} | {row * 7.5} | 12% |" for row in range(rows)
+    )
+
+
+def test_full_length_prose_routes_to_cheapest_tier():
+    assert ROUTER.route(prose(25000)).model == "small"
+
+
+def test_table_heavy_chunk_routes_to_a_bigger_model():
+    content = prose(15000) + "\n" + table(300)
+
+    assert ROUTER.route(content).model != "small"
+
+
+def test_non_english_tables_route_to_largest_tier():
+    content = prose(5000) + "\n" + table(300).replace("Item", "Позиция товара")
+
+    assert ROUTER.route(content).model == "large"
@@ -0,0 +1,96 @@
+import io
+
+import pymupdf
+import pytest
+
+from src.services.loaders import ocr as ocr_module
+from src.services.loaders.ocr import OcrEngine, needs_ocr, page_fingerprint
+from src.services.loaders.pdf_loader import PdfDocumentLoader
+
+
+def scanned_page(pdf_file: pymupdf.Document, shade: int = 200):
+    page = pdf_file.new_page()
+    pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 20, 20), 0)
+    pixmap.clear_with(shade)
+    page.insert_image(pymupdf.Rect(72, 72, 272, 272), pixmap=pixmap)
+    return page
+
+
+class RecordingOcrEngine:
+    def __init__(self):
+        self.requested = []
+
+    def ocr_pages(self, pdf_file, page_indices):
+        self.requested.extend(page_indices)
+        return {index: f"scanned text {index + 1}" for index in page_indices}
+
+
+def test_only_text_less_pages_with_images_need_ocr():
+    with pymupdf.open() as pdf_file:
+        pdf_file.new_page().insert_text((72, 72), "A page with plenty of native text")
+        scanned_page(pdf_file).insert_text((72, 300), "Letterhead page with a logo")
+        pdf_file.new_page()
+        scanned_page(pdf_file)
+
+        assert [needs_ocr(page, page.get_text().strip()) for page in pdf_file] == [
+            False,
+            False,
+            False,
+            True,
+        ]
+
+
+def test_extract_pages_routes_scanned_pages_to_ocr():
+    with pymupdf.open() as pdf_file:
+        pdf_file.new_page().insert_text((72, 72), "Native text that needs no OCR")
+        scanned_page(pdf_file)
+        pdf_file.new_page()
+        data = pdf_file.tobytes()
+    engine = RecordingOcrEngine()
+
+    pages = PdfDocumentLoader.extract_pages(
+        io_stream=io.BytesIO(data), ocr_engine=engine
+    )
+
+    assert engine.requested == [1]
+    assert [(page.content, page.ocr) for page in pages] == [
+        ("Native text that needs no OCR", False),
+        ("scanned text 2", True),
+        ("", False),
+    ]
+
+
+def test_identical_scanned_pages_share_a_fingerprint():
+    with pymupdf.open() as first, pymupdf.open() as second:
+        fingerprints = [
+            page_fingerprint(first, scanned_page(first)),
+            page_fingerprint(second, scanned_page(second)),
+            page_fingerprint(second, scanned_page(second, shade=90)),
+        ]
+
+    assert fingerprints[0] == fingerprints[1] != fingerprints[2]
+
+
+def test_cached_pages_are_not_ocred_again(tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("cached pages must not start the OCR pool")
+
+    monkeypatch.setattr(ocr_module, "Pool", no_pool)
+    engine = OcrEngine(str(tmp_path))
+    with pymupdf.open() as pdf_file:
+        page = scanned_page(pdf_file)
+        engine._write_cache(page_fingerprint(pdf_file, page), "cached text")
+
+        assert engine.ocr_pages(pdf_file, [0]) == {0: "cached text"}
+
+
+@pytest.mark.parametrize("language, dpi", [("deu", 300), ("eng", 150)])
+def test_ocr_cache_is_keyed_by_language_and_dpi(tmp_path, language, dpi):
+    OcrEngine(str(tmp_path), language="eng", dpi=300)._write_cache("page", "text")
+
+    assert OcrEngine(str(tmp_path), language="eng", dpi=300)._read_cache("page") == (
+        "text"
+    )
+    assert (
+        OcrEngine(str(tmp_path), language=language, dpi=dpi)._read_cache("page") is None
+    )
@@ -0,0 +1,157 @@
+import io
+import os
+
+import pymupdf
+import pytest
+
+from src.config.settings import settings
+from src.services import processing_service as processing_module
+from src.services.db_service import DBService
+from src.services.gen_ai.model_router import RoutingDecision
+from src.services.graph_service import KnowledgeGraph
+from src.services.loaders.pdf_loader import PDFChunk
+from src.services.processing_service import PDFProcessingService
+
+
+class MemoryS3Service:
+    def __init__(self, objects: dict):
+        self.objects = objects
+
+    def read_file(self, key: str) -> io.BytesIO:
+        return io.BytesIO(self.objects[key])
+
+    def get_size(self, key: str) -> int:
+        return len(self.objects[key])
+
+    def download_to_file(self, key: str, path: str):
+        with open(path, "wb") as f:
+            f.write(self.objects[key])
+
+
+class StubSummaryService:
+    def route_chunk(self, content: str) -> RoutingDecision:
+        return RoutingDecision(model="stub", score=0.0, features={})
+
+    def get_chunk_summary(self, start_page, end_page, content, model=None):
+        return {"summary": f"Pages {start_page}-{end_page}", "topics": []}
+
+    def stream_chunk_summary(
+        self, start_page, end_page, content, model=None, on_summary=None
+    ):
+        result = self.get_chunk_summary(start_page, end_page, content, model)
+        on_summary(result["summary"])
+        return result
+
+    def get_final_summary(self, chunks: list) -> dict:
+        return {"summary": f"{len(chunks)} chunks"}
+
+
+def sample_pdf(pages: int, chars_per_page: int = 3000, padding: int = 0) -> bytes:
+    with pymupdf.open() as pdf_file:
+        for page_number in range(pages):
+            text = f"Section {page_number + 1} " + "delivery terms " * (
+                chars_per_page // 15
+            )
+            page = pdf_file.new_page()
+            page.insert_textbox(page.rect + (36, 36, -36, -36), text, fontsize=5)
+        if padding:
+            # Incompressible attachment to make the file itself large
+            pdf_file.embfile_add("padding.bin", os.urandom(padding))
+        return pdf_file.tobytes()
+
+
+@pytest.fixture
+def processing(tmp_path, monkeypatch):
+    graph = KnowledgeGraph(str(tmp_path))
+    monkeypatch.setattr(processing_module, "get_knowledge_graph", lambda: graph)
+    db_service = DBService(str(tmp_path))
+    s3_service = MemoryS3Service({})
+    service = PDFProcessingService(db_service, s3_service, StubSummaryService())
+    return service
+
+
+def submit(service: PDFProcessingService, data: bytes) -> str:
+    service.s3_service.objects["uploads/entry.pdf"] = data
+    service.db_service.create_entry(
+        "entry",
+        "uploads/entry.pdf",
+        "entry.pdf",
+        "s3://bucket/uploads/entry.pdf",
+        content_type="application/pdf",
+    )
+    return "entry"
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_early_summaries_only_live_on_the_entry_while_streaming(
+    processing, monkeypatch, streaming
+):
+    monkeypatch.setattr(settings.LLM, "streaming", streaming)
+    entry_id = submit(processing, sample_pdf(30))
+    early_writes = []
+    update_entry = processing.db_service.update_entry
+
+    def record_update(entry_id, **fields):
+        if "chunk_summaries" in fields:
+            early_writes.append(len(fields["chunk_summaries"]))
+        update_entry(entry_id, **fields)
+
+    monkeypatch.setattr(processing.db_service, "update_entry", record_update)
+
+    result = processing.process_document(entry_id, "s3://bucket/uploads/entry.pdf")
+
+    assert result["status"] == "completed"
+    assert bool(early_writes) == streaming
+    entry = processing.db_service.get_entry(entry_id)
+    assert "chunk_summaries" not in entry
+    summaries = processing.db_service.get_chunks(entry_id, ["summary"])
+    assert len(summaries) == result["chunks_count"] > 1
+
+
+def test_documents_over_the_memory_budget_spill_to_disk(processing, monkeypatch):
+    monkeypatch.setattr(settings.Processing, "memory_budget_mb", 1)
+    data = sample_pdf(300, padding=1024 * 1024)
+    # Holding this document in memory would take more than the budget
+    assert len(data) * processing_module.IN_MEMORY_COPIES > 1024 * 1024
+    entry_id = submit(processing, data)
+    temp_files = []
+    mkstemp = processing_module.tempfile.mkstemp
+
+    def record_mkstemp(*args, **kwargs):
+        fd, path = mkstemp(*args, **kwargs)
+        temp_files.append(path)
+        return fd, path
+
+    monkeypatch.setattr(processing_module.tempfile, "mkstemp", record_mkstemp)
+
+    result = processing.process_document(
+        entry_id, "s3://bucket/uploads/entry.pdf", "extract"
+    )
+
+    assert result["status"] == "completed"
+    assert processing.db_service.get_entry(entry_id)["memory_mode"] == "spill"
+    chunks = processing.db_service.get_chunks(entry_id, ["start_page", "end_page"])
+    covered = {
+        page
+        for chunk in chunks
+        for page in range(chunk["start_page"], chunk["end_page"] + 1)
+    }
+    assert covered == set(range(1, 301))
+    assert len(temp_files) == 1 and not os.path.exists(temp_files[0])
+
+
+def test_summary_sample_stays_within_budget(monkeypatch):
+    monkeypatch.setattr(settings.Processing, "summary_sample_chars", 5000)
+    chunks = [
+        PDFChunk(content="x" * 2000, start_page=page, end_page=page, total_pages=100)
+        for page in range(1, 101)
+    ]
+
+    sample = PDFProcessingService._sample_chunks(chunks)
+
+    # Ten 500-character excerpts from chunks spread over the whole document
+    assert sum(len(excerpt["excerpt"]) for excerpt in sample) == 5000
+    assert [excerpt["start_page"] for excerpt in sample] == list(range(1, 101, 10))
+
+    sample = PDFProcessingService._sample_chunks(chunks[:4])
+    assert [len(excerpt["excerpt"]) for excerpt in sample] == [1250] * 4
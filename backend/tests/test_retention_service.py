@@ -0,0 +1,121 @@
+import io
+import threading
+import time
+
+import pymupdf
+import pytest
+
+from src.config.settings import RetentionSettings
+from src.services.db_service import DBService
+from src.services.retention_service import RetentionService
+
+PAGES = [
+    "Acme Corp\nThe supplier delivers the goods within thirty days.",
+    "Acme Corp\nPayment is due on receipt of the invoice.",
+    "Scanned page with a faint native text layer.",
+]
+
+
+class MemoryObjectStore:
+    def __init__(self):
+        self.objects = {}
+
+    def upload_file(self, key: str, file_content: bytes, content_type: str = None):
+        self.objects[key] = bytes(file_content)
+        return f"s3://test/{key}"
+
+    def read_file(self, key: str) -> io.BytesIO:
+        return io.BytesIO(self.objects[key])
+
+
+def sample_pdf() -> bytes:
+    with pymupdf.open() as pdf_file:
+        for text in PAGES:
+            pdf_file.new_page().insert_text((72, 72), text)
+        return pdf_file.tobytes()
+
+
+@pytest.fixture
+def retention(tmp_path):
+    db_service = DBService(str(tmp_path))
+    store = MemoryObjectStore()
+    store.upload_file("uploads/entry.pdf", sample_pdf())
+    db_service.create_entry(
+        "entry",
+        "uploads/entry.pdf",
+        "entry.pdf",
+        "s3://test/uploads/entry.pdf",
+        content_type="application/pdf",
+    )
+    chunks = [
+        # Native text, as chunked without preprocessing
+        {"content": PAGES[0].split("\n")[1], "start_page": 1, "end_page": 1},
+        # Boilerplate stripped across pages, so not in the native text
+        {
+            "content": PAGES[0].split("\n")[1] + "\n" + PAGES[1].split("\n")[1],
+            "start_page": 1,
+            "end_page": 2,
+        },
+        # Text that went through OCR
+        {"content": "Scanned page", "start_page": 3, "end_page": 3},
+    ]
+    for chunk in chunks:
+        chunk["summary"] = {"summary": "original"}
+    db_service.store_chunks("entry", chunks)
+    db_service.update_entry("entry", ocr_pages=[3])
+    db_service.update_progress("entry", 100, "completed")
+
+    service = RetentionService(
+        db_service,
+        store,
+        RetentionSettings(
+            enabled=True,
+            cold_after_days=0,
+            archive_prefix="archive/chunks",
+            drop_content=True,
+            batch_size=10,
+        ),
+    )
+    db_service.chunk_store.rehydrate = service.rehydrate
+    return service, [chunk["content"] for chunk in chunks]
+
+
+def test_only_native_text_is_dropped_from_the_archive(retention):
+    service, contents = retention
+
+    result = service.compact("entry")
+
+    assert result["chunks_from_source"] == 1
+    manifest = service.chunk_store.get_manifest("entry")
+    archived = service._fetch_archive(manifest)["columns"]["content"]
+    assert archived == [None] + contents[1:]
+    chunks = service.db_service.get_chunks("entry", ["content"])
+    assert [chunk["content"] for chunk in chunks] == contents
+
+
+def test_chunk_updates_during_compaction_are_kept(retention):
+    service, _ = retention
+    store = service.s3_service
+    upload_file = store.upload_file
+    writer = threading.Thread(
+        target=service.db_service.update_chunks,
+        args=("entry", {0: {"summary": {"summary": "updated"}}}),
+    )
+
+    def upload_while_analyzing(*args, **kwargs):
+        writer.start()
+        time.sleep(0.1)
+        # The analysis waits for compaction to finish
+        assert writer.is_alive()
+        return upload_file(*args, **kwargs)
+
+    store.upload_file = upload_while_analyzing
+    service.compact("entry")
+    writer.join()
+
+    chunks = service.db_service.get_chunks("entry", ["summary"])
+    assert [chunk["summary"]["summary"] for chunk in chunks] == [
+        "updated",
+        "original",
+        "original",
+    ]
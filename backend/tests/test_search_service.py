@@ -0,0 +1,74 @@
+from src.services.search_service import SearchIndex
+
+
+def analyzed_chunk(page: int, summary: str, topics: list = None) -> dict:
+    return {
+        "start_page": page,
+        "end_page": page,
+        "summary": {"summary": summary, "topics": topics or []},
+    }
+
+
+def test_search_ranks_matching_chunks(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.index_chunks(
+        "entry-1",
+        [
+            analyzed_chunk(1, "Warranty claims for defective goods"),
+            analyzed_chunk(2, "Termination requires ninety days notice", ["notice"]),
+            analyzed_chunk(3, "Payment is due within thirty days"),
+        ],
+    )
+
+    results = index.search("termination notice")
+
+    assert [(r["entry_id"], r["chunk_index"], r["start_page"]) for r in results] == [
+        ("entry-1", 1, 2)
+    ]
+    assert results[0]["summary"] == "Termination requires ninety days notice"
+    assert results[0]["score"] > 0
+
+
+def test_search_matches_word_forms_and_any_field(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.index_chunks(
+        "entry-1",
+        [
+            analyzed_chunk(1, "The supplier terminated the agreement"),
+            analyzed_chunk(2, "Unrelated text", ["liability caps"]),
+        ],
+    )
+
+    assert [r["chunk_index"] for r in index.search("terminate")] == [0]
+    assert [r["chunk_index"] for r in index.search("liability cap")] == [1]
+
+
+def test_reindexing_replaces_an_entry(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.index_chunks("entry-1", [analyzed_chunk(1, "draft pricing schedule")])
+    index.index_chunks("entry-2", [analyzed_chunk(1, "final pricing schedule")])
+
+    index.index_chunks("entry-1", [analyzed_chunk(1, "revised delivery terms")])
+
+    assert [r["entry_id"] for r in index.search("pricing")] == ["entry-2"]
+    assert [r["entry_id"] for r in index.search("delivery")] == ["entry-1"]
+
+
+def test_deleted_entries_are_not_found(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.index_chunks("entry-1", [analyzed_chunk(1, "pricing schedule")])
+    index.index_chunks("entry-2", [analyzed_chunk(1, "pricing schedule")])
+
+    index.delete_entry("entry-1")
+
+    assert [r["entry_id"] for r in index.search("pricing")] == ["entry-2"]
+
+
+def test_queries_without_terms_or_with_syntax_are_safe(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.index_chunks("entry-1", [analyzed_chunk(1, "notice period")])
+
+    assert index.search("  ?! ") == []
+    # FTS5 operators in user input are matched as plain words
+    assert index.search('notice" OR "*') == []
+    assert [r["chunk_index"] for r in index.search("NOTICE:")] == [0]
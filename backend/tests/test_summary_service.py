@@ -0,0 +1,89 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from instructor import Partial
+
+from src.services.gen_ai.summary_service import ChunkAnalysis, SummaryService
+
+ANALYSIS = {
+    "summary": "The contract sets payment terms for the supplier.",
+    "topics": ["Payment terms", "Delivery"],
+    "entities": ["Supplier", "Buyer"],
+}
+
+
+class StubCompletions:
+    """Streams partial analyses the way instructor builds them from JSON
+    arriving a few characters at a time"""
+
+    def __init__(self, analysis: dict, step: int = 3):
+        raw = json.dumps(analysis)
+        self.chunks = [raw[i : i + step] for i in range(0, len(raw), step)]
+        self.consumed = 0
+
+    def _json_chunks(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    def create_partial(self, **kwargs):
+        return Partial[ChunkAnalysis].model_from_chunks(self._json_chunks())
+
+    def create(self, **kwargs):
+        return ChunkAnalysis(**json.loads("".join(self.chunks)))
+
+
+class EmptyStreamCompletions(StubCompletions):
+    def create_partial(self, **kwargs):
+        return iter(())
+
+
+@pytest.fixture
+def summary_service(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return SummaryService()
+
+
+def stream(service: SummaryService, completions: StubCompletions) -> list:
+    """Stream an analysis, recording the summary and how much of the response
+    had arrived each time it was published"""
+    service.chunk_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+    published = []
+    service.stream_chunk_summary(
+        1,
+        2,
+        "text",
+        "gpt-4o-mini",
+        lambda summary: published.append((summary, completions.consumed)),
+    )
+    return published
+
+
+def test_summary_is_published_once_complete_before_the_stream_ends(
+    summary_service,
+):
+    completions = StubCompletions(ANALYSIS)
+
+    published = stream(summary_service, completions)
+
+    assert [summary for summary, _ in published] == [ANALYSIS["summary"]]
+    assert published[0][1] < len(completions.chunks)
+
+
+def test_summary_only_response_is_published_at_the_end(summary_service):
+    completions = StubCompletions({"summary": ANALYSIS["summary"]}, step=4)
+
+    published = stream(summary_service, completions)
+
+    assert published == [(ANALYSIS["summary"], len(completions.chunks))]
+
+
+def test_empty_stream_falls_back_to_a_plain_call(summary_service):
+    completions = EmptyStreamCompletions(ANALYSIS)
+
+    published = stream(summary_service, completions)
+
+    assert published == [(ANALYSIS["summary"], 0)]
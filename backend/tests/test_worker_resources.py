@@ -0,0 +1,36 @@
+import threading
+
+from src.worker import resources
+
+
+class StubProcessingService:
+    def __init__(self, db_service, loop=None, admission_service=None):
+        self.loop = loop
+
+
+def test_each_pool_thread_gets_its_own_service_and_loop(monkeypatch):
+    monkeypatch.setattr(resources, "PDFProcessingService", StubProcessingService)
+    monkeypatch.setattr(resources, "get_db_service", lambda: None)
+    monkeypatch.setattr(resources, "_warm_up", lambda: None)
+    monkeypatch.setattr(resources, "_local", threading.local())
+    monkeypatch.setattr(resources, "_loops", [])
+
+    services = {}
+
+    def run_tasks(name):
+        first = resources.get_processing_service()
+        assert resources.get_processing_service() is first
+        services[name] = first
+
+    threads = [threading.Thread(target=run_tasks, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert services["a"] is not services["b"]
+    assert services["a"].loop is not services["b"].loop
+    assert len(resources._loops) == 2
+
+    resources.close_worker_resources()
+    assert services["a"].loop.is_closed() and services["b"].loop.is_closed()